@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Bulk-out transfer size benchmark
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import sys
+sys.path.insert(0, sys.path[0] + "/..")
+from libtoprammer.util import *
+from libtoprammer.bitfile import *
+from libtoprammer.command_queue import *
+from libtoprammer.top2049.hardware_access import HardwareAccess
+import getopt
+import time
+
+
+# The large transfer size to compare to one packet per transfer.
+LARGE_TRANSFER_BYTES = 64 * 16
+
+class NullHardwareAccess(HardwareAccess):
+	"""TOP2049 command encoding without USB transport.
+	Each send() call costs a fixed, modeled submit/complete overhead."""
+
+	def __init__(self, transferBytes, callOverhead):
+		CommandQueue.__init__(self,
+				      maxPacketBytes = 64,
+				      maxTransferBytes = transferBytes,
+				      padByte = 0x00)
+		self.callOverhead = callOverhead
+		self.nrTransfers = 0
+		self.nrBytes = 0
+
+	def send(self, data):
+		self.nrTransfers += 1
+		self.nrBytes += len(data)
+		end = time.perf_counter() + self.callOverhead
+		while time.perf_counter() < end:
+			pass
+
+def bitfileUpload(hw):
+	bitfile = Bitfile()
+	bitfile.parseFile(bitfileFind("hm62256dip28"))
+	data = bitfile.getPayload()
+	chunksz = hw.getFPGAMaxConfigChunkSize()
+	for i in range(0, len(data), chunksz):
+		hw.FPGAUploadConfig(i, data[i : i + chunksz])
+	hw.flushCommands()
+
+def programmingStream(hw):
+	for addr in range(8 * 1024):
+		hw.appendFPGAWrite(0x12, addr & 0xFF)
+		hw.appendFPGAWrite(0x13, (addr >> 8) & 0xFF)
+		hw.appendFPGAWrite(0x10, 0xA5)
+		hw.appendFPGAWrite(0x11, 0x02)
+		hw.appendDelay(0.00001)
+		hw.appendFPGAWrite(0x11, 0x03)
+	hw.flushCommands()
+
+def run(name, workload, transferBytes, callOverhead):
+	hw = NullHardwareAccess(transferBytes, callOverhead)
+	start = time.perf_counter()
+	workload(hw)
+	runtime = time.perf_counter() - start
+	print("%-20s %5d bytes/transfer: %6d transfers, %8.1f transfers/s, "
+	      "%6.1f kB/s, %.3f s" %\
+	      (name, transferBytes, hw.nrTransfers,
+	       hw.nrTransfers / runtime, hw.nrBytes / runtime / 1024, runtime))
+	return runtime
+
+def usage():
+	print("Usage: bulk_transfer.py [OPTIONS]")
+	print("")
+	print(" -o|--overhead USEC      Modeled overhead per bulk transfer call.")
+	print("                         Default: 100")
+	print(" -s|--size BYTES         Large transfer size. Default: %d" %\
+	      LARGE_TRANSFER_BYTES)
+
+def main(argv):
+	callOverhead = 100e-6
+	transferBytes = LARGE_TRANSFER_BYTES
+	try:
+		(opts, args) = getopt.getopt(argv[1:], "ho:s:",
+			[ "help", "overhead=", "size=", ])
+		for (o, v) in opts:
+			if o in ("-h", "--help"):
+				usage()
+				return 0
+			if o in ("-o", "--overhead"):
+				callOverhead = float(v) / 1e6
+			if o in ("-s", "--size"):
+				transferBytes = int(v)
+	except (getopt.GetoptError, ValueError) as e:
+		usage()
+		return 1
+	for (name, workload) in (("bitfile upload", bitfileUpload),
+				 ("programming stream", programmingStream)):
+		before = run(name, workload, 64, callOverhead)
+		after = run(name, workload, transferBytes, callOverhead)
+		print("%-20s speedup %.2fx" % (name, before / after))
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv))
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Command queue micro-benchmark
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import sys
+sys.path.insert(0, sys.path[0] + "/..")
+from libtoprammer.util import *
+from libtoprammer.command_queue import *
+from libtoprammer.top2049.hardware_access import HardwareAccess
+import time
+
+
+class NullHardwareAccess(HardwareAccess):
+	"TOP2049 command encoding without USB transport."
+
+	def __init__(self):
+		CommandQueue.__init__(self, maxPacketBytes = 64)
+		self.nrPackets = 0
+
+	def send(self, data):
+		self.nrPackets += 1
+
+class LegacyHardwareAccess(object):
+	"The previous list-of-bytes queue and int2byte encoding."
+
+	def __init__(self):
+		self.maxPacketBytes = 64
+		self.commandQueue = []
+		self.nrPackets = 0
+
+	def queueCommand(self, command):
+		assert isinstance(command, (bytes, bytearray))
+		assert(len(command) <= self.maxPacketBytes)
+		self.commandQueue.append(command)
+
+	def flushCommands(self):
+		command = b""
+		commandQueue = self.commandQueue
+		self.commandQueue = []
+		for oneCommand in commandQueue:
+			assert(len(oneCommand) <= self.maxPacketBytes)
+			if len(command) + len(oneCommand) > self.maxPacketBytes:
+				self.send(command)
+				command = b""
+			command += oneCommand
+		if command:
+			self.send(command)
+
+	def send(self, data):
+		self.nrPackets += 1
+
+	def appendFPGARead(self, address):
+		address = address | (1 << 4)
+		if address == (1 << 4):
+			self.queueCommand(int2byte(0x01))
+			return
+		self.queueCommand(int2byte(0x0B) + int2byte(address))
+
+	def appendFPGAWrite(self, address, byte):
+		address = address | (1 << 4)
+		if address == (1 << 4):
+			self.queueCommand(int2byte(0x10) + int2byte(byte))
+			return
+		self.queueCommand(int2byte(0x0A) + int2byte(address) +\
+				  int2byte(byte))
+
+def workload(hw, nrBytes):
+	"""Queue the commands of a typical parallel memory read.
+	Returns the number of queued commands."""
+	count = 0
+	for addr in range(nrBytes):
+		hw.appendFPGAWrite(0x12, addr & 0xFF)
+		hw.appendFPGAWrite(0x13, (addr >> 8) & 0xFF)
+		hw.appendFPGAWrite(0x10, 0x5A)
+		hw.appendFPGARead(0x10)
+		count += 4
+		if addr % 64 == 63:
+			hw.flushCommands()
+	hw.flushCommands()
+	return count
+
+def run(name, hw, nrBytes, nrRuns):
+	best = None
+	for i in range(nrRuns):
+		hw.nrPackets = 0
+		start = time.perf_counter()
+		count = workload(hw, nrBytes)
+		runtime = time.perf_counter() - start
+		best = runtime if best is None else min(best, runtime)
+	nsecPerCmd = best * 1e9 / count
+	print("%-8s %8d commands, %6d packets, %8.1f ns/command" %\
+	      (name, count, hw.nrPackets, nsecPerCmd))
+	return nsecPerCmd
+
+def main(argv):
+	nrBytes = 32 * 1024
+	nrRuns = 5
+	legacy = run("legacy", LegacyHardwareAccess(), nrBytes, nrRuns)
+	current = run("current", NullHardwareAccess(), nrBytes, nrRuns)
+	print("Python time per queued command reduced by %.1f%%" %\
+	      ((legacy - current) * 100.0 / legacy))
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv))
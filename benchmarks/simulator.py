@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Driver throughput benchmark on the simulated TOP2049
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import sys
+sys.path.insert(0, sys.path[0] + "/..")
+from libtoprammer.main import *
+import getopt
+import random
+import time
+
+
+WORKLOADS = (
+	# (chipID, size, write method, read method)
+	("hm62256dip28",	1024 * 32,	"writeRAM",	"readRAM"),
+	("m24c16dip8",		1024 * 2,	"writeEEPROM",	"readEEPROM"),
+)
+
+def run(chipID, size, writeMethod, readMethod, asyncWrites, transferBytes):
+	image = bytes(random.Random(size).getrandbits(8) for _ in range(size))
+	top = TOP(devIdentifier = "sim:TOP2049", verbose = 0,
+		  asyncWrites = asyncWrites, transferBytes = transferBytes)
+	try:
+		top.initializeChip(chipID)
+		top.resetTransportStats()
+		start = time.perf_counter()
+		getattr(top, writeMethod)(image)
+		readback = getattr(top, readMethod)()
+		runtime = time.perf_counter() - start
+		stats = top.getTransportStats()
+		top.shutdownChip()
+	finally:
+		top.shutdownProgrammer()
+	print("%-14s host %6.3f s, device %7.3f s, %7d commands, "
+	      "%6d packets, %5d out / %5d in transfers" %\
+	      (chipID, runtime, stats["simDeviceSeconds"],
+	       stats["simCommands"], stats["simPackets"],
+	       stats["simTransfersOut"], stats["simTransfersIn"]))
+	if readback != image:
+		print("%-14s readback MISMATCH" % chipID)
+		return False
+	return True
+
+def usage():
+	print("Usage: simulator.py [OPTIONS]")
+	print("")
+	print(" -a|--async-usb          Submit USB packets from a background thread.")
+	print(" -s|--size BYTES         Max size of one USB bulk transfer.")
+
+def main(argv):
+	asyncWrites = False
+	transferBytes = None
+	try:
+		(opts, args) = getopt.getopt(argv[1:], "has:",
+			[ "help", "async-usb", "size=", ])
+		for (o, v) in opts:
+			if o in ("-h", "--help"):
+				usage()
+				return 0
+			if o in ("-a", "--async-usb"):
+				asyncWrites = True
+			if o in ("-s", "--size"):
+				transferBytes = int(v)
+	except (getopt.GetoptError, ValueError) as e:
+		usage()
+		return 1
+	ok = True
+	try:
+		for (chipID, size, writeMethod, readMethod) in WORKLOADS:
+			ok &= run(chipID, size, writeMethod, readMethod,
+				  asyncWrites, transferBytes)
+	except (TOPException) as e:
+		print(e)
+		return 1
+	return 0 if ok else 1
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Startup time benchmark of the commandline and GUI entry points
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import sys
+import os
+import getopt
+import subprocess
+import time
+
+
+basedir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# The GUI can not start without a display. Its startup work up to
+# the main window is importing the library and building the chip lists.
+GUI_STARTUP = "from libtoprammer.main import *\n" \
+	      "vendors = getRegisteredVendors()\n" \
+	      "chips = [ d.description for d in getRegisteredChips() ]\n"
+
+ENTRY_POINTS = (
+	# (name, command)
+	("toprammer --list",		[ "toprammer", "-t", "-V1", ]),
+	("toprammer --list CHIP",	[ "toprammer", "-c", "atmega8dip28", "-t", "-V3", ]),
+	("toprammer-layout",		[ "toprammer-layout", "-d", "TOP2049",
+					  "-p", "atmega8dip28", ]),
+	("toprammer-gui chip lists",	[ "-c", GUI_STARTUP, ]),
+)
+
+def run(command, count):
+	times = []
+	for i in range(count):
+		start = time.perf_counter()
+		subprocess.run([ sys.executable ] + command, cwd = basedir,
+			       stdout = subprocess.DEVNULL, check = True)
+		times.append(time.perf_counter() - start)
+	times.sort()
+	return (times[0], times[len(times) // 2])
+
+def usage():
+	print("Usage: startup.py [OPTIONS]")
+	print("")
+	print(" -n|--count N            Number of runs per entry point. Default: 10")
+
+def main(argv):
+	count = 10
+	try:
+		(opts, args) = getopt.getopt(argv[1:], "hn:",
+			[ "help", "count=", ])
+		for (o, v) in opts:
+			if o in ("-h", "--help"):
+				usage()
+				return 0
+			if o in ("-n", "--count"):
+				count = max(int(v), 1)
+	except (getopt.GetoptError, ValueError) as e:
+		usage()
+		return 1
+	try:
+		for (name, command) in ENTRY_POINTS:
+			(best, median) = run(command, count)
+			print("%-26s best %7.1f ms, median %7.1f ms" %\
+			      (name, best * 1000, median * 1000))
+	except (subprocess.CalledProcessError) as e:
+		print(e)
+		return 1
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv))
@@ -0,0 +1,166 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Chip actions and image file formats
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .util import *
+
+
+# Action name -> (TOP method, takes an image, returns an image)
+ACTIONS = {
+	"read-sig"	: ("readSignature",		False,	True),
+	"erase"		: ("eraseChip",			False,	False),
+	"test"		: ("testChip",			False,	False),
+	"blank-check"	: ("blankCheck",		False,	False),
+	"read-prog"	: ("readProgmem",		False,	True),
+	"write-prog"	: ("writeProgmem",		True,	False),
+	"read-eeprom"	: ("readEEPROM",		False,	True),
+	"write-eeprom"	: ("writeEEPROM",		True,	False),
+	"read-fuse"	: ("readFuse",			False,	True),
+	"write-fuse"	: ("writeFuse",			True,	False),
+	"read-lock"	: ("readLockbits",		False,	True),
+	"write-lock"	: ("writeLockbits",		True,	False),
+	"read-ram"	: ("readRAM",			False,	True),
+	"write-ram"	: ("writeRAM",			True,	False),
+	"read-uil"	: ("readUserIdLocation",	False,	True),
+	"write-uil"	: ("writeUserIdLocation",	True,	False),
+}
+
+# Write action -> read action that verifies it
+VERIFY_ACTIONS = {
+	"write-prog"	: "read-prog",
+	"write-eeprom"	: "read-eeprom",
+	"write-fuse"	: "read-fuse",
+	"write-lock"	: "read-lock",
+	"write-ram"	: "read-ram",
+	"write-uil"	: "read-uil",
+}
+
+# Read action -> TOP method that streams the image
+STREAM_ACTIONS = {
+	"read-prog"	: "iterReadProgmem",
+	"read-eeprom"	: "iterReadEEPROM",
+	"read-ram"	: "iterReadRAM",
+}
+
+IO_handlers = {
+	"bin"		: IO_binary,
+	"ihex"		: IO_ihex,
+	"ihex-raw"	: IO_ihex,
+	"ahex"		: IO_ahex,
+}
+
+def actionTakesImage(action):
+	return ACTIONS[action][1]
+
+def actionReturnsImage(action):
+	return ACTIONS[action][2]
+
+def runAction(top, action, image=None, verify=False):
+	"""Run 'action' on the initialized chip.
+	If 'verify' is true, a written image is read back and compared.
+	Returns the read image or None."""
+	try:
+		(method, takesImage, returnsImage) = ACTIONS[action]
+	except (KeyError) as e:
+		raise TOPException("Invalid action '%s'" % action)
+	try:
+		result = getattr(top, method)(image) if takesImage else getattr(top, method)()
+		top.finishCommands()
+	except (Exception) as e:
+		# The programmer may be left in any state.
+		top.invalidatePowerState()
+		raise
+	if action == "blank-check":
+		if result is not None:
+			raise TOPException("Chip is not blank. "
+					   "First non-blank byte at offset 0x%X" % result)
+		top.printInfo("Chip is blank")
+	if verify and action in VERIFY_ACTIONS:
+		readback = runAction(top, VERIFY_ACTIONS[action])
+		if bytes(readback[:len(image)]) != bytes(image):
+			offset = next(i for i in range(len(image))
+				      if i >= len(readback) or readback[i] != image[i])
+			raise TOPException("%s: Verify failed at offset 0x%X" %\
+					   (action, offset))
+		top.printInfo("%s: Verify OK" % action)
+	return result if returnsImage else None
+
+def actionStreamsImage(action):
+	return action in STREAM_ACTIONS
+
+def streamAction(top, action, chunkSize=None):
+	"""Run the read 'action' on the initialized chip.
+	Yields (offset, data) chunks of the image as soon as they arrived.
+	The caller may stop the iteration early."""
+	try:
+		method = STREAM_ACTIONS[action]
+	except (KeyError) as e:
+		raise TOPException("Action '%s' can not stream" % action)
+	chunks = getattr(top, method)(chunkSize)
+	try:
+		for chunk in chunks:
+			yield chunk
+		top.finishCommands()
+	except (Exception) as e:
+		# The programmer may be left in any state.
+		top.invalidatePowerState()
+		raise
+	finally:
+		chunks.close()
+
+def encodeImage(data, fmtString):
+	"""Convert the binary image 'data' to the file format 'fmtString'.
+	Returns bytes."""
+	handler = IO_handlers[fmtString]()
+	data = handler.fromBinary(data)
+	if isinstance(data, str):
+		data = data.encode("UTF-8")
+	return data
+
+def decodeImage(top, action, data, fmtString):
+	"""Convert the file contents 'data' in the format 'fmtString'
+	to the binary image for 'action' on the initialized chip.
+	fmtString "auto" detects the format."""
+	if fmtString == "auto":
+		handler = IO_autodetect(data)()
+	else:
+		handler = IO_handlers[fmtString]()
+	if isinstance(handler, IO_ihex):
+		interp = top.getChip().getIHexInterpreter()
+		interp.interpret(data)
+		if interp.cumulativeSupported():
+			readRaw = fmtString.endswith("-raw")
+		else:
+			readRaw = True
+		if action == "write-prog":
+			binData = interp.getProgmem(dontInterpretSections = readRaw)
+		elif action == "write-eeprom":
+			binData = interp.getEEPROM(dontInterpretSections = readRaw)
+		elif action == "write-fuse":
+			binData = interp.getFusebits(dontInterpretSections = readRaw)
+		elif action == "write-lock":
+			binData = interp.getLockbits(dontInterpretSections = readRaw)
+		elif action == "write-ram":
+			binData = interp.getRAM(dontInterpretSections = readRaw)
+		elif action == "write-uil":
+			binData = interp.getUIL(dontInterpretSections = readRaw)
+		else:
+			assert(0)
+		return binData
+	return handler.toBinary(data)
@@ -0,0 +1,177 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Batch jobs: Several actions in one programmer session
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .main import *
+from .actions import *
+import json
+import os
+import time
+
+
+# Job file format (JSON):
+#
+#  {
+#    "chip"		: "atmega8dip28",		(optional)
+#    "chipOptions"	: { "NAME" : "VALUE", ... },	(optional)
+#    "steps"		: [
+#      { "action" : "erase" },
+#      { "action" : "write-prog", "file" : "flash.hex", "verify" : true },
+#      { "action" : "read-fuse", "file" : "fuse.bin", "format" : "bin" },
+#      ...
+#    ]
+#  }
+#
+#  "action" is one of the actions of actions.py.
+#  "file" is required for actions that read or write an image.
+#  Relative file names are relative to the job file.
+#  "format" and "verify" are optional. They default to the
+#  -I|--in-format, -O|--out-format and --verify commandline values.
+
+class BatchStep(object):
+	"One action of a BatchJob."
+
+	def __init__(self, action, filename=None, fmtString=None, verify=None):
+		self.action = action
+		self.filename = filename
+		self.fmtString = fmtString	# None => Job default
+		self.verify = verify		# None => Job default
+
+	def __str__(self):
+		if self.filename is None:
+			return self.action
+		return "%s %s" % (self.action, self.filename)
+
+class BatchStepResult(object):
+	"The outcome of one BatchStep."
+
+	def __init__(self, step):
+		self.step = step
+		self.error = None	# Error message. None on success.
+		self.seconds = 0.0
+
+	def ok(self):
+		return self.error is None
+
+class BatchJob(object):
+	"""An ordered list of actions that run on one initialized chip.
+	The programmer and the chip are initialized once for all steps.
+	The chip is not shut down between the steps."""
+
+	def __init__(self, steps, chipID=None, assignedChipOptions=()):
+		self.steps = steps
+		self.chipID = chipID
+		self.assignedChipOptions = list(assignedChipOptions)
+
+	@classmethod
+	def parse(cls, text, basedir="."):
+		"Parse a JSON job description. Returns a BatchJob."
+		try:
+			job = json.loads(text)
+		except (ValueError) as e:
+			raise TOPException("Job: Invalid JSON: %s" % str(e))
+		if not isinstance(job, dict) or\
+		   not isinstance(job.get("steps"), list):
+			raise TOPException("Job: Expected an object with a \"steps\" list")
+		chipOptions = job.get("chipOptions", {})
+		if not isinstance(chipOptions, dict):
+			raise TOPException("Job: \"chipOptions\" must be an object")
+		steps = []
+		for (i, entry) in enumerate(job["steps"]):
+			if not isinstance(entry, dict):
+				raise TOPException("Job step %d: Expected an object" % (i + 1))
+			action = entry.get("action")
+			if action not in ACTIONS:
+				raise TOPException("Job step %d: Invalid action '%s'" %\
+						   (i + 1, action))
+			filename = entry.get("file")
+			if actionTakesImage(action) or actionReturnsImage(action):
+				if not filename:
+					raise TOPException("Job step %d: Action '%s' "
+						"requires a \"file\"" % (i + 1, action))
+				if filename != "-":
+					filename = os.path.join(basedir, filename)
+			else:
+				filename = None
+			fmtString = entry.get("format")
+			if fmtString is not None:
+				fmtString = fmtString.lower()
+				if fmtString not in IO_handlers and\
+				   not (fmtString == "auto" and actionTakesImage(action)):
+					raise TOPException("Job step %d: Invalid format '%s'" %\
+							   (i + 1, fmtString))
+			steps.append(BatchStep(action, filename, fmtString,
+					       entry.get("verify")))
+		return cls(steps = steps,
+			   chipID = job.get("chip"),
+			   assignedChipOptions = [ AssignedChipOption(name, str(value))
+						   for (name, value) in chipOptions.items() ])
+
+	@classmethod
+	def load(cls, filename):
+		"Read a JSON job file. Returns a BatchJob."
+		try:
+			with open(filename, "r") as fd:
+				text = fd.read()
+		except (IOError) as e:
+			raise TOPException("Job: Failed to read '%s': %s" %\
+					   (filename, str(e)))
+		return cls.parse(text, os.path.dirname(os.path.abspath(filename)))
+
+	def run(self, top, inFormat="auto", outFormat="bin", verify=False,
+		readFile=None, writeFile=None):
+		"""Run all steps on the chip that is initialized on 'top'.
+		The job stops at the first failing step.
+		readFile(filename) returns the file contents.
+		writeFile(filename, data) writes the file contents.
+		Returns a list of BatchStepResult() of the steps that ran."""
+		readFile = readFile or self.__readFile
+		writeFile = writeFile or self.__writeFile
+		results = []
+		for step in self.steps:
+			result = BatchStepResult(step)
+			results.append(result)
+			start = time.perf_counter()
+			try:
+				image = None
+				if actionTakesImage(step.action):
+					image = decodeImage(top, step.action,
+							    readFile(step.filename),
+							    step.fmtString or inFormat)
+				image = runAction(top, step.action, image,
+						  verify if step.verify is None else step.verify)
+				if actionReturnsImage(step.action):
+					writeFile(step.filename,
+						  encodeImage(image, step.fmtString or outFormat))
+			except (TOPException, IOError) as e:
+				result.error = str(e)
+			result.seconds = time.perf_counter() - start
+			if not result.ok():
+				break
+		return results
+
+	@staticmethod
+	def __readFile(filename):
+		with open(filename, "rb") as fd:
+			return fd.read()
+
+	@staticmethod
+	def __writeFile(filename, data):
+		with open(filename, "w+b") as fd:
+			fd.write(data)
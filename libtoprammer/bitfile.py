@@ -19,13 +19,6 @@
 """
 
 import sys
-try:
-	import pkg_resources
-except ImportError:
-	print("Failed to import the 'pkg_resources' Python module.")
-	print("'pkg_resources' is part of the Python 'setuptools' package.")
-	print("On Debian Linux run:  apt-get install python3-pkg-resources")
-	sys.exit(1)
 
 from libtoprammer.util import *
 
@@ -144,6 +137,14 @@ def bitfileFind(filename):
 		fullpath = path + "/" + filename
 		if __probeFile(fullpath):
 			return fullpath
+	# pkg_resources is slow to import. Only import it, if needed.
+	try:
+		import pkg_resources
+	except ImportError:
+		print("Failed to import the 'pkg_resources' Python module.")
+		print("'pkg_resources' is part of the Python 'setuptools' package.")
+		print("On Debian Linux run:  apt-get install python3-pkg-resources")
+		sys.exit(1)
 	fullpath = pkg_resources.resource_filename("libtoprammer",
 						   "fpga/bin/" + filename)
 	if __probeFile(fullpath):
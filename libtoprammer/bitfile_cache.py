@@ -0,0 +1,148 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Cache of ready-to-send FPGA configuration packets.
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .util import *
+from .bitfile import *
+import hashlib
+import mmap
+import os
+import tempfile
+
+
+def bitfileCacheDefaultDir():
+	"Returns the default bitfile cache directory."
+	base = os.environ.get("XDG_CACHE_HOME") or\
+	       os.path.join(os.path.expanduser("~"), ".cache")
+	return os.path.join(base, "toprammer", "bitfiles")
+
+class BitfileCache(object):
+	"""Cache of the FPGA configuration packet stream of bitfiles.
+	A packet stream is keyed by the payload hash, the programmer type
+	and the packet format version.
+	An index entry per bitfile path maps the path to the payload hash.
+	The index entry is invalid, if the mtime or size of the file changed.
+	Each entry file ends with the SHA-256 digest of its packets.
+	A damaged entry is built again.
+	The cache is an optimization only. If the cache directory is not
+	usable, the packets are built in memory on each request.
+	If 'persistent' is false, the packets are only kept in memory."""
+
+	def __init__(self, cacheDir=None, persistent=True):
+		if cacheDir is None:
+			cacheDir = bitfileCacheDefaultDir()
+		self.cacheDir = cacheDir
+		self.persistent = persistent
+		self.memo = {}	# (path, mtime, size, programmerType, version) -> packets
+
+	def getPackets(self, bitfilePath, programmerType, makePackets,
+		       packetVersion=0):
+		"""Returns the configuration packet stream of a bitfile
+		as buffer object.
+		makePackets(payload) builds the stream on a cache miss.
+		packetVersion is the version of the makePackets() output format."""
+		bitfilePath = os.path.realpath(bitfilePath)
+		try:
+			st = os.stat(bitfilePath)
+		except (OSError) as e:
+			raise BitfileException("Failed to read \"%s\": %s" %\
+					       (bitfilePath, e.strerror))
+		memoKey = (bitfilePath, st.st_mtime_ns, st.st_size,
+			   programmerType, packetVersion)
+		packets = self.memo.get(memoKey)
+		if packets is None:
+			entryName = "%s-p%d" % (programmerType.lower(), packetVersion)
+			if self.persistent:
+				packets = self.__getPackets(bitfilePath, st, entryName,
+							    makePackets)
+			else:
+				bitfile = Bitfile()
+				bitfile.parseFile(bitfilePath)
+				packets = makePackets(bitfile.getPayload())
+			self.memo[memoKey] = packets
+		return packets
+
+	def __getPackets(self, bitfilePath, st, entryName, makePackets):
+		indexFile = os.path.join(self.cacheDir, "index",
+			hashlib.sha1(bitfilePath.encode("UTF-8")).hexdigest())
+		stamp = "%d %d" % (st.st_mtime_ns, st.st_size)
+		payloadHash = None
+		try:
+			with open(indexFile, "r") as fd:
+				fields = fd.read().split()
+			if len(fields) == 3 and " ".join(fields[0:2]) == stamp:
+				payloadHash = fields[2]
+		except (OSError) as e:
+			pass
+		if payloadHash:
+			packets = self.__mapEntry(entryName, payloadHash)
+			if packets is not None:
+				return packets
+		# Cache miss. Parse the bitfile.
+		bitfile = Bitfile()
+		bitfile.parseFile(bitfilePath)
+		payload = bitfile.getPayload()
+		payloadHash = hashlib.sha256(payload).hexdigest()
+		packets = self.__mapEntry(entryName, payloadHash)
+		if packets is None:
+			packets = makePackets(payload)
+			self.__writeFile(self.__entryFile(entryName, payloadHash),
+					 packets + hashlib.sha256(packets).digest())
+		self.__writeFile(indexFile,
+				 ("%s %s\n" % (stamp, payloadHash)).encode("ASCII"))
+		return packets
+
+	def __entryFile(self, entryName, payloadHash):
+		return os.path.join(self.cacheDir,
+				    "%s-%s.bin" % (entryName, payloadHash))
+
+	def __mapEntry(self, entryName, payloadHash):
+		"""Memory-map the packets of a cache entry.
+		Returns None, if there is none or if it is damaged."""
+		try:
+			with open(self.__entryFile(entryName, payloadHash), "rb") as fd:
+				mapped = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+		except (OSError, ValueError) as e:
+			return None
+		digestSize = hashlib.sha256().digest_size
+		with memoryview(mapped) as view:
+			if len(view) >= digestSize and\
+			   hashlib.sha256(view[:-digestSize]).digest() == view[-digestSize:]:
+				return view[:-digestSize]
+		mapped.close()
+		return None
+
+	def __writeFile(self, filename, data):
+		"Atomically write a cache file. Errors are ignored."
+		tmpName = None
+		try:
+			dirname = os.path.dirname(filename)
+			os.makedirs(dirname, exist_ok=True)
+			# A unique temporary file per writer. Several threads
+			# or processes may write the same file at once.
+			(tmpFd, tmpName) = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+			with os.fdopen(tmpFd, "wb") as fd:
+				fd.write(data)
+			os.replace(tmpName, filename)
+		except (OSError) as e:
+			if tmpName:
+				try:
+					os.unlink(tmpName)
+				except (OSError) as e:
+					pass
@@ -24,7 +24,10 @@ from .util import *
 from .layout_generator import *
 from .user_interface import *
 from .generic_algorithms import *
+from .memory_test import *
 from .ihex import *
+import importlib
+import time
 
 
 class Chip(object):
@@ -44,6 +47,11 @@ class Chip(object):
 	SUPPORT_UILREAD		= (1 << 13)
 	SUPPORT_UILWRITE	= (1 << 14)
 
+	# The memories that the driver writes incrementally with
+	# IncrementalWrite(). Possible entries are "progmem" and "eeprom".
+	# Other memories fall back to skipping unchanged images as a whole.
+	INCREMENTAL_WRITES	= ()
+
 	@classmethod
 	def chipSupportsAttr(cls, methodName):
 		"""Check if a chip implementation supports a feature.
@@ -177,9 +185,9 @@ class Chip(object):
 		else:
 			self.top.gnd.setLayoutMask(0)
 
-	def progressMeterInit(self, message, nrSteps):
+	def progressMeterInit(self, message, nrSteps, stepBytes=1):
 		self.top.progressMeterInit(AbstractUserInterface.PROGRESSMETER_CHIPACCESS,
-					   message, nrSteps)
+					   message, nrSteps, stepBytes)
 
 	def progressMeterFinish(self):
 		self.top.progressMeterFinish(AbstractUserInterface.PROGRESSMETER_CHIPACCESS)
@@ -283,27 +291,225 @@ class Chip(object):
 		self.throwError("User ID Location writing not supported",
 				always=True)
 
-__registeredChips = []
+	def readProgmemChunks(self):
+		"""Read the program memory. Yields (offset, data) tuples as soon
+		as the data arrived. The caller may stop the iteration early.
+		The default yields the readProgmem() image as one chunk."""
+		# Override me in the subclass, if required.
+		yield (0, self.readProgmem())
+
+	def readEEPROMChunks(self):
+		"""Read the EEPROM. Yields (offset, data) tuples as soon
+		as the data arrived. The caller may stop the iteration early.
+		The default yields the readEEPROM() image as one chunk."""
+		# Override me in the subclass, if required.
+		yield (0, self.readEEPROM())
+
+	def readRAMChunks(self):
+		"""Read the RAM. Yields (offset, data) tuples as soon
+		as the data arrived. The caller may stop the iteration early.
+		The default yields the readRAM() image as one chunk."""
+		# Override me in the subclass, if required.
+		yield (0, self.readRAM())
+
+	def getBlankPattern(self):
+		"Returns the byte pattern of an erased memory."
+		# Override me in the subclass, if required.
+		return b"\xFF"
+
+	def blankCheck(self):
+		"""Check whether the chip is erased. Checks the program memory,
+		or the EEPROM on chips without program memory.
+		Returns None for a blank chip.
+		Otherwise returns the image offset of the first non-blank byte."""
+		# Override me in the subclass, if required.
+		flags = self.getSupportFlags()
+		if flags & self.SUPPORT_PROGMEMREAD:
+			chunks = self.readProgmemChunks()
+		elif flags & self.SUPPORT_EEPROMREAD:
+			chunks = self.readEEPROMChunks()
+		else:
+			self.throwError("Blank checking not supported",
+					always=True)
+		return self.blankCheckChunks(chunks)
+
+	def blankCheckChunks(self, chunks, pattern=None):
+		"""Compare the (offset, data) chunks to the erased 'pattern'.
+		Stops reading at the first non-blank chunk.
+		Returns None or the offset of the first non-blank byte."""
+		if pattern is None:
+			pattern = self.getBlankPattern()
+		try:
+			for (offset, data) in chunks:
+				address = findNonBlank(data, pattern, offset)
+				if address is not None:
+					return address
+		finally:
+			chunks.close()
+		return None
+
+def findNonBlank(data, pattern, offset=0):
+	"""Compare 'data' at the image offset 'offset' to the repeated
+	erased 'pattern'. The pattern is aligned to image offset 0.
+	Returns the image offset of the first non-blank byte or None."""
+	start = offset % len(pattern)
+	end = start + len(data)
+	expected = (pattern * (end // len(pattern) + 1))[start : end]
+	if memoryview(data) == memoryview(expected):
+		return None
+	for (i, (byte, erased)) in enumerate(zip(bytes(data), expected)):
+		if byte != erased:
+			return offset + i
+	return offset + len(expected)
+
+def resizeChunks(chunks, chunkSize):
+	"""Regroup the consecutive (offset, data) chunks into chunks of
+	'chunkSize' bytes. Only the last chunk may be shorter.
+	Closing the returned generator closes 'chunks'."""
+	buf, bufOffset = bytearray(), 0
+	try:
+		for (offset, data) in chunks:
+			if not buf:
+				bufOffset = offset
+			buf += data
+			while len(buf) >= chunkSize:
+				data = bytes(buf[:chunkSize])
+				del buf[:chunkSize]
+				yield (bufOffset, data)
+				bufOffset += chunkSize
+	finally:
+		chunks.close()
+	if buf:
+		yield (bufOffset, bytes(buf))
+
+class IncrementalWrite(object):
+	"""Page granular "write only what differs" support for drivers.
+	Reads the current chip contents and finds the pages that differ
+	from the new image. The driver calls beginPages() right before
+	it writes the pages in 'pages' and finish() afterwards."""
+
+	def __init__(self, chip, name, readImage, image, pageSize,
+		     flashCells=False):
+		"""name is the memory name for messages, like "Flash".
+		readImage() returns the current memory contents.
+		flashCells is true, if the cells can not be programmed
+		from 0 to 1 without an erase."""
+		self.chip = chip
+		self.name = name
+		self.pageSize = pageSize
+		self.nrPages = (len(image) + pageSize - 1) // pageSize
+		start = time.perf_counter()
+		oldImage = readImage()
+		chip.top.flushCommands()
+		self.readSeconds = time.perf_counter() - start
+		self.pages = self.changedPages(oldImage, image, pageSize)
+		if flashCells:
+			for page in self.pages:
+				offset = page * pageSize
+				for (old, new) in zip(oldImage[offset : offset + pageSize],
+						      image[offset : offset + pageSize]):
+					if (old & new) != new:
+						chip.throwError("%s page %d must be erased "
+							"before it can be written incrementally. "
+							"Erase the chip first." % (name, page))
+						break
+		self.pagesStart = None
+
+	@staticmethod
+	def changedPages(oldImage, newImage, pageSize):
+		"""Returns the list of page numbers where 'newImage' differs from
+		'oldImage'. A short last page only compares the bytes of 'newImage'."""
+		old = memoryview(oldImage)
+		new = memoryview(newImage)
+		pages = []
+		for offset in range(0, len(new), pageSize):
+			end = min(offset + pageSize, len(new))
+			if old[offset : end] != new[offset : end]:
+				pages.append(offset // pageSize)
+		return pages
+
+	def beginPages(self):
+		"Start timing the page writes. Setup time is not included."
+		self.chip.top.flushCommands()
+		self.pagesStart = time.perf_counter()
+
+	def finish(self):
+		"Report the skipped pages and the saved time."
+		self.chip.top.flushCommands()
+		writeSeconds = time.perf_counter() - self.pagesStart
+		skipped = self.nrPages - len(self.pages)
+		message = "%s: Wrote %d of %d pages, skipped %d unchanged." %\
+			  (self.name, len(self.pages), self.nrPages, skipped)
+		if self.pages:
+			# Estimate the full write time from the written pages.
+			saved = skipped * writeSeconds / len(self.pages) - self.readSeconds
+			if saved >= 0:
+				message += " Saved about %.2f s." % saved
+			else:
+				message += " Took about %.2f s longer than " \
+					   "a full write." % -saved
+		self.chip.printInfo(message)
+
+__loadedChips = {}	# chipID -> ChipDescription of the imported driver modules
+__catalogueChips = None	# List of CatalogueChipDescription
+__catalogueIDs = set()
+__registryGeneration = 0 # Incremented on each change of getRegisteredChips()
+
+def importChipModule(module):
+	"Import the chip driver module 'module' from libtoprammer.chips."
+	importlib.import_module(".chips." + module, __package__)
+
+def getLoadedChip(chipID):
+	"Returns the ChipDescription of an imported driver. None, if not imported."
+	return __loadedChips.get(chipID)
+
+def getLoadedChips():
+	"Get a list of the ChipDescriptions of all imported drivers."
+	return list(__loadedChips.values())
+
+def __loadCatalogue():
+	global __catalogueChips, __catalogueIDs, __registryGeneration
+	if __catalogueChips is None:
+		try:
+			from .chips.catalogue import CATALOGUE
+		except (ImportError) as e:
+			# No catalogue. Import all drivers.
+			from .chips import CHIP_MODULES
+			for module in CHIP_MODULES:
+				importChipModule(module)
+			CATALOGUE = ()
+		__catalogueChips = [ CatalogueChipDescription(*entry)
+				     for entry in CATALOGUE ]
+		__catalogueIDs = set(desc.chipID for desc in __catalogueChips)
+		__registryGeneration += 1
+	return __catalogueChips
+
+def getRegistryGeneration():
+	"Returns a number that changes, if getRegisteredChips() changes."
+	return __registryGeneration
 
 def getRegisteredChips():
-	"Get a list of registered ChipDescriptions"
-	return __registeredChips
+	"""Get a list of registered ChipDescriptions.
+	Chips from the catalogue are not imported."""
+	chips = list(__loadCatalogue())
+	chips.extend(desc for desc in __loadedChips.values()
+		     if desc.chipID not in __catalogueIDs)
+	return chips
 
 def getRegisteredVendors():
 	"Returns a dict of 'vendor : [descriptor, ...]' "
-	vendors = { }
-	for descriptor in getRegisteredChips():
-		for vendor in descriptor.chipVendors:
-			vendors.setdefault(vendor, []).append(descriptor)
-	return vendors
+	from .chip_query import chipIndex
+	return chipIndex().getVendors()
 
 def _registerChip(chipDesc):
-	regList = getRegisteredChips()
-	if chipDesc.chipID in [ cd.chipID for cd in regList ]:
+	global __registryGeneration
+	if chipDesc.chipID in __loadedChips:
 		raise TOPException("Chip description registration: "
 			"The chipID '%s' is not unique." %\
 			chipDesc.chipID)
-	regList.append(chipDesc)
+	__loadedChips[chipDesc.chipID] = chipDesc
+	if chipDesc.chipID not in __catalogueIDs:
+		__registryGeneration += 1
 
 class BitDescription:
 	def __init__(self, bitNr, description):
@@ -458,11 +664,8 @@ class ChipDescription:
 	@classmethod
 	def findAll(cls, chipID, allowBroken=False):
 		"Find all ChipDescriptions by fuzzy chipID match."
-		found = [ chipDesc for chipDesc in getRegisteredChips() if (
-			(not chipDesc.broken or allowBroken) and\
-			(chipDesc.chipID.lower().find(chipID.lower()) >= 0)
-		) ]
-		return found
+		from .chip_query import chipIndex
+		return chipIndex().findID(chipID, allowBroken)
 
 	@classmethod
 	def findOne(cls, chipID, allowBroken=False):
@@ -479,10 +682,14 @@ class ChipDescription:
 		return found[0]
 
 	@classmethod
-	def dumpAll(cls, fd, verbose=1, showBroken=True):
-		"Dump all supported chips to file fd."
+	def dumpAll(cls, fd, verbose=1, showBroken=True, descriptors=None):
+		"""Dump all supported chips to file fd.
+		descriptors is the list of ChipDescriptions to dump.
+		Defaults to all registered chips."""
+		if descriptors is None:
+			descriptors = getRegisteredChips()
 		count = 0
-		for chip in getRegisteredChips():
+		for chip in descriptors:
 			if chip.broken and not showBroken:
 				continue
 			if chip.chipType == cls.TYPE_INTERNAL:
@@ -528,8 +735,8 @@ class ChipDescription:
 				bitfile += '.bit'
 			wrline("BIT file", bitfile)
 		if verbose >= 1:
-			for opt in self.chipOptions:
-				wrline("Chip option", str(opt))
+			for opt in self.getChipOptionStrings():
+				wrline("Chip option", opt)
 		if verbose >= 3 and self.packages:
 			for (package, description) in self.packages:
 				if description:
@@ -553,7 +760,7 @@ class ChipDescription:
 				(Chip.SUPPORT_UILMREAD,		"User ID Location reading"),
 				(Chip.SUPPORT_UILWRITE,		"User ID Location writing"),
 			)
-			supportFlags = self.chipImplClass.getSupportFlags()
+			supportFlags = self.getSupportFlags()
 			for (flag, description) in supportedFeatures:
 				if flag & supportFlags:
 					wrline("Support for", description)
@@ -565,6 +772,14 @@ class ChipDescription:
 				maintainer = "NONE"
 			wrline("Maintainer", maintainer)
 
+	def getSupportFlags(self):
+		"Returns the Chip.SUPPORT_... flags of the implementation."
+		return self.chipImplClass.getSupportFlags()
+
+	def getChipOptionStrings(self):
+		"Returns the chip options as list of strings."
+		return [ str(opt) for opt in self.chipOptions ]
+
 	def getChipOption(self, name):
 		"Get a ChipOption by case insensitive 'name'."
 		name = name.lower()
@@ -572,3 +787,50 @@ class ChipDescription:
 			if opt.name.lower() == name:
 				return opt
 		return None
+
+class CatalogueChipDescription(ChipDescription):
+	"""Chip description from the chip catalogue.
+	The driver module is imported on the first access to an
+	attribute that is not in the catalogue, like chipImplClass."""
+
+	def __init__(self, chipID, module, className, bitfile, runtimeID,
+		     chipType, chipVendors, description, packages, comment,
+		     maintainer, broken, supportFlags, chipOptionStrings):
+		self.chipID = chipID
+		self.module = module
+		self.className = className
+		self.bitfile = bitfile
+		self.runtimeID = runtimeID
+		self.chipType = chipType
+		self.chipVendors = chipVendors
+		self.description = description
+		self.packages = packages
+		self.comment = comment
+		self.maintainer = maintainer
+		self.broken = broken
+		self.supportFlags = supportFlags
+		self.chipOptionStrings = chipOptionStrings
+
+	def __getattr__(self, name):
+		# Only called for attributes that are not in the catalogue.
+		if name.startswith("__"):
+			raise AttributeError(name)
+		return getattr(self.load(), name)
+
+	def load(self):
+		"Import the driver module. Returns its ChipDescription."
+		desc = getLoadedChip(self.chipID)
+		if desc is None:
+			importChipModule(self.module)
+			desc = getLoadedChip(self.chipID)
+			if desc is None:
+				raise TOPException("Chip catalogue: Module '%s' does not "
+					"register the chip '%s'. The catalogue is "
+					"out of date." % (self.module, self.chipID))
+		return desc
+
+	def getSupportFlags(self):
+		return self.supportFlags
+
+	def getChipOptionStrings(self):
+		return list(self.chipOptionStrings)
@@ -0,0 +1,233 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Indexed queries over the chip registry
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .util import *
+from .chip import *
+import json
+
+
+# Chip type name -> ChipDescription.TYPE_...
+CHIP_TYPES = {
+	"mcu"		: ChipDescription.TYPE_MCU,
+	"eprom"		: ChipDescription.TYPE_EPROM,
+	"eeprom"	: ChipDescription.TYPE_EEPROM,
+	"gal"		: ChipDescription.TYPE_GAL,
+	"sram"		: ChipDescription.TYPE_SRAM,
+	"logic"		: ChipDescription.TYPE_LOGIC,
+	"internal"	: ChipDescription.TYPE_INTERNAL,
+}
+
+# Support name -> Chip.SUPPORT_...
+SUPPORT_FLAGS = {
+	name[len("SUPPORT_"):].lower() : getattr(Chip, name)
+	for name in dir(Chip) if name.startswith("SUPPORT_")
+}
+
+class ChipQuery(object):
+	"""A structured chip query. All given conditions must match.
+	chipID		=> Case insensitive chipID substring.
+	vendor		=> Case insensitive vendor name.
+	chipType	=> ChipDescription.TYPE_...
+	package		=> Case insensitive package name, like "DIP8".
+	bitfile		=> Bitfile name, without ".bit".
+	supportFlags	=> Chip.SUPPORT_... flags that must all be supported.
+	allowBroken	=> Also match broken implementations.
+	allowInternal	=> Also match TYPE_INTERNAL chips."""
+
+	def __init__(self, chipID=None, vendor=None, chipType=None,
+		     package=None, bitfile=None, supportFlags=0,
+		     allowBroken=True, allowInternal=True):
+		self.chipID = chipID
+		self.vendor = vendor
+		self.chipType = chipType
+		self.package = package
+		self.bitfile = bitfile
+		self.supportFlags = supportFlags
+		self.allowBroken = allowBroken
+		self.allowInternal = allowInternal
+
+	@classmethod
+	def parse(cls, text, allowBroken=True, allowInternal=False):
+		"""Parse a query string of comma separated KEY=VALUE terms.
+		Keys are id, vendor, type, package, bitfile and support.
+		support may be given several times. Example:
+		type=eeprom,support=eepromwrite,package=dip8"""
+		query = cls(allowBroken = allowBroken, allowInternal = allowInternal)
+		for term in text.split(","):
+			term = term.strip()
+			if not term:
+				continue
+			try:
+				key, value = [ t.strip() for t in term.split("=", 1) ]
+			except (ValueError) as e:
+				raise TOPException("Chip query: Invalid term '%s'. "
+					"Expected KEY=VALUE." % term)
+			key = key.lower()
+			if key == "id":
+				query.chipID = value
+			elif key == "vendor":
+				query.vendor = value
+			elif key == "type":
+				try:
+					query.chipType = CHIP_TYPES[value.lower()]
+				except (KeyError) as e:
+					raise TOPException("Chip query: Unknown type '%s'. "
+						"Choices are: %s" %\
+						(value, ", ".join(sorted(CHIP_TYPES))))
+			elif key == "package":
+				query.package = value
+			elif key == "bitfile":
+				query.bitfile = value
+			elif key == "support":
+				try:
+					query.supportFlags |= SUPPORT_FLAGS[value.lower()]
+				except (KeyError) as e:
+					raise TOPException("Chip query: Unknown support "
+						"'%s'. Choices are: %s" %\
+						(value, ", ".join(sorted(SUPPORT_FLAGS))))
+			else:
+				raise TOPException("Chip query: Unknown key '%s'" % key)
+		return query
+
+class ChipIndex(object):
+	"""Prebuilt indices over a list of ChipDescriptions.
+	Use chipIndex() to get the index of the current registry."""
+
+	NGRAM	= 3	# Length of the chipID n-grams
+
+	def __init__(self, descriptors):
+		self.descriptors = list(descriptors)
+		self.foldedIDs = [ d.chipID.casefold() for d in self.descriptors ]
+		self.ngrams = {}	# n-gram -> set of descriptor indices
+		self.vendors = {}	# folded vendor -> set
+		self.vendorNames = {}	# vendor -> [ descriptor, ... ]
+		self.types = {}		# chip type -> set
+		self.packages = {}	# folded package -> set
+		self.bitfiles = {}	# bitfile -> set
+		self.support = {}	# single support flag -> set
+		self.broken = set()
+		for (i, desc) in enumerate(self.descriptors):
+			folded = self.foldedIDs[i]
+			for n in range(1, self.NGRAM + 1):
+				for start in range(len(folded) - n + 1):
+					self.ngrams.setdefault(folded[start : start + n], set()).add(i)
+			for vendor in desc.chipVendors:
+				self.vendors.setdefault(vendor.casefold(), set()).add(i)
+				self.vendorNames.setdefault(vendor, []).append(desc)
+			self.types.setdefault(desc.chipType, set()).add(i)
+			for (package, description) in (desc.packages or ()):
+				self.packages.setdefault(package.casefold(), set()).add(i)
+			self.bitfiles.setdefault(desc.bitfile, set()).add(i)
+			flags = desc.getSupportFlags()
+			for flag in SUPPORT_FLAGS.values():
+				if flags & flag:
+					self.support.setdefault(flag, set()).add(i)
+			if desc.broken:
+				self.broken.add(i)
+
+	def __idCandidates(self, chipID):
+		"Returns the set of indices that may contain 'chipID'."
+		chipID = chipID.casefold()
+		if len(chipID) <= self.NGRAM:
+			return self.ngrams.get(chipID, set())
+		found = None
+		for start in range(len(chipID) - self.NGRAM + 1):
+			ids = self.ngrams.get(chipID[start : start + self.NGRAM], set())
+			found = ids if found is None else (found & ids)
+			if not found:
+				return set()
+		# The n-grams may match in a different order. Check the substring.
+		return set(i for i in found if chipID in self.foldedIDs[i])
+
+	def query(self, query):
+		"Returns the list of ChipDescriptions that match the ChipQuery()."
+		sets = []
+		if query.chipID:
+			sets.append(self.__idCandidates(query.chipID))
+		if query.vendor:
+			sets.append(self.vendors.get(query.vendor.casefold(), set()))
+		if query.chipType is not None:
+			sets.append(self.types.get(query.chipType, set()))
+		if query.package:
+			sets.append(self.packages.get(query.package.casefold(), set()))
+		if query.bitfile:
+			bitfile = query.bitfile
+			if bitfile.endswith(".bit"):
+				bitfile = bitfile[:-len(".bit")]
+			sets.append(self.bitfiles.get(bitfile, set()))
+		for flag in SUPPORT_FLAGS.values():
+			if query.supportFlags & flag:
+				sets.append(self.support.get(flag, set()))
+		if sets:
+			found = set.intersection(*sets)
+		else:
+			found = set(range(len(self.descriptors)))
+		if not query.allowBroken:
+			found -= self.broken
+		if not query.allowInternal:
+			found -= self.types.get(ChipDescription.TYPE_INTERNAL, set())
+		return [ self.descriptors[i] for i in sorted(found) ]
+
+	def findID(self, chipID, allowBroken=False):
+		"Find all ChipDescriptions by case insensitive chipID substring."
+		return self.query(ChipQuery(chipID = chipID, allowBroken = allowBroken))
+
+	def getVendors(self):
+		"Returns a dict of 'vendor : [descriptor, ...]' "
+		return { vendor : list(descs) for (vendor, descs) in self.vendorNames.items() }
+
+__chipIndex = None
+__chipIndexGeneration = None
+
+def chipIndex():
+	"Returns the ChipIndex of the current chip registry."
+	global __chipIndex, __chipIndexGeneration
+	if __chipIndex is None or __chipIndexGeneration != getRegistryGeneration():
+		chips = getRegisteredChips()
+		__chipIndexGeneration = getRegistryGeneration()
+		__chipIndex = ChipIndex(chips)
+	return __chipIndex
+
+def chipsToJSON(descriptors, indent=None):
+	"Export a list of ChipDescriptions as JSON string."
+	typeNames = { t : name.upper() for (name, t) in CHIP_TYPES.items() }
+	chips = []
+	for desc in descriptors:
+		flags = desc.getSupportFlags()
+		bitfile = desc.bitfile
+		if not bitfile.endswith(".bit"):
+			bitfile += ".bit"
+		chips.append({
+			"chipID"	: desc.chipID,
+			"vendors"	: list(desc.chipVendors),
+			"description"	: desc.description,
+			"type"		: typeNames.get(desc.chipType, str(desc.chipType)),
+			"packages"	: [ package for (package, description)
+					    in (desc.packages or ()) ],
+			"bitfile"	: bitfile,
+			"runtimeID"	: list(desc.runtimeID),
+			"support"	: sorted(name.upper() for (name, flag)
+						 in SUPPORT_FLAGS.items() if flags & flag),
+			"chipOptions"	: desc.getChipOptionStrings(),
+			"comment"	: desc.comment,
+			"maintainer"	: desc.maintainer,
+			"broken"	: desc.broken,
+		})
+	return json.dumps(chips, indent=indent)
@@ -109,7 +109,19 @@ class Chip_27cXXX(Chip):
 			readData8Func = self.__dataRead,
 			addrSetter = self.addrSetter,
 			initFunc = lambda: self.__setFlags(oe=0, ce=0),
-			exitFunc = lambda: self.__setFlags(oe=1, ce=1)
+			exitFunc = lambda: self.__setFlags(oe=1, ce=1),
+			readFPGAAddr = 0
+		)
+
+	def readEEPROMChunks(self):
+		self.__turnOn()
+		return self.generic.simpleReadEPROMChunks(
+			sizeBytes = self.ctype2size[self.chipType],
+			readData8Func = self.__dataRead,
+			addrSetter = self.addrSetter,
+			initFunc = lambda: self.__setFlags(oe=0, ce=0),
+			exitFunc = lambda: self.__setFlags(oe=1, ce=1),
+			readFPGAAddr = 0
 		)
 
 	def writeEEPROM(self, image):
@@ -189,7 +201,8 @@ class Chip_27cXXX(Chip):
 				readData8Func = self.__dataRead,
 				addrSetter = self.addrSetter,
 				initFunc = lambda: self.__setFlags(oe=0, ce=0),
-				exitFunc = lambda: self.__setFlags(oe=1, ce=1)
+				exitFunc = lambda: self.__setFlags(oe=1, ce=1),
+				readFPGAAddr = 0
 			)
 			for addr in range(0, len(image)):
 				if okMask[addr]:
@@ -1,25 +1,33 @@
-# Import all chip modules in **ALPHABETICAL** order
+# All chip driver modules in **ALPHABETICAL** order.
+# The modules are not imported here. The chip catalogue (catalogue.py)
+# describes all chips and a driver module is imported on first use.
+# Run  python3 -m libtoprammer.chips.makeCatalogue  after changing
+# this list or a ChipDescription.
 
-from ._27cxxx import *
-from ._74hc4094 import *
-from .at89c2051dip20 import *
-from .at89s51dip40 import *
-from .at89s52dip40 import *
-from .atmega168dip28 import *
-from .atmega328dip28 import *
-from .atmega32dip40 import *
-from .atmega48dip28 import *
-from .atmega88dip28 import *
-from .atmega8dip28 import *
-from .attiny13dip8 import *
-from .attiny25dip8 import *
-from .attiny26dip20 import *
-from .attiny45dip8 import *
-from .attiny85dip8 import *
-from .hm62256dip28 import *
-from .m24cxxdip8 import *
-from .m8cissp import *
-from .microchip16 import *
-from .microchip8 import *
-from .unitest import *
-from .w29ee011dip32 import *
+from . import microchip8, microchip16
+
+CHIP_MODULES = (
+	"_27cxxx",
+	"_74hc4094",
+	"at89c2051dip20",
+	"at89s51dip40",
+	"at89s52dip40",
+	"atmega168dip28",
+	"atmega328dip28",
+	"atmega32dip40",
+	"atmega48dip28",
+	"atmega88dip28",
+	"atmega8dip28",
+	"attiny13dip8",
+	"attiny25dip8",
+	"attiny26dip20",
+	"attiny45dip8",
+	"attiny85dip8",
+	"hm62256dip28",
+	"m24cxxdip8",
+	"m8cissp",
+	*( "microchip16." + m for m in microchip16.CHIP_MODULES ),
+	*( "microchip8." + m for m in microchip8.CHIP_MODULES ),
+	"unitest",
+	"w29ee011dip32",
+)
@@ -35,6 +35,8 @@ class Chip_ATMega_common(Chip):
 	CMD_READFLASH		= 0x02 # Read Flash
 	CMD_READEEPROM		= 0x03 # Read EEPROM
 
+	INCREMENTAL_WRITES	= ("progmem", "eeprom")
+
 	def __init__(self,
 		     chipPackage, chipPinVCC, chipPinsVPP, chipPinGND,
 		     signature,
@@ -71,37 +73,66 @@ class Chip_ATMega_common(Chip):
 		self.progressMeterFinish()
 
 	def readProgmem(self):
+		image = bytearray(self.flashPageSize * 2 * self.flashPages)
+		for (offset, data) in self.readProgmemChunks():
+			image[offset : offset + len(data)] = data
+		return bytes(image)
+
+	def readProgmemChunks(self):
 		self.__enterPM()
 
-		self.progressMeterInit("Reading Flash", self.flashPages)
-		image = b""
-		for page in range(0, self.flashPages):
-			self.progressMeter(page)
-			readWords = 0
-			for word in range(0, self.flashPageSize):
-				self.__loadCommand(self.CMD_READFLASH)
-				self.__loadAddr((page * self.flashPageSize) + word)
-				self.__readWordToStatusReg()
-				readWords += 1
-				if readWords >= 32:
-					image += self.top.cmdReadBufferReg()
-					readWords = 0
-			if readWords:
-				data = self.top.cmdReadBufferReg()
-				image += data[0:readWords*2]
-		self.progressMeterFinish()
-		return image
+		self.progressMeterInit("Reading Flash", self.flashPages,
+				       stepBytes = self.flashPageSize * 2)
+		pending = []
+		offset = 0
+		try:
+			for page in range(0, self.flashPages):
+				self.progressMeter(page)
+				readWords = 0
+				for word in range(0, self.flashPageSize):
+					self.__loadCommand(self.CMD_READFLASH)
+					self.__loadAddr((page * self.flashPageSize) + word)
+					self.__readWordToStatusReg()
+					readWords += 1
+					if readWords >= 32:
+						pending.append((offset,
+							self.top.cmdReadBufferRegDeferred(nrBytes = 64)))
+						offset += 64
+						readWords = 0
+				if readWords:
+					pending.append((offset,
+						self.top.cmdReadBufferRegDeferred(nrBytes = readWords * 2)))
+					offset += readWords * 2
+				while pending and pending[0][1].done:
+					(chunkOffset, read) = pending.pop(0)
+					yield (chunkOffset, read.result())
+			self.top.collectDeferredReads()
+		finally:
+			self.progressMeterFinish()
+		for (chunkOffset, read) in pending:
+			yield (chunkOffset, read.result())
 
 	def writeProgmem(self, image):
 		flashBytes = self.flashPageSize * 2 * self.flashPages
 		if len(image) != flashBytes:
 			self.throwError("Invalid program memory image size %d (expected %d)" %\
 				(len(image), flashBytes))
+		pages = range(0, self.flashPages)
+		incremental = None
+		if self.top.getIncrementalWrites():
+			# Flash pages are not erased by a page write.
+			incremental = IncrementalWrite(self, "Flash", self.readProgmem,
+						       image, self.flashPageSize * 2,
+						       flashCells = True)
+			pages = incremental.pages
 		self.__enterPM()
 
-		self.progressMeterInit("Writing Flash", self.flashPages)
-		for page in range(0, self.flashPages):
-			self.progressMeter(page)
+		if incremental:
+			incremental.beginPages()
+		self.progressMeterInit("Writing Flash", len(pages),
+				       stepBytes = self.flashPageSize * 2)
+		for (i, page) in enumerate(pages):
+			self.progressMeter(i)
 			for word in range(0, self.flashPageSize):
 				self.__loadCommand(self.CMD_WRITEFLASH)
 				addr = (page * self.flashPageSize) + word
@@ -115,34 +146,47 @@ class Chip_ATMega_common(Chip):
 			self.__pulseWR()
 			self.__waitForRDY()
 		self.progressMeterFinish()
+		if incremental:
+			incremental.finish()
 
 	def readEEPROM(self):
 		self.__enterPM()
 
 		assert(self.eepromPageSize <= self.top.getBufferRegSize())
-		self.progressMeterInit("Reading EEPROM", self.eepromPages)
-		image = b""
+		self.progressMeterInit("Reading EEPROM", self.eepromPages,
+				       stepBytes = self.eepromPageSize)
+		image = bytearray(self.eepromPageSize * self.eepromPages)
 		for page in range(0, self.eepromPages):
 			self.progressMeter(page)
 			for byte in range(0, self.eepromPageSize):
 				self.__loadCommand(self.CMD_READEEPROM)
 				self.__loadAddr((page * self.eepromPageSize) + byte)
 				self.__readLowByteToStatusReg()
-			data = self.top.cmdReadBufferReg()
-			image += data[0:self.eepromPageSize]
+			self.top.cmdReadBufferRegDeferred(image,
+				page * self.eepromPageSize, self.eepromPageSize)
+		self.top.collectDeferredReads()
 		self.progressMeterFinish()
-		return image
+		return bytes(image)
 
 	def writeEEPROM(self, image):
 		eepromBytes = self.eepromPageSize * self.eepromPages
 		if len(image) != eepromBytes:
 			self.throwError("Invalid EEPROM image size %d (expected %d)" %\
 				(len(image), eepromBytes))
+		pages = range(0, self.eepromPages)
+		incremental = None
+		if self.top.getIncrementalWrites():
+			incremental = IncrementalWrite(self, "EEPROM", self.readEEPROM,
+						       image, self.eepromPageSize)
+			pages = incremental.pages
 		self.__enterPM()
 
-		self.progressMeterInit("Writing EEPROM", self.eepromPages)
-		for page in range(0, self.eepromPages):
-			self.progressMeter(page)
+		if incremental:
+			incremental.beginPages()
+		self.progressMeterInit("Writing EEPROM", len(pages),
+				       stepBytes = self.eepromPageSize)
+		for (i, page) in enumerate(pages):
+			self.progressMeter(i)
 			for byte in range(0, self.eepromPageSize):
 				self.__loadCommand(self.CMD_WRITEEEPROM)
 				addr = (page * self.eepromPageSize) + byte
@@ -153,6 +197,8 @@ class Chip_ATMega_common(Chip):
 			self.__pulseWR()
 			self.__waitForRDY()
 		self.progressMeterFinish()
+		if incremental:
+			incremental.finish()
 
 	def readFuse(self):
 		self.__enterPM()
@@ -257,6 +303,11 @@ class Chip_ATMega_common(Chip):
 
 	def __enterPM(self):
 		"Enter HV programming mode."
+		self.top.setWriteOnlyFPGARegs({
+			0x10 : 0x00,	# Data
+			0x11 : 0x00,	# VCC/VPP control
+			0x12 : 0x7F,	# Control pins. Low bits select the pin.
+		})
 		self.applyVPP(False)
 		self.applyVCC(False)
 		self.applyGND(True)
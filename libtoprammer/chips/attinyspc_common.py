@@ -75,7 +75,7 @@ class Chip_AtTinySPC_common(Chip):
 		nrWords = self.flashPages * self.flashPageSize
 		image = b""
 		self.__enterPM()
-		self.progressMeterInit("Reading flash", nrWords)
+		self.progressMeterInit("Reading flash", nrWords, stepBytes = 2)
 		self.__sendReadFlashInstr()
 		currentHigh = -1
 		bufferedBytes = 0
@@ -108,7 +108,7 @@ class Chip_AtTinySPC_common(Chip):
 			self.throwError("Invalid flash image size %d (expected <=%d and word aligned)" %\
 				(len(image), nrWords * 2))
 		self.__enterPM()
-		self.progressMeterInit("Writing flash", len(image) // 2)
+		self.progressMeterInit("Writing flash", len(image) // 2, stepBytes = 2)
 		self.__sendWriteFlashInstr()
 		currentHigh = -1
 		for word in range(0, len(image) // 2):
@@ -0,0 +1,142 @@
+#
+# THIS FILE WAS AUTOGENERATED BY makeCatalogue.py
+# Do not edit this file manually. All changes will be lost.
+#
+
+# (chipID, module, class, bitfile, runtimeID, chipType, chipVendors,
+#  description, packages, comment, maintainer, broken,
+#  supportFlags, chipOptions)
+CATALOGUE = (
+	('27c16', '_27cxxx', 'Chip_27c16', '_27cxxxdip28', (12, 1), 1, ('Various',), '27c16 EPROM', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 48, ('immediate_verify (bool / Immediately verify each written byte)', "overprogram_pulse (bool / Perform an 'overprogramming' pulse)", 'vpp_voltage (float / Override the default VPP voltage)', "ppulse_length (int / Force 'Programming pulse' length, in microseconds.)")),
+	('27c32', '_27cxxx', 'Chip_27c32', '_27cxxxdip28', (12, 1), 1, ('Various',), '27c32 EPROM', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 48, ('immediate_verify (bool / Immediately verify each written byte)', "overprogram_pulse (bool / Perform an 'overprogramming' pulse)", 'vpp_voltage (float / Override the default VPP voltage)', "ppulse_length (int / Force 'Programming pulse' length, in microseconds.)")),
+	('27c64', '_27cxxx', 'Chip_27c64', '_27cxxxdip28', (12, 1), 1, ('Various',), '27c64 EPROM', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 48, ('immediate_verify (bool / Immediately verify each written byte)', "overprogram_pulse (bool / Perform an 'overprogramming' pulse)", 'vpp_voltage (float / Override the default VPP voltage)', "ppulse_length (int / Force 'Programming pulse' length, in microseconds.)")),
+	('27c128', '_27cxxx', 'Chip_27c128', '_27cxxxdip28', (12, 1), 1, ('Various',), '27c128 EPROM', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 48, ('immediate_verify (bool / Immediately verify each written byte)', "overprogram_pulse (bool / Perform an 'overprogramming' pulse)", 'vpp_voltage (float / Override the default VPP voltage)', "ppulse_length (int / Force 'Programming pulse' length, in microseconds.)")),
+	('27c256', '_27cxxx', 'Chip_27c256', '_27cxxxdip28', (12, 1), 1, ('Various',), '27c256 EPROM', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 48, ('immediate_verify (bool / Immediately verify each written byte)', "overprogram_pulse (bool / Perform an 'overprogramming' pulse)", 'vpp_voltage (float / Override the default VPP voltage)', "ppulse_length (int / Force 'Programming pulse' length, in microseconds.)")),
+	('27c512', '_27cxxx', 'Chip_27c512', '_27cxxxdip28', (12, 1), 1, ('Various',), '27c512 EPROM', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 48, ('immediate_verify (bool / Immediately verify each written byte)', "overprogram_pulse (bool / Perform an 'overprogramming' pulse)", 'vpp_voltage (float / Override the default VPP voltage)', "ppulse_length (int / Force 'Programming pulse' length, in microseconds.)")),
+	('74hc4094dip16', '_74hc4094', 'Chip_74hc4094', 'unitest', (8, 1), 5, ('Philips', 'Other'), '74HC(T)4094 shift-register', None, '', 'Michael Buesch <m@bues.ch>', False, 4096, ()),
+	('at89c2051dip20', 'at89c2051dip20', 'Chip_AT89C2051dip20', 'at89c2051dip20', (5, 1), 0, ('Atmel',), 'AT89C2051', (('DIP20', ''),), '', None, False, 15, ()),
+	('at89s51dip40', 'at89s51dip40', 'Chip_AT89S51dip40', 'at89s5xdip40', (5, 1), 0, ('Atmel',), 'AT89S51', (('DIP40', ''),), '', None, False, 783, ()),
+	('at89s52dip40', 'at89s52dip40', 'Chip_AT89S52dip40', 'at89s5xdip40', (5, 1), 0, ('Atmel',), 'AT89S52', (('DIP40', ''),), '', None, False, 783, ()),
+	('atmega168dip28', 'atmega168dip28', 'Chip_ATMega168DIP28', 'atmega8dip28', (3, 1), 0, ('Atmel',), 'AtMega168', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('atmega168pdip28', 'atmega168dip28', 'Chip_ATMega168pDIP28', 'atmega8dip28', (3, 1), 0, ('Atmel',), 'AtMega168P', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('atmega328dip28', 'atmega328dip28', 'Chip_ATMega328DIP28', 'atmega8dip28', (3, 1), 0, ('Atmel',), 'AtMega328', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('atmega328pdip28', 'atmega328dip28', 'Chip_ATMega328pDIP28', 'atmega8dip28', (3, 1), 0, ('Atmel',), 'AtMega328P', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('atmega32dip40', 'atmega32dip40', 'Chip_ATMega32DIP40', 'atmega32dip40', (4, 1), 0, ('Atmel',), 'AtMega32', (('DIP40', ''),), 'Insert upside down into ZIF socket', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('atmega48dip28', 'atmega48dip28', 'Chip_ATMega48DIP28', 'atmega8dip28', (3, 1), 0, ('Atmel',), 'AtMega48', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('atmega48pdip28', 'atmega48dip28', 'Chip_ATMega48pDIP28', 'atmega8dip28', (3, 1), 0, ('Atmel',), 'AtMega48P', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('atmega88dip28', 'atmega88dip28', 'Chip_ATMega88DIP28', 'atmega8dip28', (3, 1), 0, ('Atmel',), 'AtMega88', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('atmega88padip28', 'atmega88dip28', 'Chip_ATMega88paDIP28', 'atmega8dip28', (3, 1), 0, ('Atmel',), 'AtMega88PA', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('atmega8dip28', 'atmega8dip28', 'Chip_ATMega8DIP28', 'atmega8dip28', (3, 1), 0, ('Atmel',), 'AtMega8', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('attiny13dip8', 'attiny13dip8', 'Chip_AtTiny13dip8', 'attiny13dip8', (1, 1), 0, ('Atmel',), 'AtTiny13', (('DIP8', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('attiny25dip8', 'attiny25dip8', 'Chip_AtTiny25dip8', 'attiny13dip8', (1, 1), 0, ('Atmel',), 'AtTiny25', (('DIP8', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('attiny26dip20', 'attiny26dip20', 'Chip_ATTiny26DIP20', 'attiny26dip20', (2, 1), 0, ('Atmel',), 'AtTiny26', (('DIP20', ''),), 'Special ZIF position', 'Michael Buesch <m@bues.ch>', True, 1023, ()),
+	('attiny45dip8', 'attiny45dip8', 'Chip_AtTiny45dip8', 'attiny13dip8', (1, 1), 0, ('Atmel',), 'AtTiny45', (('DIP8', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('attiny85dip8', 'attiny85dip8', 'Chip_AtTiny85dip8', 'attiny13dip8', (1, 1), 0, ('Atmel',), 'AtTiny85', (('DIP8', ''),), '', 'Michael Buesch <m@bues.ch>', False, 1023, ()),
+	('hm62256dip28', 'hm62256dip28', 'Chip_HM62256DIP28', 'hm62256dip28', (10, 1), 4, ('S@Tech',), 'HM62256 SRAM', (('DIP28', ''),), '', 'Michael Buesch <m@bues.ch>', False, 7169, ('quick_test (bool / Skip the walking ones and zeros RAM tests)',)),
+	('m24c01dip8', 'm24cxxdip8', 'Chip_m24c01dip8', 'm24c16dip8', (11, 1), 2, ('ST',), 'M24C01 I2C EEPROM', (('DIP8', ''), ('SO8', 'With 1:1 adapter'), ('TSSOP8', 'With 1:1 adapter')), '', 'Michael Buesch <m@bues.ch>', False, 49, ()),
+	('m24c02dip8', 'm24cxxdip8', 'Chip_m24c02dip8', 'm24c16dip8', (11, 1), 2, ('ST',), 'M24C02 I2C EEPROM', (('DIP8', ''), ('SO8', 'With 1:1 adapter'), ('TSSOP8', 'With 1:1 adapter')), '', 'Michael Buesch <m@bues.ch>', False, 49, ()),
+	('m24c04dip8', 'm24cxxdip8', 'Chip_m24c04dip8', 'm24c16dip8', (11, 1), 2, ('ST',), 'M24C04 I2C EEPROM', (('DIP8', ''), ('SO8', 'With 1:1 adapter'), ('TSSOP8', 'With 1:1 adapter')), '', 'Michael Buesch <m@bues.ch>', False, 49, ()),
+	('m24c08dip8', 'm24cxxdip8', 'Chip_m24c08dip8', 'm24c16dip8', (11, 1), 2, ('ST',), 'M24C08 I2C EEPROM', (('DIP8', ''), ('SO8', 'With 1:1 adapter'), ('TSSOP8', 'With 1:1 adapter')), '', 'Michael Buesch <m@bues.ch>', False, 49, ()),
+	('m24c16dip8', 'm24cxxdip8', 'Chip_m24c16dip8', 'm24c16dip8', (11, 1), 2, ('ST',), 'M24C16 I2C EEPROM', (('DIP8', ''), ('SO8', 'With 1:1 adapter'), ('TSSOP8', 'With 1:1 adapter')), '', 'Michael Buesch <m@bues.ch>', False, 49, ()),
+	('m8c-issp', 'm8cissp', 'Chip_M8C_ISSP', 'm8c-issp', (7, 1), 0, ('Cypress',), 'M8C In System Serial Programmer', (('M8C ISSP header', 'Special adapter'),), 'Special adapter required', 'Michael Buesch <m@bues.ch>', True, 15, ()),
+	('pic24f04ka200dip14', 'microchip16.pic24f04ka200dip14', 'Chip_Pic24f04ka200dip14', 'microchip16dip14dip20', (57089, 1), 0, ('Microchip',), 'PIC24F04KA200', (('DIP14', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f04ka201dip20', 'microchip16.pic24f04ka201dip20', 'Chip_Pic24f04ka201dip20', 'microchip16dip14dip20', (57089, 1), 0, ('Microchip',), 'PIC24F04KA201', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f16kl402dip28', 'microchip16.pic24f16kl402dip28', 'Chip_Pic24f16kl402dip28', 'microchip16dip28', (57090, 1), 0, ('Microchip',), 'PIC24F16KL402', (('DIP28', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f08kl402dip28', 'microchip16.pic24f08kl402dip28', 'Chip_Pic24f08kl402dip28', 'microchip16dip28', (57090, 1), 0, ('Microchip',), 'PIC24F08KL402', (('DIP28', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f16kl401dip20', 'microchip16.pic24f16kl401dip20', 'Chip_Pic24f16kl401dip20', 'microchip16dip14dip20', (57089, 1), 0, ('Microchip',), 'PIC24F16KL401', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f08kl401dip20', 'microchip16.pic24f08kl401dip20', 'Chip_Pic24f08kl401dip20', 'microchip16dip14dip20', (57089, 1), 0, ('Microchip',), 'PIC24F08KL401', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f08kl302dip28', 'microchip16.pic24f08kl302dip28', 'Chip_Pic24f08kl302dip28', 'microchip16dip28', (57090, 1), 0, ('Microchip',), 'PIC24F08KL302', (('DIP28', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f08kl301dip20', 'microchip16.pic24f08kl301dip20', 'Chip_Pic24f08kl301dip20', 'microchip16dip14dip20', (57089, 1), 0, ('Microchip',), 'PIC24F08KL301', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f08kl201dip20', 'microchip16.pic24f08kl201dip20', 'Chip_Pic24f08kl201dip20', 'microchip16dip14dip20', (57089, 1), 0, ('Microchip',), 'PIC24F08KL201', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f08kl200dip14', 'microchip16.pic24f08kl200dip14', 'Chip_Pic24f08kl200dip14', 'microchip16dip14dip20', (57089, 1), 0, ('Microchip',), 'PIC24F08KL200', (('DIP14', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f04kl101dip20', 'microchip16.pic24f04kl101dip20', 'Chip_Pic24f04kl101dip20', 'microchip16dip14dip20', (57089, 1), 0, ('Microchip',), 'PIC24F04KL101', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f04kl100dip14', 'microchip16.pic24f04kl100dip14', 'Chip_Pic24f04kl100dip14', 'microchip16dip14dip20', (57089, 1), 0, ('Microchip',), 'PIC24F04KL100', (('DIP14', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f04ka200sip6', 'microchip16.pic24f04ka200sip6', 'Chip_Pic24f04ka200sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F04KA200 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f04ka201sip6', 'microchip16.pic24f04ka201sip6', 'Chip_Pic24f04ka201sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F04KA201 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f04kl100sip6', 'microchip16.pic24f04kl100sip6', 'Chip_Pic24f04kl100sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F04KL100 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f04kl101sip6', 'microchip16.pic24f04kl101sip6', 'Chip_Pic24f04kl101sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F04KL101 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f08kl200sip6', 'microchip16.pic24f08kl200sip6', 'Chip_Pic24f08kl200sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F08KL200 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f08kl201sip6', 'microchip16.pic24f08kl201sip6', 'Chip_Pic24f08kl201sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F08KL201 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 207, ()),
+	('pic24f08kl301sip6', 'microchip16.pic24f08kl301sip6', 'Chip_Pic24f08kl301sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F08KL301 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f08kl302sip6', 'microchip16.pic24f08kl302sip6', 'Chip_Pic24f08kl302sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F08KL302 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f08kl401sip6', 'microchip16.pic24f08kl401sip6', 'Chip_Pic24f08kl401sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F08KL401 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f08kl402sip6', 'microchip16.pic24f08kl402sip6', 'Chip_Pic24f08kl402sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F08KL402 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f16kl401sip6', 'microchip16.pic24f16kl401sip6', 'Chip_Pic24f16kl401sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F16KL401 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic24f16kl402sip6', 'microchip16.pic24f16kl402sip6', 'Chip_Pic24f16kl402sip6', 'microchip16sip6', (57093, 1), 0, ('Microchip',), 'PIC24F16KL402 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 255, ()),
+	('pic10f200dip8', 'microchip8.pic10f200dip8', 'Chip_Pic10F200dip8', 'pic10fxxxdip8', (56833, 1), 0, ('Microchip',), 'PIC10F200, PIC10F204, PIC10F220', (('DIP8', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24781, ()),
+	('pic10f200sip6', 'microchip8.pic10f200sip6', 'Chip_Pic10F200sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC10F200, PIC10F204, PIC10F220 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24781, ()),
+	('pic10f202dip8', 'microchip8.pic10f202dip8', 'Chip_Pic10F202dip8', 'pic10fxxxdip8', (56833, 1), 0, ('Microchip',), 'PIC10F202, PIC10F206, PIC10F222', (('DIP8', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24781, ()),
+	('pic10f202sip6', 'microchip8.pic10f202sip6', 'Chip_Pic10F202sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC10F202, PIC10F206, PIC10F222 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24781, ()),
+	('pic10f320dip8', 'microchip8.pic10f320dip8', 'Chip_Pic10F320dip8', 'pic10fxxxdip8', (56833, 1), 0, ('Microchip',), 'PIC10F320, PIC10LF320', (('DIP8', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic10f320sip6', 'microchip8.pic10f320sip6', 'Chip_Pic10F320sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC10F320, PIC10LF320 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic10f322dip8', 'microchip8.pic10f322dip8', 'Chip_Pic10F322dip8', 'pic10fxxxdip8', (56833, 1), 0, ('Microchip',), 'PIC10F322, PIC10LF322', (('DIP8', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic10f322sip6', 'microchip8.pic10f322sip6', 'Chip_Pic10F322sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC10F322, PIC10LF322 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic12f1501dip8', 'microchip8.pic12f1501dip8', 'Chip_Pic12F1501dip8', 'microchip01dip8', (56834, 1), 0, ('Microchip',), 'PIC12F1501, PIC12LF1501', (('DIP8', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic12f1501sip6', 'microchip8.pic12f1501sip6', 'Chip_Pic12F1501sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC12F1501, PIC12LF1501 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic12f1822dip8', 'microchip8.pic12f1822dip8', 'Chip_Pic12F1822dip8', 'microchip01dip8', (56834, 1), 0, ('Microchip',), 'PIC12F1822, PIC12LF1822', (('DIP8', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic12f1822sip6', 'microchip8.pic12f1822sip6', 'Chip_Pic12F1822sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC12F1822, PIC12LF1822 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic12f508dip8', 'microchip8.pic12f508dip8', 'Chip_Pic12F508dip8', 'microchip01dip8', (56834, 1), 0, ('Microchip',), 'PIC12F508', (('DIP8', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24781, ()),
+	('pic12f508sip6', 'microchip8.pic12f508sip6', 'Chip_Pic12F508sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC12F508 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24781, ()),
+	('pic12F629dip8', 'microchip8.pic12f629dip8', 'Chip_Pic12F629dip8', 'microchip01dip8', (56834, 1), 0, ('Microchip',), 'PIC12F629, PIC12F675', (('DIP8', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic12F629sip6', 'microchip8.pic12f629sip6', 'Chip_Pic12F629sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC12F629, PIC12F675 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1454dip14', 'microchip8.pic16f1454dip14', 'Chip_Pic16F1454dip14', 'microchip01dip14dip20a', (56841, 1), 0, ('Microchip',), 'PIC16F1454, PIC16F1455, PIC16LF1454, PIC16LF1455,', (('DIP14', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16f1454sip6', 'microchip8.pic16f1454sip6', 'Chip_Pic16F1454sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1454, PIC16F1455, PIC16LF1454, PIC16LF1455, - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16F1459dip20', 'microchip8.pic16f1459dip20', 'Chip_Pic16F1459dip20', 'microchip01dip14dip20a', (56841, 1), 0, ('Microchip',), 'PIC16F1459, PIC16LF1459', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16F1459sip6', 'microchip8.pic16f1459sip6', 'Chip_Pic16F1459sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1459, PIC16LF1459 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16f1503dip14', 'microchip8.pic16f1503dip14', 'Chip_Pic16F1503dip14', 'microchip01dip14dip20', (56835, 1), 0, ('Microchip',), 'PIC16F1503, PIC16LF1503', (('DIP14', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16f1503sip6', 'microchip8.pic16f1503sip6', 'Chip_Pic16F1503sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1503, PIC16LF1503 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16F1507dip20', 'microchip8.pic16f1507dip20', 'Chip_Pic16F1507dip20', 'microchip01dip14dip20', (56835, 1), 0, ('Microchip',), 'PIC16F1507, PIC16LF1507', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16F1507sip6', 'microchip8.pic16f1507sip6', 'Chip_Pic16F1507sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1507, PIC16LF1507 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16F1508dip20', 'microchip8.pic16f1508dip20', 'Chip_Pic16F1508dip20', 'microchip01dip14dip20', (56835, 1), 0, ('Microchip',), 'PIC16F1508, PIC16LF1508', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16F1508sip6', 'microchip8.pic16f1508sip6', 'Chip_Pic16F1508sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1508, PIC16LF1508 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16F1509dip20', 'microchip8.pic16f1509dip20', 'Chip_Pic16F1509dip20', 'microchip01dip14dip20', (56835, 1), 0, ('Microchip',), 'PIC16F1509, PIC16LF1509', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16F1509sip6', 'microchip8.pic16f1509sip6', 'Chip_Pic16F1509sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1509, PIC16LF1509 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16f1824dip14', 'microchip8.pic16f1824dip14', 'Chip_Pic16F1824dip14', 'microchip01dip14dip20', (56835, 1), 0, ('Microchip',), 'PIC16F1824, PIC16LF1824', (('DIP14', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1824sip6', 'microchip8.pic16f1824sip6', 'Chip_Pic16F1824sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1824, PIC16LF1824 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1825dip14', 'microchip8.pic16f1825dip14', 'Chip_Pic16F1825dip14', 'microchip01dip14dip20', (56835, 1), 0, ('Microchip',), 'PIC16F1825, PIC16LF1825', (('DIP14', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1825sip6', 'microchip8.pic16f1825sip6', 'Chip_Pic16F1825sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1825, PIC16LF1825 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('PIC16F1826dip18', 'microchip8.pic16f1826dip18', 'Chip_PIC16F1826dip18', 'microchip01dip18', (56836, 1), 0, ('Microchip',), 'PIC16F1826, PIC16LF1826', (('DIP18', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('PIC16F1826sip6', 'microchip8.pic16f1826sip6', 'Chip_PIC16F1826sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1826, PIC16LF1826 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1827dip18', 'microchip8.pic16f1827dip18', 'Chip_Pic16F1827dip18', 'microchip01dip18', (56836, 1), 0, ('Microchip',), 'PIC16F1827, PIC16LF1827', (('dip18', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1827sip6', 'microchip8.pic16f1827sip6', 'Chip_Pic16F1827sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1827, PIC16LF1827 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1828dip20', 'microchip8.pic16f1828dip20', 'Chip_Pic16F1828dip20', 'microchip01dip14dip20', (56835, 1), 0, ('Microchip',), 'PIC16F1828, PIC16LF1828', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1828sip6', 'microchip8.pic16f1828sip6', 'Chip_Pic16F1828sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1828, PIC16LF1828 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1829dip20', 'microchip8.pic16f1829dip20', 'Chip_Pic16F1829dip20', 'microchip01dip14dip20', (56835, 1), 0, ('Microchip',), 'PIC16F1829, PIC16LF1829', (('DIP20', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1829sip6', 'microchip8.pic16f1829sip6', 'Chip_Pic16F1829sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1829, PIC16LF1829 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1933dip28', 'microchip8.pic16f1933dip28', 'Chip_Pic16F1933dip28', 'microchip01dip28', (56839, 1), 0, ('Microchip',), 'PIC16F1933, PIC16LF1933', (('dip28', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1933sip6', 'microchip8.pic16f1933sip6', 'Chip_Pic16F1933sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1933, PIC16LF1933 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1934dip40a', 'microchip8.pic16f1934dip40', 'Chip_Pic16F1934dip40', 'microchip01dip40', (56840, 1), 0, ('Microchip',), 'PIC16F1934,PIC16LF1934', (('dip40', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1934sip6a', 'microchip8.pic16f1934sip6', 'Chip_Pic16F1934sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1934,PIC16LF1934 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1936dip28', 'microchip8.pic16f1936dip28', 'Chip_Pic16F1936dip28', 'microchip01dip28', (56839, 1), 0, ('Microchip',), 'PIC16F1936, PIC16LF1936', (('dip28', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1936sip6', 'microchip8.pic16f1936sip6', 'Chip_Pic16F1936sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1936, PIC16LF1936 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1937dip40', 'microchip8.pic16f1937dip40', 'Chip_Pic16F1937dip40', 'microchip01dip40a', (56840, 1), 0, ('Microchip',), 'PIC16F1937, PIC16LF1937', (('dip40', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1937sip6', 'microchip8.pic16f1937sip6', 'Chip_Pic16F1937sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1937, PIC16LF1937 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1938dip28', 'microchip8.pic16f1938dip28', 'Chip_Pic16F1938dip28', 'microchip01dip28', (56839, 1), 0, ('Microchip',), 'PIC16F1938, PIC16LF1938', (('dip28', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1938sip6', 'microchip8.pic16f1938sip6', 'Chip_Pic16F1938sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1938, PIC16LF1938 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1939dip40', 'microchip8.pic16f1939dip40', 'Chip_Pic16F1939dip40', 'microchip01dip40a', (56840, 1), 0, ('Microchip',), 'PIC16F1939, PIC16LF1939', (('dip40', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f1939sip6', 'microchip8.pic16f1939sip6', 'Chip_Pic16F1939sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F1939, PIC16LF1939 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f59dip40', 'microchip8.pic16f59dip40', 'Chip_Pic16F59dip40', 'microchip01dip40', (56838, 1), 0, ('Microchip',), 'PIC16F59', (('DIP40', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24781, ()),
+	('pic16f59sip6', 'microchip8.pic16f59sip6', 'Chip_Pic16F59sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F59 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24781, ()),
+	('pic16F630dip14', 'microchip8.pic16f630dip14', 'Chip_Pic16F630dip14', 'microchip01dip14dip20', (56835, 1), 0, ('Microchip',), 'PIC16F630, PIC16F676', (('DIP14', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16F630sip6', 'microchip8.pic16f630sip6', 'Chip_Pic16F630sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F630, PIC16F676 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f84adip18', 'microchip8.pic16f84adip18', 'Chip_Pic16F84adip18', 'microchip01dip18', (56836, 1), 0, ('Microchip',), 'PIC16F84A, PIC16LF84A', (('DIP18', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16f84asip6', 'microchip8.pic16f84asip6', 'Chip_Pic16F84asip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16F84A, PIC16LF84A - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('pic16lf1902dip28', 'microchip8.pic16lf1902dip28', 'Chip_Pic16LF1902dip28', 'microchip01dip28', (56839, 1), 0, ('Microchip',), 'PIC16LF1902', (('dip28', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16lf1902sip6', 'microchip8.pic16lf1902sip6', 'Chip_Pic16LF1902sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16LF1902 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16lf1903dip28', 'microchip8.pic16lf1903dip28', 'Chip_Pic16LF1903dip28', 'microchip01dip28', (56839, 1), 0, ('Microchip',), 'PIC16LF1903', (('dip28', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16lf1903sip6', 'microchip8.pic16lf1903sip6', 'Chip_Pic16LF1903sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16LF1903 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16lf1904dip40', 'microchip8.pic16lf1904dip40', 'Chip_Pic16LF1904dip40', 'microchip01dip40a', (56840, 1), 0, ('Microchip',), 'PIC16LF1904', (('dip40', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16lf1904sip6', 'microchip8.pic16lf1904sip6', 'Chip_Pic16LF1904sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16LF1904 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16lf1906dip28', 'microchip8.pic16lf1906dip28', 'Chip_Pic16LF1906dip28', 'microchip01dip28', (56839, 1), 0, ('Microchip',), 'PIC16LF1906', (('dip28', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16lf1906sip6', 'microchip8.pic16lf1906sip6', 'Chip_Pic16LF1906sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16LF1906 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16lf1907dip40', 'microchip8.pic16lf1907dip40', 'Chip_Pic16LF1907dip40', 'microchip01dip40a', (56840, 1), 0, ('Microchip',), 'PIC16LF1907', (('dip40', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('pic16lf1907sip6', 'microchip8.pic16lf1907sip6', 'Chip_Pic16LF1907sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC16LF1907 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24783, ()),
+	('PIC18F1220dip18', 'microchip8.pic18f1220dip18', 'Chip_PIC18F1220dip18', 'microchip01dip18', (56836, 1), 0, ('Microchip',), 'PIC18F1220', (('DIP18', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('PIC18F1220sip6', 'microchip8.pic18f1220sip6', 'Chip_PIC18F1220sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC18F1220 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('PIC18F2320dip28', 'microchip8.pic18f2320dip28', 'Chip_PIC18F2320dip28', 'microchip01dip28', (56839, 1), 0, ('Microchip',), 'PIC18F2320', (('DIP18', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('PIC18F2320sip6', 'microchip8.pic18f2320sip6', 'Chip_PIC18F2320sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC18F2320 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('PIC18F2321dip28', 'microchip8.pic18f2321dip28', 'Chip_PIC18F2321dip28', 'microchip01dip28', (56839, 1), 0, ('Microchip',), 'PIC18F2321', (('DIP28', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('PIC18F2321sip6', 'microchip8.pic18f2321sip6', 'Chip_PIC18F2321sip6', 'microchip01sip6', (56837, 1), 0, ('Microchip',), 'PIC18F2321 - ICD', (('DIP10', ''),), '', 'Pavel Stemberk <stemberk@gmail.com>', False, 24831, ()),
+	('unitest', 'unitest', 'Chip_Unitest', 'unitest', (8, 1), 999, ('Other',), 'Universal device tester', None, '', 'Michael Buesch <m@bues.ch>', False, 0, ()),
+	('w29ee011dip32', 'w29ee011dip32', 'Chip_w29ee011dip32', 'w29ee011dip32', (9, 1), 2, ('Winbond',), 'W29EE011 EEPROM', (('DIP32', ''), ('PLCC32', 'Use 1:1 PLCC32->DIP32 adapter')), '', 'Michael Buesch <m@bues.ch>', True, 49, ()),
+)
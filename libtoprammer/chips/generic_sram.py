@@ -36,35 +36,42 @@ class Chip_genericSRAM(Chip):
 		self.nrAddressBytes = int(math.ceil((float(self.nrAddressBits) - 0.1) / 8))
 		self.nrDataBits = nrDataBits
 		assert(nrDataBits == 8)
+		self.cellBlocks = {}
 
 	def erase(self):
 		self.writeRAM(int2byte(0) * self.__sizeBytes())
 
 	def test(self):
-		generic = GenericAlgorithms(self)
-		generic.simpleTest(self.readRAM, self.writeRAM,
-				   self.__sizeBytes())
+		tests = None
+		if self.getChipOptionValue("quick_test", False):
+			tests = ("checkerboard", "address", "march-c-")
+		self.__turnOnChip()
+		report = MemoryTest(self, self.__sizeBytes(), self.__sweep).run(tests)
+		self.__setControlPins(CE=1, OE=1, WE=1)
+		if not report.ok():
+			for line in report.format():
+				self.printInfo(line)
+			self.throwError("Unit-test failed. "
+				"The chip may be physically broken.")
 
 	def readRAM(self):
-		image = []
+		image = bytearray(self.__sizeBytes())
+		for (offset, data) in self.readRAMChunks():
+			image[offset : offset + len(data)] = data
+		return bytes(image)
 
-		self.progressMeterInit("Reading SRAM", self.__sizeBytes())
+	def readRAMChunks(self):
 		self.__turnOnChip()
-		self.__setControlPins(CE=0, OE=0, WE=1)
-		nrBytes = 0
-		for addr in range(0, self.__sizeBytes()):
-			self.progressMeter(addr)
-			self.__setAddress(addr)
-			self.__readData()
-			nrBytes += 1
-			if nrBytes == self.top.getBufferRegSize():
-				image.append(self.top.cmdReadBufferReg(nrBytes))
-				nrBytes = 0
-		image.append(self.top.cmdReadBufferReg(nrBytes))
-		self.__setControlPins(CE=1, OE=1, WE=1)
-		self.progressMeterFinish()
-
-		return b"".join(image)
+		return GenericAlgorithms(self).simpleReadChunks(
+			name = "SRAM",
+			sizeBytes = self.__sizeBytes(),
+			readData8Func = self.__readData,
+			addrSetter = AddrSetter(self, *[ 0x12 + i for i
+						in range(self.nrAddressBytes) ]),
+			initFunc = lambda: self.__setControlPins(CE=0, OE=0, WE=1),
+			exitFunc = lambda: self.__setControlPins(CE=1, OE=1, WE=1),
+			readFPGAAddr = 0x10
+		)
 
 	def writeRAM(self, image):
 		if len(image) > self.__sizeBytes():
@@ -73,28 +80,126 @@ class Chip_genericSRAM(Chip):
 
 		self.progressMeterInit("Writing SRAM", self.__sizeBytes())
 		self.__turnOnChip()
-		self.__setControlPins(CE=0, OE=1, WE=1)
-		for addr in range(0, len(image)):
-			self.progressMeter(addr)
-			self.__setAddress(addr)
+		for (offset, data) in self.__sweep(image = image, progress = True):
+			pass
+		self.__setControlPins(CE=1, OE=1, WE=1)
+		self.progressMeterFinish()
+
+	def __sweep(self, read=False, image=None, descending=False, progress=False):
+		"""Access the cells in ascending or descending address order.
+		read => Read each cell. Yields the (offset, data) chunks of the
+			reads, with the data in ascending address order.
+		image => Write image[address] to each cell, after the read.
+			 Only the cells up to len(image) are accessed.
+		The cells after the first one of each buffer register chunk
+		are queued as precompiled CommandBlock()."""
+		size = len(image) if image is not None else self.__sizeBytes()
+		regSize = self.top.getBufferRegSize()
+		assert(256 % regSize == 0)
+		self.__setControlPins(CE=0, OE=0 if image is None else 1, WE=1)
+		bases = range(0, size, regSize)
+		if descending:
+			bases = reversed(bases)
+		pending = []
+		for base in bases:
+			addrs = range(base, min(base + regSize, size))
+			if descending:
+				addrs = addrs[::-1]
+			if progress:
+				self.progressMeter(base)
+			self.__accessCell(addrs[0], read, image)
+			if len(addrs) > 1:
+				self.top.cmdQueueCommandBlock(
+					self.__compileCells(addrs[1:], read, image))
+			self.lastAddress = addrs[-1]
+			if read:
+				pending.append((base, descending,
+					self.top.cmdReadBufferRegDeferred(nrBytes = len(addrs))))
+				while pending and pending[0][2].done:
+					yield self.__chunk(*pending.pop(0))
+		self.top.collectDeferredReads()
+		for chunk in pending:
+			yield self.__chunk(*chunk)
+
+	@staticmethod
+	def __chunk(base, descending, read):
+		data = read.result()
+		return (base, data[::-1] if descending else data)
+
+	def __accessCell(self, addr, read, image):
+		self.__setAddress(addr)
+		if read:
+			if image is not None:
+				self.__setControlPins(CE=0, OE=0, WE=1)
+			self.__readData()
+		if image is not None:
+			if read:
+				self.__setControlPins(CE=0, OE=1, WE=1)
 			self.__writeData(image[addr])
 			self.__setControlPins(CE=0, OE=1, WE=0)
 			self.top.cmdDelay(0.00000007) # Delay at least 70 nsec
 			self.__setControlPins(CE=0, OE=1, WE=1)
-		self.__setControlPins(CE=1, OE=1, WE=1)
-		self.progressMeterFinish()
+
+	def __compileCells(self, addrs, read, image):
+		"""Returns a CommandBlock() that does __accessCell() on all
+		'addrs'. The addrs must only differ in address byte 0."""
+		key = (read, image is not None, len(addrs))
+		entry = self.cellBlocks.get(key)
+		if entry is None:
+			# Build the commands of one cell with zero operands.
+			# The address and data operands are patched in per sweep.
+			top = self.top
+			def controlPins(CE, OE, WE):
+				return top.encodeFPGAWrite(0x11,
+					self.__controlPinsValue(CE, OE, WE))
+			record = [ top.encodeFPGAWrite(0x12, 0) ]
+			if read:
+				if image is not None:
+					record.append(controlPins(CE=0, OE=0, WE=1))
+				record.append(top.encodeFPGARead(0x10))
+			dataPos = None
+			if image is not None:
+				if read:
+					record.append(controlPins(CE=0, OE=1, WE=1))
+				record.append(top.encodeFPGAWrite(0x10, 0))
+				dataPos = sum(len(c) for c in record) - 1
+				record.append(controlPins(CE=0, OE=1, WE=0))
+				record.extend(top.encodeDeviceDelay(0.00000007))
+				record.append(controlPins(CE=0, OE=1, WE=1))
+			recordLen = sum(len(c) for c in record)
+			entry = (CommandBlock(record * len(addrs)), recordLen,
+				 len(record[0]) - 1, dataPos)
+			self.cellBlocks[key] = entry
+		(block, recordLen, addrPos, dataPos) = entry
+		data = bytearray(block.data)
+		low = min(addrs[0], addrs[-1])
+		addrBytes = bytes(range(low & 0xFF, (low & 0xFF) + len(addrs)))
+		if image is not None:
+			cells = image[low : low + len(addrs)]
+		if addrs.step < 0:
+			addrBytes = addrBytes[::-1]
+			if image is not None:
+				cells = cells[::-1]
+		data[addrPos::recordLen] = addrBytes
+		if image is not None:
+			data[dataPos::recordLen] = cells
+		return block.withData(data)
 
 	def __sizeBytes(self):
 		return (1 << self.nrAddressBits)
 
 	def __turnOnChip(self):
+		# Data, control pins and address bytes only latch the value.
+		self.top.setWriteOnlyFPGARegs(
+			{ 0x10 + i : 0x00 for i in range(2 + self.nrAddressBytes) })
 		self.__setControlPins(CE=1, OE=1, WE=1)
 		self.top.cmdSetVCCVoltage(self.VCCVoltage)
 		self.applyGND(True)
 		self.applyVCC(True)
 		self.lastAddress = None
 
-	def __setControlPins(self, CE=1, OE=1, WE=1):
+	@staticmethod
+	def __controlPinsValue(CE=1, OE=1, WE=1):
 		value = 0
 		if CE:
 			value |= 1
@@ -102,7 +207,10 @@ class Chip_genericSRAM(Chip):
 			value |= 2
 		if WE:
 			value |= 4
-		self.top.cmdFPGAWrite(0x11, value)
+		return value
+
+	def __setControlPins(self, CE=1, OE=1, WE=1):
+		self.top.cmdFPGAWrite(0x11, self.__controlPinsValue(CE, OE, WE))
 
 	def __writeData(self, data):
 		data = byte2int(data)
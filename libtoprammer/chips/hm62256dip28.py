@@ -41,5 +41,9 @@ ChipDescription(
 	chipType = ChipDescription.TYPE_SRAM,
 	chipVendors = "S@Tech",
 	description = "HM62256 SRAM",
-	packages = ( ("DIP28", ""), )
+	packages = ( ("DIP28", ""), ),
+	chipOptions = (
+		ChipOptionBool("quick_test",
+			"Skip the walking ones and zeros RAM tests"),
+	)
 )
@@ -28,6 +28,10 @@ class Chip_m24cXXdip8_common(Chip):
 	I2C_READ	= 0x01
 	I2C_WRITE	= 0x00
 
+	PAGE_SIZE	= 16
+
+	INCREMENTAL_WRITES = ("eeprom", )
+
 	def __init__(self, eepromSize):
 		Chip.__init__(self,
 			      chipPackage = "DIP8",
@@ -50,71 +54,89 @@ class Chip_m24cXXdip8_common(Chip):
 		self.writeEEPROM(b"\xFF" * self.eepromSize)
 
 	def readEEPROM(self):
+		return b"".join(data for (addr, data) in self.readEEPROMChunks())
+
+	def readEEPROMChunks(self):
 		self.__chipTurnOn()
 
-		image = b""
 		prevAddr = None
 		self.progressMeterInit("Reading EEPROM", self.eepromSize)
-		for addr in range(0, self.eepromSize):
-			self.progressMeter(addr)
-			if prevAddr is None or (prevAddr & 0xFF00) != (addr & 0xFF00):
-				self.__setAddressExtension(addr, writeMode=False)
-				# Begin sequential random read
-				self.__runI2C(data=self.I2C_BASE_ADDR | self.currentAddrExt | self.I2C_WRITE,
-					      read=False, do_start=True, do_stop=False)
-				self.__expectACK()
-				self.__runI2C(data=addr & 0xFF,
-					      read=False, do_start=False, do_stop=False)
-				self.__expectACK()
-				self.__runI2C(data=self.I2C_BASE_ADDR | self.currentAddrExt | self.I2C_READ,
-					      read=False, do_start=True, do_stop=False)
-				self.__expectACK()
-				prevAddr = addr
-			# Sequential random read
-			if addr >= self.eepromSize - 1:
-				# Last byte
+		try:
+			for addr in range(0, self.eepromSize):
+				self.progressMeter(addr)
+				if prevAddr is None or (prevAddr & 0xFF00) != (addr & 0xFF00):
+					self.__beginRead(addr)
+					prevAddr = addr
+				# Sequential random read
+				if addr >= self.eepromSize - 1:
+					# Last byte
+					self.__runI2C(read=True, do_start=False, do_stop=True)
+					self.__expectNACK()
+				else:
+					self.__runI2C(read=True, do_start=False, do_stop=False,
+						      drive_ack=True)
+					self.__expectACK()
+				self.__readData()
+				yield (addr, self.top.cmdReadBufferReg(1))
+		except (GeneratorExit) as e:
+			# Stopped early. Terminate the sequential read with NACK and STOP.
+			if addr < self.eepromSize - 1:
 				self.__runI2C(read=True, do_start=False, do_stop=True)
-				self.__expectNACK()
-			else:
-				self.__runI2C(read=True, do_start=False, do_stop=False,
-					      drive_ack=True)
-				self.__expectACK()
-			self.__readData()
-			image += self.top.cmdReadBufferReg(1)
+			self.progressMeterFinish()
+			raise
 		self.progressMeterFinish()
 
-		return image
-
 	def writeEEPROM(self, image):
 		if len(image) > self.eepromSize:
 			self.throwError("Invalid EEPROM image size %d (expected <=%d)" %\
 				(len(image), self.eepromSize))
+		pages = None
+		incremental = None
+		if self.top.getIncrementalWrites():
+			incremental = IncrementalWrite(self, "EEPROM", self.readEEPROM,
+						       image, self.PAGE_SIZE)
+			pages = incremental.pages
 		self.__chipTurnOn()
-
-		self.progressMeterInit("Writing EEPROM", len(image))
-		prevAddr = None
-		for addr in range(0, len(image)):
-			self.progressMeter(addr)
-			if prevAddr is None or (prevAddr & 0xFFF0) != (addr & 0xFFF0):
-				self.__setAddressExtension(addr, writeMode=True)
-				self.__runI2C(data=self.I2C_BASE_ADDR | self.currentAddrExt | self.I2C_WRITE,
-					      read=False, do_start=True, do_stop=False)
-				self.__expectACK()
-				self.__runI2C(data=addr & 0xFF,
-					      read=False, do_start=False, do_stop=False)
-				self.__expectACK()
-				prevAddr = addr
-			if (addr & 0xF) == 0xF:
-				self.__runI2C(data=byte2int(image[addr]),
-					      read=False, do_start=False, do_stop=True)
-				self.__expectACK()
-				self.top.cmdDelay(0.005) # Max write time
-			else:
-				self.__runI2C(data=byte2int(image[addr]),
-					      read=False, do_start=False, do_stop=False)
-				self.__expectACK()
-
-		self.progressMeterFinish()
+		if incremental:
+			incremental.beginPages()
+
+		GenericAlgorithms(self).pageWrite(
+			name = "EEPROM",
+			image = image,
+			pageSize = self.PAGE_SIZE,
+			programPage = self.__programPage,
+			waitReady = lambda address: self.top.cmdDelay(0.005), # Max write time
+			pages = pages)
+		if incremental:
+			incremental.finish()
+
+	def __programPage(self, pageAddress, pageData):
+		self.__setAddressExtension(pageAddress, writeMode=True)
+		self.__runI2C(data=self.I2C_BASE_ADDR | self.currentAddrExt | self.I2C_WRITE,
+			      read=False, do_start=True, do_stop=False)
+		self.__expectACK()
+		self.__runI2C(data=pageAddress & 0xFF,
+			      read=False, do_start=False, do_stop=False)
+		self.__expectACK()
+		for (i, dataByte) in enumerate(pageData):
+			# STOP after the last byte starts the write cycle.
+			self.__runI2C(data=byte2int(dataByte),
+				      read=False, do_start=False,
+				      do_stop=(i == len(pageData) - 1))
+			self.__expectACK()
+
+	def __beginRead(self, address):
+		"Begin a sequential random read at 'address'."
+		self.__setAddressExtension(address, writeMode=False)
+		self.__runI2C(data=self.I2C_BASE_ADDR | self.currentAddrExt | self.I2C_WRITE,
+			      read=False, do_start=True, do_stop=False)
+		self.__expectACK()
+		self.__runI2C(data=address & 0xFF,
+			      read=False, do_start=False, do_stop=False)
+		self.__expectACK()
+		self.__runI2C(data=self.I2C_BASE_ADDR | self.currentAddrExt | self.I2C_READ,
+			      read=False, do_start=True, do_stop=False)
+		self.__expectACK()
 
 	def __readData(self):
 		self.top.cmdFPGARead(0)
@@ -289,6 +289,10 @@ class Chip_M8C_ISSP(Chip):
 		self.progressMeterFinish()
 		return b"".join(image)
 
+	def getBlankPattern(self):
+		# The erased M8C flash reads as zero.
+		return b"\x00"
+
 	def __powerDown(self):
 		"Turn the power to the device off"
 		self.printDebug("Powering device down...")
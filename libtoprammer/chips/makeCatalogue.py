@@ -0,0 +1,80 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Chip catalogue generator
+#
+#    Run as:  python3 -m libtoprammer.chips.makeCatalogue [--check]
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from libtoprammer.chip import *
+from libtoprammer.chips import CHIP_MODULES
+import sys
+import os
+
+
+MODULE_PREFIX = "libtoprammer.chips."
+
+def makeEntry(desc):
+	cls = desc.chipImplClass
+	assert(cls.__module__.startswith(MODULE_PREFIX))
+	return (desc.chipID, cls.__module__[len(MODULE_PREFIX):], cls.__name__,
+		desc.bitfile, tuple(desc.runtimeID), desc.chipType,
+		tuple(desc.chipVendors), desc.description,
+		tuple(tuple(p) for p in desc.packages) if desc.packages else desc.packages,
+		desc.comment, desc.maintainer, desc.broken,
+		desc.getSupportFlags(), tuple(desc.getChipOptionStrings()))
+
+def makeCatalogue():
+	for module in CHIP_MODULES:
+		importChipModule(module)
+	moduleIndex = { module : i for (i, module) in enumerate(CHIP_MODULES) }
+	entries = [ makeEntry(desc) for desc in getLoadedChips() ]
+	# Order by module. Keep the registration order within a module.
+	entries.sort(key=lambda entry: moduleIndex[entry[1]])
+	text = "#\n"
+	text += "# THIS FILE WAS AUTOGENERATED BY makeCatalogue.py\n"
+	text += "# Do not edit this file manually. All changes will be lost.\n"
+	text += "#\n\n"
+	text += "# (chipID, module, class, bitfile, runtimeID, chipType, chipVendors,\n"
+	text += "#  description, packages, comment, maintainer, broken,\n"
+	text += "#  supportFlags, chipOptions)\n"
+	text += "CATALOGUE = (\n"
+	for entry in entries:
+		text += "\t%r,\n" % (entry, )
+	text += ")\n"
+	return text
+
+def main(argv):
+	filename = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+				"catalogue.py")
+	text = makeCatalogue()
+	if "--check" in argv[1:]:
+		try:
+			with open(filename, "r") as fd:
+				old = fd.read()
+		except (IOError) as e:
+			old = None
+		if old != text:
+			print("The chip catalogue is out of date.")
+			return 1
+		return 0
+	with open(filename, "w") as fd:
+		fd.write(text)
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main(sys.argv))
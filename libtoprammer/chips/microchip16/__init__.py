@@ -1,24 +1,29 @@
-from .pic24f04ka200dip14 import *
-from .pic24f04ka201dip20 import *
-from .pic24f16kl402dip28 import *
-from .pic24f08kl402dip28 import *
-from .pic24f16kl401dip20 import *
-from .pic24f08kl401dip20 import *
-from .pic24f08kl302dip28 import *
-from .pic24f08kl301dip20 import *
-from .pic24f08kl201dip20 import *
-from .pic24f08kl200dip14 import *
-from .pic24f04kl101dip20 import *
-from .pic24f04kl100dip14 import *
-from .pic24f04ka200sip6 import *
-from .pic24f04ka201sip6 import *
-from .pic24f04kl100sip6 import *
-from .pic24f04kl101sip6 import *
-from .pic24f08kl200sip6 import *
-from .pic24f08kl201sip6 import *
-from .pic24f08kl301sip6 import *
-from .pic24f08kl302sip6 import *
-from .pic24f08kl401sip6 import *
-from .pic24f08kl402sip6 import *
-from .pic24f16kl401sip6 import *
-from .pic24f16kl402sip6 import *
+# All chip driver modules of this package in **ALPHABETICAL** order.
+# See libtoprammer/chips/__init__.py
+
+CHIP_MODULES = (
+	"pic24f04ka200dip14",
+	"pic24f04ka201dip20",
+	"pic24f16kl402dip28",
+	"pic24f08kl402dip28",
+	"pic24f16kl401dip20",
+	"pic24f08kl401dip20",
+	"pic24f08kl302dip28",
+	"pic24f08kl301dip20",
+	"pic24f08kl201dip20",
+	"pic24f08kl200dip14",
+	"pic24f04kl101dip20",
+	"pic24f04kl100dip14",
+	"pic24f04ka200sip6",
+	"pic24f04ka201sip6",
+	"pic24f04kl100sip6",
+	"pic24f04kl101sip6",
+	"pic24f08kl200sip6",
+	"pic24f08kl201sip6",
+	"pic24f08kl301sip6",
+	"pic24f08kl302sip6",
+	"pic24f08kl401sip6",
+	"pic24f08kl402sip6",
+	"pic24f16kl401sip6",
+	"pic24f16kl402sip6",
+)
@@ -195,7 +195,7 @@ class Chip_Microchip16_common(Chip):
 		# return self.readSequentialBlock(0x0 , nrWords/2, "Reading Progmem")
 		# something wrong for packed PM reading below
 		self.enterPM()
-		self.progressMeterInit("Reading flash", nrWords // 2)
+		self.progressMeterInit("Reading flash", nrWords // 2, stepBytes = 8)
 		self.BufferedBytes = 0
 		self.Image = b""
 		self.executeCode(self.codeExitResetVector)
@@ -217,10 +217,14 @@ class Chip_Microchip16_common(Chip):
 		self.exitPM()
 		return unpackImage()
 
+	def getBlankPattern(self):
+		# readProgmem() pads each 24 bit instruction word with a zero byte.
+		return b"\xFF\xFF\xFF\x00"
+
 	def _t_readEEPROM(self):	
 		nrWords = self.eepromPages * self.eepromPageSize
 		self.enterPM()
-		self.progressMeterInit("Reading EEPROM", nrWords)
+		self.progressMeterInit("Reading EEPROM", nrWords, stepBytes = 2)
 		self.BufferedBytes = 0
 		self.Image = b""
 		self.executeCode(self.codeExitResetVector)
@@ -272,7 +276,7 @@ class Chip_Microchip16_common(Chip):
 
 	def readSequentialBlock(self, startAddr, nWords, infoText):	
 		self.enterPM()
-		self.progressMeterInit(infoText, nWords)
+		self.progressMeterInit(infoText, nWords, stepBytes = 2)
 		self.BufferedBytes = 0
 		self.Image = b""
 		self.executeCode(self.codeExitResetVector)
@@ -329,7 +333,7 @@ class Chip_Microchip16_common(Chip):
 		if len(image) > (nrWords * 4) or len(image) % 4 != 0:
 			self.throwError("Invalid flash image size %d (expected <=%d and double word aligned)" % \
 				(len(image), nrWords * 4))
-		self.progressMeterInit("Writing flash", len(image) // 12)
+		self.progressMeterInit("Writing flash", len(image) // 16, stepBytes = 16)
 		self.enterPM()
 		self.executeCode(self.codeExitResetVector)
 		self.executeCode(self.getCodeSetNVMCON(0x4004))
@@ -347,7 +351,7 @@ class Chip_Microchip16_common(Chip):
 		if len(image) > nrWords * 2:
 			self.throwError("Invalid flash image size {:d} (expected <={:d})".format(len(image), 2 * nrWords))
 		self.enterPM()
-		self.progressMeterInit("Writing eeprom", len(image) // 2)
+		self.progressMeterInit("Writing eeprom", len(image) // 2, stepBytes = 2)
 		self.executeCode(self.codeExitResetVector)
 		self.executeCode(self.getCodeSetNVMCON(0x4004))
 		for addr in range(0, len(image) // 2):
@@ -156,30 +156,39 @@ class Chip_Microchip8_common(Chip):
 		self.top.cmdDelay(self.delayTera)  # Tera
 		
 	def readProgmem(self):	
+		return b"".join(data for (offset, data) in self.readProgmemChunks())
+
+	def readProgmemChunks(self):
 		nrWords = self.flashPages * self.flashPageSize
-		image = b""
+		offset = 0
 		self.enterPM()
 		self.setPC(0)
-		self.progressMeterInit("Reading flash", nrWords)
-		bufferedBytes = 0
-		for word in range(0, nrWords):
-			self.sendReadFlashInstr()
-			# self.top.cmdDelay(0.00002) #20us wait - inconsistent data if skipped
-			self.top.cmdDelay(self.delayTdly)
-			
-			self.readSDOBufferLow()
-			bufferedBytes += 1
-			self.readSDOBufferHigh()
-			bufferedBytes += 1
-			if bufferedBytes == self.top.getBufferRegSize():
-				image += self.top.cmdReadBufferReg(bufferedBytes)
-				self.progressMeter(word)
-				bufferedBytes = 0
-			self.incrementPC(1)
-		image += self.top.cmdReadBufferReg(bufferedBytes)
-		self.progressMeterFinish()
+		self.progressMeterInit("Reading flash", nrWords, stepBytes = 2)
+		try:
+			bufferedBytes = 0
+			for word in range(0, nrWords):
+				self.sendReadFlashInstr()
+				# self.top.cmdDelay(0.00002) #20us wait - inconsistent data if skipped
+				self.top.cmdDelay(self.delayTdly)
+				
+				self.readSDOBufferLow()
+				bufferedBytes += 1
+				self.readSDOBufferHigh()
+				bufferedBytes += 1
+				if bufferedBytes == self.top.getBufferRegSize():
+					data = self.top.cmdReadBufferReg(bufferedBytes)
+					yield (offset, data)
+					offset += len(data)
+					self.progressMeter(word)
+					bufferedBytes = 0
+				self.incrementPC(1)
+			yield (offset, self.top.cmdReadBufferReg(bufferedBytes))
+		finally:
+			self.progressMeterFinish()
 		# self.exitPM()
-		return image
+
+	def getBlankPattern(self):
+		return self.defaultWord[0] + self.defaultWord[1]
 	
 	def readEEPROM(self):	
 		nrWords = self.eepromPages * self.eepromPageSize
@@ -225,7 +234,7 @@ class Chip_Microchip8_common(Chip):
 		if len(image) > nrWords * 2 or len(image) % 2 != 0:
 			self.throwError("Invalid flash image size %d (expected <=%d and word aligned)" % \
 				(len(image), nrWords * 2))
-		self.progressMeterInit("Writing flash", len(image) // 2)
+		self.progressMeterInit("Writing flash", len(image) // 2, stepBytes = 2)
 		self.enterPM()
 		self.setPC(0)
 		latCnt=1;
@@ -282,7 +291,8 @@ class Chip_Microchip8_common(Chip):
 		self.enterPM()
 		self.enterConfigArea()
 		self.setPC(self.userIDLocationAddr)
-		self.progressMeterInit("Writing User ID Location", (len(image) // 2) - 1)
+		self.progressMeterInit("Writing User ID Location", (len(image) // 2) - 1,
+				       stepBytes = 2)
 		for word in range(0, (len(image) // 2)):
 			self.progressMeter(word)
 			# do not swap following two lines
@@ -86,9 +86,9 @@ class microchip8_singlePMarea(Chip_Microchip8_common):
 
 	def sendWriteFlashInstrCW(self):
 		self.sendWriteFlashInstr()
-	def readProgmem(self):
+	def readProgmemChunks(self):
 		self.exitPM()
-		return Chip_Microchip8_common.readProgmem(self)
+		return Chip_Microchip8_common.readProgmemChunks(self)
 	def readFuse(self):
 		self.exitPM()
 		return Chip_Microchip8_common.readFuse(self)
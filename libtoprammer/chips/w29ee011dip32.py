@@ -29,6 +29,10 @@ class Chip_w29ee011dip32(Chip):
 
 	STAT_BUSY		= 0x01 # Programmer is running a command
 
+	PAGE_SIZE		= 128
+
+	INCREMENTAL_WRITES	= ("eeprom", )
+
 	def __init__(self):
 		Chip.__init__(self,
 			      chipPackage = "DIP32",
@@ -73,56 +77,68 @@ class Chip_w29ee011dip32(Chip):
 
 		self.progressMeterInit("Reading EEPROM", 0x20000)
 		self.__setCEOE(CE=0, OE=0)
-		image = self.__readRange(0, 0x20000, progress=True)
+		self.readAddr = None
+		image = bytearray(0x20000)
+		regSize = self.top.getBufferRegSize()
+		for addr in range(0, len(image), regSize):
+			self.__queueRead(addr, regSize, progress=True)
+			self.top.cmdReadBufferRegDeferred(image, addr, regSize)
 		self.__setCEOE(CE=1, OE=1)
+		self.top.collectDeferredReads()
 		self.progressMeterFinish()
 
-		return image
-
-	def __readRange(self, baseAddress, size, progress=False):
-		image = b""
-		byteCount = 0
-		prevAddr = baseAddress
-		self.__loadReadAddrLo(baseAddress)
-		self.__loadReadAddrMed(baseAddress >> 8)
-		self.__loadReadAddrHi(baseAddress >> 16)
-		for offset in range(0, size):
-			addr = baseAddress + offset
+		return bytes(image)
+
+	def __queueRead(self, baseAddress, size, progress=False):
+		"""Queue the reads of 'size' bytes into the buffer register.
+		Only the changed read address bytes are loaded."""
+		prevAddr = self.readAddr
+		for addr in range(baseAddress, baseAddress + size):
 			if progress:
 				self.progressMeter(addr)
-			if (addr & 0xFF) != (prevAddr & 0xFF):
+			if prevAddr is None or (addr & 0xFF) != (prevAddr & 0xFF):
 				self.__loadReadAddrLo(addr)
-			if (addr & 0xFF00) != (prevAddr & 0xFF00):
+			if prevAddr is None or (addr & 0xFF00) != (prevAddr & 0xFF00):
 				self.__loadReadAddrMed(addr >> 8)
-			if (addr & 0xFF0000) != (prevAddr & 0xFF0000):
+			if prevAddr is None or (addr & 0xFF0000) != (prevAddr & 0xFF0000):
 				self.__loadReadAddrHi(addr >> 16)
 			prevAddr = addr
 			self.top.cmdFPGARead(0x10)
-			byteCount += 1
-			if byteCount == self.top.getBufferRegSize():
-				image += self.top.cmdReadBufferReg(byteCount)
-				byteCount = 0
-		image += self.top.cmdReadBufferReg(byteCount)
-		return image
+		self.readAddr = prevAddr
 
 	def writeEEPROM(self, image):
 		if len(image) > 0x20000:
 			self.throwError("Invalid EPROM image size %d (expected <=%d)" %\
 				(len(image), 0x20000))
+		pages = None
+		incremental = None
+		if self.top.getIncrementalWrites():
+			# A page write erases the page first.
+			incremental = IncrementalWrite(self, "EEPROM", self.readEEPROM,
+						       image, self.PAGE_SIZE)
+			pages = incremental.pages
 
 		self.applyVCC(True)
 		self.applyVPP(True)
 		self.applyGND(True)
 
-		self.progressMeterInit("Writing EEPROM", len(image))
+		if incremental:
+			incremental.beginPages()
 		self.__setCEOE(CE=0, OE=1)
-		for addr in range(0, len(image), 128):
-			self.progressMeter(addr)
-			pagelen = min(128, len(image) - addr)
-			page = image[addr:addr+pagelen]
-			self.__writePage(addr, page)
+		self.readAddr = None
+		GenericAlgorithms(self).pageWrite(
+			name = "EEPROM",
+			image = image,
+			pageSize = self.PAGE_SIZE,
+			programPage = self.__programPage,
+			waitReady = self.__waitPageReady,
+			readPage = self.__readPage,
+			pages = pages,
+			nrRetries = 15,
+			retryDelay = 0.1)
 		self.__setCEOE(CE=1, OE=1)
-		self.progressMeterFinish()
+		if incremental:
+			incremental.finish()
 
 	def __swDataProtect(self, enable):
 		if enable:
@@ -143,25 +159,32 @@ class Chip_w29ee011dip32(Chip):
 		for command in jedecCommands:
 			self.__appendJEDEC(command[0], command[1])
 
-	def __writePage(self, pageAddress, pageData):
-		for t in range(0, 15):
-			self.__resetBufferPointers()
-			self.__swDataProtect(True)
-			assert(len(pageData) <= 128)
-			for byte in pageData:
-				self.__writeBufAppend(byte2int(byte))
-			self.__loadWriteAddr(pageAddress)
-			self.__runCommandSync(self.PROGCMD_WRITEBUF)
-			self.top.hostDelay(0.01)
-			# Verify
-			self.__setCEOE(CE=0, OE=0)
-			verifyImage = self.__readRange(pageAddress, len(pageData))
-			self.__setCEOE(CE=0, OE=1)
-			if verifyImage == pageData:
-				break
-			self.top.hostDelay(0.1)
-		else:
-			self.throwError("Verify error on page write at address 0x%05X" % pageAddress)
+	def __programPage(self, pageAddress, pageData):
+		self.__resetBufferPointers()
+		self.__swDataProtect(True)
+		assert(len(pageData) <= 128)
+		for byte in pageData:
+			self.__writeBufAppend(byte2int(byte))
+		self.__loadWriteAddr(pageAddress)
+		self.__loadCommand(self.PROGCMD_WRITEBUF)
+
+	def __waitPageReady(self, pageAddress):
+		# The FPGA runs the write buffer command in less than
+		# (6 + 128) * 2 + 350 usec. Then the page write cycle takes
+		# up to 10 msec. Wait on the device instead of polling the
+		# busy flag, so that no status read blocks the next page.
+		self.top.cmdDelay(0.001 + 0.01)
+
+	def __readPage(self, address, nrBytes):
+		reads = []
+		regSize = self.top.getBufferRegSize()
+		self.__setCEOE(CE=0, OE=0)
+		for offset in range(0, nrBytes, regSize):
+			count = min(regSize, nrBytes - offset)
+			self.__queueRead(address + offset, count)
+			reads.append(self.top.cmdReadBufferRegDeferred(nrBytes = count))
+		self.__setCEOE(CE=0, OE=1)
+		return reads
 
 	def __writeBufAppend(self, byte):
 		# This also auto-increments the write buffer pointer
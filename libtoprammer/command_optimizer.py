@@ -0,0 +1,147 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Peephole optimizer for the queued command stream.
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .util import *
+
+
+class DecodedCommand(object):
+	"""One decoded hardware command.
+	'data' holds the raw command bytes."""
+
+	__slots__ = ("kind", "address", "value", "data")
+
+	KIND_OTHER	= 0	# Opaque command. Kept as is.
+	KIND_WRITE	= 1	# FPGA register write
+	KIND_READ	= 2	# FPGA register read
+	KIND_DELAY	= 3	# On-device delay. 'value' is the delay in usec.
+	KIND_RESET	= 4	# Command that resets all FPGA registers
+
+	def __init__(self, kind, data, address=None, value=None):
+		self.kind = kind
+		self.data = data
+		self.address = address
+		self.value = value
+
+class CommandOptimizer(object):
+	"""Peephole optimizer for decoded command lists.
+	It only drops or merges commands. It never reorders them,
+	so the order of all reads and writes is preserved.
+
+	encodeDelay is a function that returns the shortest list of
+	DecodedCommand() for a delay of 'usec' microseconds."""
+
+	def __init__(self, encodeDelay):
+		self.encodeDelay = encodeDelay
+		self.passes = (
+			("idempotent-writes",	self.__passIdempotentWrites),
+			("merge-delays",	self.__passMergeDelays),
+		)
+		self.writeOnlyRegs = {}
+		self.regValues = {}
+		self.resetStats()
+
+	def resetStats(self):
+		self.nrRuns = 0
+		self.passStats = { name : [0, 0, 0, 0] for (name, func) in self.passes }
+
+	def getStats(self):
+		"""Returns a dict of pass name -> dict of
+		commandsIn, commandsOut, bytesIn and bytesOut."""
+		stats = { "runs" : self.nrRuns, }
+		for (name, (cmdsIn, cmdsOut, bytesIn, bytesOut)) in self.passStats.items():
+			stats[name] = {
+				"commandsIn"	: cmdsIn,
+				"commandsOut"	: cmdsOut,
+				"bytesIn"	: bytesIn,
+				"bytesOut"	: bytesOut,
+				"bytesSaved"	: bytesIn - bytesOut,
+			}
+		return stats
+
+	def setWriteOnlyRegs(self, regs):
+		"""Declare the write-only FPGA registers.
+		regs is a dict of register address -> selector mask.
+		A write to such a register is dropped, if the register already
+		holds the written value. Writing a register must not have
+		any side effect except latching the value.
+		A non-zero selector mask declares a register that is split into
+		several sub-registers. The value bits in the mask select the
+		sub-register. The other bits are the sub-register value."""
+		self.writeOnlyRegs = dict(regs)
+		self.regValues = {}
+
+	def invalidate(self):
+		"Forget all known register values."
+		self.regValues = {}
+
+	def optimize(self, commands):
+		"Run all passes on the list of DecodedCommand(). Returns the new list."
+		self.nrRuns += 1
+		for (name, func) in self.passes:
+			stats = self.passStats[name]
+			stats[0] += len(commands)
+			stats[2] += sum(len(c.data) for c in commands)
+			commands = func(commands)
+			stats[1] += len(commands)
+			stats[3] += sum(len(c.data) for c in commands)
+		return commands
+
+	def __passIdempotentWrites(self, commands):
+		writeOnlyRegs, regValues = self.writeOnlyRegs, self.regValues
+		if not writeOnlyRegs:
+			return commands
+		ret = []
+		for c in commands:
+			if c.kind == DecodedCommand.KIND_WRITE:
+				selMask = writeOnlyRegs.get(c.address)
+				if selMask is not None:
+					key = (c.address, c.value & selMask)
+					value = c.value & ~selMask
+					if regValues.get(key) == value:
+						continue # Register already holds the value
+					regValues[key] = value
+			elif c.kind == DecodedCommand.KIND_RESET:
+				regValues.clear()
+			ret.append(c)
+		return ret
+
+	def __passMergeDelays(self, commands):
+		ret = []
+		run = []
+		for c in commands:
+			if c.kind == DecodedCommand.KIND_DELAY:
+				run.append(c)
+				continue
+			if run:
+				self.__mergeDelayRun(run, ret)
+				run = []
+			ret.append(c)
+		if run:
+			self.__mergeDelayRun(run, ret)
+		return ret
+
+	def __mergeDelayRun(self, run, ret):
+		if len(run) > 1:
+			merged = self.encodeDelay(sum(c.value for c in run))
+			if sum(len(c.data) for c in merged) <\
+			   sum(len(c.data) for c in run):
+				ret.extend(merged)
+				return
+		ret.extend(run)
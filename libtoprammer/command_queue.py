@@ -21,28 +21,346 @@
 """
 
 from .util import *
+from .command_optimizer import *
+import sys
 import time
+import os
+import bisect
+import itertools
 
 
+# Modules of the transport layer. Call sites are searched outside of them.
+TRANSPORT_MODULES = (
+	"libtoprammer.command_", "libtoprammer.hardware_access",
+	"libtoprammer.top2049.hardware_access", "libtoprammer.profiler",
+)
+
+def findCallerFrame():
+	"""Returns the frame that called into the transport layer.
+	That is the first chip driver frame. The outermost TOP frame
+	is used, if the call did not come from a chip driver."""
+	frame, site = sys._getframe(1), None
+	while frame is not None:
+		module = frame.f_globals.get("__name__", "")
+		if not module.startswith(TRANSPORT_MODULES):
+			if module == "libtoprammer.main":
+				site = frame
+			else:
+				if site is None or module.startswith("libtoprammer."):
+					site = frame
+				break
+		frame = frame.f_back
+	return site
+
+class CommandBlock(object):
+	"""A precompiled run of raw commands.
+	Build it once and queue it many times with
+	CommandQueue.queueCommandBlock()."""
+
+	def __init__(self, commands):
+		"commands is a list of raw commands (bytes)."
+		self.data = b"".join(commands)
+		self.ends = list(itertools.accumulate(len(c) for c in commands))
+		self.opcodes = [ c[0] for c in commands ]
+
+	def __len__(self):
+		return len(self.ends)
+
+	def withData(self, data):
+		"""Returns a block with the same commands, but the raw bytes
+		'data'. Only the command operands may differ."""
+		assert(len(data) == len(self.data))
+		block = CommandBlock([])
+		block.data = bytes(data)
+		block.ends = self.ends
+		block.opcodes = self.opcodes
+		return block
+
+	def commands(self):
+		"Returns the list of raw commands."
+		return [ self.data[start:end] for (start, end)
+			 in zip([ 0 ] + self.ends, self.ends) ]
+
 class CommandQueue(object):
-	"Generic hardware-command queue. Needs to be subclassed."
+	"""Generic hardware-command queue. Needs to be subclassed.
+	All queued commands are stored back to back in one bytearray.
+	The packet boundaries are tracked as offsets into that buffer,
+	so a flush can send the packets as memoryview slices."""
 
-	def __init__(self, maxPacketBytes, synchronous=False):
+	def __init__(self, maxPacketBytes, synchronous=False,
+		     maxTransferBytes=None, padByte=None, optimizer=None):
+		"""maxPacketBytes is the hardware packet size.
+		maxTransferBytes is the max size of one send() call. It must be a
+		multiple of maxPacketBytes. If it is bigger than one packet, all but
+		the last packet are padded to full size with 'padByte' commands,
+		so that no command straddles a packet edge.
+		optimizer is an optional CommandOptimizer(). It is run on the
+		queued commands on each flush. The subclass must implement
+		decodeCommands() to use it."""
 		self.maxPacketBytes = maxPacketBytes
 		self.synchronous = synchronous
-		self.commandQueue = []
+		if not maxTransferBytes:
+			maxTransferBytes = maxPacketBytes
+		assert(maxTransferBytes % maxPacketBytes == 0)
+		self.maxTransferBytes = maxTransferBytes
+		self.padPackets = (maxTransferBytes > maxPacketBytes)
+		if self.padPackets:
+			assert(padByte is not None)
+			self.padding = bytes((padByte,)) * maxPacketBytes
+		self.optimizer = optimizer
+		self.profiler = None
+		self.collectSites = False	# Count the flushes per call site
+		self.cmdBuf = bytearray()
+		self.packetEnds = []	# End offsets of all closed packets
+		self.padStarts = []	# Padding start offsets of all closed packets
+		self.packetStart = 0	# Start offset of the open packet
+		self.pendingDelay = 0	# Delay not yet planned, in seconds
+		self.hostDeadline = 0.0	# No send before this perf_counter() time
+		self.lastSendTime = 0.0	# perf_counter() time of the last finished send
+		self.unsyncedSends = False # Sent since lastSendTime was taken
+		self.resetQueueStats()
+
+	def resetQueueStats(self):
+		"Reset the queue statistics counters."
+		self.opcodeCounts = [ 0 ] * 256	# Queued commands, by first byte
+		self.nrFlushes = 0		# Flushes that sent commands
+		self.flushSites = {}		# Flush call site -> count
+		self.nrSends = 0		# send() calls
+		self.nrPacketsSent = 0
+		self.nrBytesSent = 0
+		self.nrPadBytesSent = 0
+		self.hostWaitRequestedSec = 0.0	# Sum of all sleepSeconds
+		self.hostWaitSec = 0.0		# Time spent waiting for host deadlines
+		if self.profiler:
+			self.profiler.reset()
+
+	def getQueueStats(self):
+		"Returns a dict of queue statistics."
+		payload = self.nrBytesSent - self.nrPadBytesSent
+		stats = {
+			"commands"		: sum(self.opcodeCounts),
+			"commandsByOpcode"	: { opcode : count for (opcode, count)
+						    in enumerate(self.opcodeCounts) if count },
+			"flushes"		: self.nrFlushes,
+			"flushSites"		: dict(self.flushSites),
+			"transfers"		: self.nrSends,
+			"packets"		: self.nrPacketsSent,
+			"bytesSent"		: self.nrBytesSent,
+			"packetFill"		: (payload / (self.nrPacketsSent * self.maxPacketBytes))
+						  if self.nrPacketsSent else 0.0,
+			"hostWaitRequestedSeconds" : self.hostWaitRequestedSec,
+			"hostWaitSeconds"	: self.hostWaitSec,
+		}
+		if self.profiler:
+			stats["profile"] = self.profiler.getStats()
+		return stats
+
+	def setProfiler(self, profiler):
+		"""Set a TransportProfiler() that gets all queued
+		commands, delays and flushes. None disables profiling."""
+		self.profiler = profiler
+
+	def __flushCallSite(self):
+		"Returns the caller that triggered the flush, as string."
+		site = findCallerFrame()
+		if site is None:
+			return "unknown"
+		code = site.f_code
+		return "%s:%d %s()" % (os.path.basename(code.co_filename),
+				       site.f_lineno, code.co_name)
+
+	def __reserve(self, size):
+		"""Make room for a 'size' bytes command in the open packet.
+		Closes the open packet, if the command does not fit."""
+		if self.pendingDelay:
+			self.__planPendingDelay()
+		end = len(self.cmdBuf)
+		if end - self.packetStart + size > self.maxPacketBytes:
+			self.padStarts.append(end)
+			if self.padPackets:
+				padSize = self.packetStart + self.maxPacketBytes - end
+				self.cmdBuf += self.padding[:padSize]
+				end += padSize
+			self.packetEnds.append(end)
+			self.packetStart = end
 
 	def queueCommand(self, command):
 		"""Queue a raw command for transmission."""
 		if isinstance(command, str):
 			# Compat for old code
 			command = b"".join(int2byte(ord(c)) for c in command)
-		assert isinstance(command, (bytes, bytearray))
+		assert isinstance(command, (bytes, bytearray, memoryview))
 		assert(len(command) <= self.maxPacketBytes)
+		self.__reserve(len(command))
+		self.cmdBuf += command
+		if command:
+			self.opcodeCounts[command[0]] += 1
+		if self.profiler:
+			self.profiler.commandsQueued(1, len(command))
+		if self.synchronous:
+			self.flushCommands()
+
+	def queuePackets(self, packets):
+		"""Queue a stream of full packets for transmission.
+		Each packet in the stream must hold exactly one command."""
+		step = self.maxPacketBytes
+		assert(len(packets) % step == 0)
+		if not packets:
+			return
+		if self.synchronous:
+			with memoryview(packets) as view:
+				for start in range(0, len(view), step):
+					self.queueCommand(view[start : start + step])
+			return
+		self.__reserve(step)
+		buf = self.cmdBuf
+		start = len(buf)
+		buf += packets
+		for end in range(start + step, len(buf), step):
+			self.padStarts.append(end)
+			self.packetEnds.append(end)
+		self.packetStart = len(buf) - step
+		opcodeCounts = self.opcodeCounts
+		for offset in range(start, len(buf), step):
+			opcodeCounts[buf[offset]] += 1
+		if self.profiler:
+			self.profiler.commandsQueued(len(packets) // step, len(packets))
+
+	def queueCommandBlock(self, block):
+		"""Queue all commands of a CommandBlock().
+		The commands are appended packet by packet,
+		not command by command."""
+		if self.synchronous:
+			for command in block.commands():
+				self.queueCommand(command)
+			return
+		data, ends = block.data, block.ends
+		buf, maxBytes = self.cmdBuf, self.maxPacketBytes
+		start, index = 0, 0
+		while index < len(ends):
+			# Close the open packet, if the next command does not fit.
+			self.__reserve(ends[index] - start)
+			free = maxBytes - (len(buf) - self.packetStart)
+			index = bisect.bisect_right(ends, start + free, index)
+			end = ends[index - 1]
+			buf += data[start:end]
+			start = end
+		opcodeCounts = self.opcodeCounts
+		for opcode in block.opcodes:
+			opcodeCounts[opcode] += 1
+		if self.profiler:
+			self.profiler.commandsQueued(len(ends), len(data))
+
+	def appendCommand1(self, byte0):
+		"""Queue a one-byte command."""
+		self.__reserve(1)
+		self.cmdBuf.append(byte0)
+		self.opcodeCounts[byte0] += 1
+		if self.profiler:
+			self.profiler.commandsQueued(1, 1)
+		if self.synchronous:
+			self.flushCommands()
+
+	def appendCommand2(self, byte0, byte1):
+		"""Queue a two-byte command."""
+		self.__reserve(2)
+		buf = self.cmdBuf
+		buf.append(byte0)
+		buf.append(byte1)
+		self.opcodeCounts[byte0] += 1
+		if self.profiler:
+			self.profiler.commandsQueued(1, 2)
+		if self.synchronous:
+			self.flushCommands()
+
+	def appendCommand3(self, byte0, byte1, byte2):
+		"""Queue a three-byte command."""
+		self.__reserve(3)
+		buf = self.cmdBuf
+		buf.append(byte0)
+		buf.append(byte1)
+		buf.append(byte2)
+		self.opcodeCounts[byte0] += 1
+		if self.profiler:
+			self.profiler.commandsQueued(1, 3)
 		if self.synchronous:
-			self.send(command)
+			self.flushCommands()
+
+	def appendRepeated(self, byte0, count):
+		"""Queue 'count' one-byte commands 'byte0'.
+		The run may span several packets."""
+		if self.synchronous:
+			for i in range(count):
+				self.appendCommand1(byte0)
+			return
+		buf, maxBytes = self.cmdBuf, self.maxPacketBytes
+		self.opcodeCounts[byte0] += max(count, 0)
+		if self.profiler:
+			self.profiler.commandsQueued(max(count, 0), max(count, 0))
+		while count > 0:
+			self.__reserve(1)
+			n = min(count, maxBytes - (len(buf) - self.packetStart))
+			buf += bytes((byte0,)) * n
+			count -= n
+
+	def decodeCommands(self, data):
+		"""Decode the raw commands in 'data'.
+		Returns a list of DecodedCommand()."""
+		raise NotImplementedError # Reimplement in subclass.
+
+	def appendFPGARead(self, address):
+		raise NotImplementedError # Reimplement in subclass.
+
+	def appendFPGAWrite(self, address, byte):
+		raise NotImplementedError # Reimplement in subclass.
+
+	def encodeFPGARead(self, address):
+		"""Returns the raw command of appendFPGARead().
+		Reimplement in subclass."""
+		raise NotImplementedError
+
+	def encodeFPGAWrite(self, address, byte):
+		"""Returns the raw command of appendFPGAWrite().
+		Reimplement in subclass."""
+		raise NotImplementedError
+
+	def encodeDeviceDelay(self, seconds):
+		"""Returns the raw commands of an on-device delay
+		of at least 'seconds'. Reimplement in subclass."""
+		raise NotImplementedError
+
+	def appendDelay(self, seconds):
+		raise NotImplementedError # Reimplement in subclass.
+
+	def delayOnHost(self, seconds):
+		"""Returns True, if a delay of 'seconds' shall be done as
+		host wait instead of an on-device delay.
+		Reimplement in subclass."""
+		return True
+
+	def queueDelay(self, seconds):
+		"""Delay the following commands by at least 'seconds'.
+		The delay is planned when the next command is queued or on
+		flush. So adjacent delays are coalesced into one."""
+		self.pendingDelay += seconds
+		if self.profiler:
+			self.profiler.delayQueued(seconds)
+		if self.synchronous:
+			self.__planPendingDelay()
+
+	def __planPendingDelay(self):
+		seconds, self.pendingDelay = self.pendingDelay, 0
+		if self.delayOnHost(seconds):
+			self.flushCommands(seconds)
+		elif self.profiler:
+			# The delay was attributed by queueDelay().
+			self.profiler.pause()
+			try:
+				self.appendDelay(seconds)
+			finally:
+				self.profiler.resume()
 		else:
-			self.commandQueue.append(command)
+			self.appendDelay(seconds)
 
 	def runCommandSync(self, command):
 		"""Run a command synchronously.
@@ -52,20 +370,103 @@ class CommandQueue(object):
 		self.flushCommands()
 
 	def flushCommands(self, sleepSeconds=0):
-		"""Flush the command queue."""
-		command = b""
-		commandQueue = self.commandQueue
-		self.commandQueue = []
-		for oneCommand in commandQueue:
-			assert(len(oneCommand) <= self.maxPacketBytes)
-			if len(command) + len(oneCommand) > self.maxPacketBytes:
-				self.send(command)
-				command = b""
-			command += oneCommand
-		if command:
-			self.send(command)
+		"""Flush the command queue.
+		The packets are passed to send() as memoryview slices of the
+		queue buffer. They are only valid during the send() call.
+		In large transfer mode one slice may hold several packets.
+		If 'sleepSeconds' is given, the following commands are not
+		sent before 'sleepSeconds' passed since this flush."""
+		if self.pendingDelay:
+			if sleepSeconds or self.delayOnHost(self.pendingDelay):
+				# The delay is part of the host wait.
+				sleepSeconds = max(sleepSeconds, self.pendingDelay)
+				self.pendingDelay = 0
+			else:
+				self.__planPendingDelay()
+		if self.optimizer and self.cmdBuf and not self.synchronous:
+			self.__optimize()
+		buf = self.cmdBuf
+		if buf:
+			profiler = self.profiler
+			if profiler:
+				profileStart = profiler.beginWait()
+			packetEnds = self.packetEnds
+			packetEnds.append(len(buf))
+			self.waitHostDeadline()
+			self.unsyncedSends = True
+			self.nrFlushes += 1
+			if self.collectSites:
+				site = self.__flushCallSite()
+				self.flushSites[site] = self.flushSites.get(site, 0) + 1
+			self.nrPacketsSent += len(packetEnds)
+			self.nrBytesSent += len(buf)
+			self.nrPadBytesSent += sum(end - padStart for (end, padStart)
+						   in zip(packetEnds, self.padStarts))
+			try:
+				with memoryview(buf) as view:
+					if self.padPackets:
+						# All closed packets are full. Send
+						# many of them in one transfer.
+						step = self.maxTransferBytes
+						for start in range(0, len(buf), step):
+							with view[start : start + step] as transfer:
+								self.send(transfer)
+							self.nrSends += 1
+					else:
+						start = 0
+						for end in packetEnds:
+							with view[start:end] as packet:
+								self.send(packet)
+							self.nrSends += 1
+							start = end
+			finally:
+				self.__clear()
+				if profiler:
+					profiler.endWait(profiler.WAIT_FLUSH, profileStart)
 		if sleepSeconds:
-			time.sleep(sleepSeconds)
+			self.hostWaitRequestedSec += sleepSeconds
+			if self.unsyncedSends:
+				self.drainSend()
+				self.lastSendTime = time.perf_counter()
+				self.unsyncedSends = False
+			self.hostDeadline = max(self.hostDeadline,
+						self.lastSendTime + sleepSeconds)
+
+	def waitHostDeadline(self):
+		"""Wait until the host deadline of the
+		last flushCommands(sleepSeconds) passed."""
+		timeout = self.hostDeadline - time.perf_counter()
+		if timeout > 0:
+			time.sleep(timeout)
+			self.hostWaitSec += timeout
+
+	def __clear(self):
+		del self.cmdBuf[:]
+		del self.packetEnds[:]
+		del self.padStarts[:]
+		self.packetStart = 0
+
+	def __optimize(self):
+		"""Run the optimizer on the queued commands
+		and queue the result again."""
+		buf = self.cmdBuf
+		commands = []
+		with memoryview(buf) as view:
+			starts = [ 0 ] + self.packetEnds
+			ends = self.padStarts + [ len(buf) ]
+			for (start, end) in zip(starts, ends):
+				with view[start:end] as packet:
+					commands.extend(self.decodeCommands(packet))
+		commands = self.optimizer.optimize(commands)
+		self.__clear()
+		for c in commands:
+			self.__reserve(len(c.data))
+			buf += c.data
+
+	def drainSend(self):
+		"""Wait until all sent packets reached the hardware.
+		Reimplement in subclass, if send() is asynchronous."""
+		pass
 
 	def send(self, data):
 		raise NotImplementedError # Reimplement in subclass.
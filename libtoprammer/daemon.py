@@ -0,0 +1,275 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Programmer daemon and its client
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .main import *
+from .actions import *
+import base64
+import json
+import os
+import socket
+import socketserver
+
+
+# The protocol is one JSON object per line in both directions.
+# The client sends one job and reads messages up to the result.
+# A job is a dict with the keys:
+#  action, chipID, chipOptions (list of [name, value]), device,
+#  verbose, forceLevel, usebroken, forceBitfileUpload,
+#  input (base64 file contents), inFormat
+# The daemon answers with any number of
+#  {"message": kind, "text": text}
+#  {"progress": "init"|"step"|"finish", "meterId": id, ...}
+# and one final
+#  {"result": True|False, "output": base64 image, "error": text}
+
+def daemonDefaultSocket():
+	"Returns the default daemon socket path."
+	runtimeDir = os.environ.get("XDG_RUNTIME_DIR")
+	if runtimeDir:
+		return os.path.join(runtimeDir, "toprammerd.sock")
+	return "/tmp/toprammerd-%d.sock" % os.getuid()
+
+def _sendMessage(wfile, msg):
+	wfile.write(json.dumps(msg).encode("UTF-8") + b"\n")
+	wfile.flush()
+
+def _recvMessage(rfile):
+	line = rfile.readline()
+	if not line:
+		raise TOPException("toprammerd: Connection closed")
+	try:
+		return json.loads(line.decode("UTF-8"))
+	except (ValueError) as e:
+		raise TOPException("toprammerd: Invalid message: %s" % str(e))
+
+class DaemonUserInterface(AbstractUserInterface):
+	"Forwards all user interface calls to a daemon client."
+
+	def __init__(self, wfile):
+		self.wfile = wfile
+
+	def progressMeterInit(self, meterId, message, nrSteps):
+		_sendMessage(self.wfile, { "progress" : "init", "meterId" : meterId,
+					   "text" : message, "nrSteps" : nrSteps, })
+
+	def progressMeterFinish(self, meterId):
+		_sendMessage(self.wfile, { "progress" : "finish", "meterId" : meterId, })
+
+	def progressMeter(self, meterId, step):
+		_sendMessage(self.wfile, { "progress" : "step", "meterId" : meterId,
+					   "step" : step, })
+
+	def warningMessage(self, message):
+		_sendMessage(self.wfile, { "message" : "warning", "text" : message, })
+
+	def infoMessage(self, message):
+		_sendMessage(self.wfile, { "message" : "info", "text" : message, })
+
+	def debugMessage(self, message):
+		_sendMessage(self.wfile, { "message" : "debug", "text" : message, })
+
+class _DaemonRequestHandler(socketserver.StreamRequestHandler):
+	def handle(self):
+		try:
+			job = _recvMessage(self.rfile)
+		except (TOPException) as e:
+			return
+		try:
+			output = self.server.daemon.runJob(job,
+					DaemonUserInterface(self.wfile))
+			result = { "result" : True, }
+			if output is not None:
+				result["output"] = base64.b64encode(output).decode("ASCII")
+		except (TOPException, BitfileException, IOError, ValueError) as e:
+			result = { "result" : False, "error" : str(e), }
+		try:
+			_sendMessage(self.wfile, result)
+		except (OSError) as e:
+			pass # Client is gone.
+
+class ToprammerDaemon(object):
+	"""Long running owner of TOP instances.
+	One TOP instance per device identifier is created on the first
+	job for that device. It is kept open across jobs, so later jobs
+	skip the device scan, the programmer initialization and the
+	bitfile upload, if the chip type did not change.
+	Jobs are run one after the other.
+
+	topArgs are passed to each TOP() constructor."""
+
+	def __init__(self, socketPath=None, **topArgs):
+		if socketPath is None:
+			socketPath = daemonDefaultSocket()
+		self.socketPath = socketPath
+		self.topArgs = topArgs
+		self.tops = {}	# device identifier -> TOP()
+		self.server = None
+
+	def __getTOP(self, device, verbose, userInterface):
+		top = self.tops.get(device)
+		if top is None:
+			top = TOP(devIdentifier = device,
+				  verbose = verbose,
+				  userInterface = userInterface,
+				  **self.topArgs)
+			self.tops[device] = top
+		return top
+
+	def __dropTOP(self, device):
+		top = self.tops.pop(device, None)
+		if top:
+			try:
+				top.shutdownChip()
+			except (TOPException) as e:
+				pass
+			try:
+				top.shutdownProgrammer()
+			except (TOPException) as e:
+				pass
+
+	def runJob(self, job, userInterface):
+		"""Run one job dict. Returns the read image or None.
+		On errors the TOP instance is dropped, so the next job
+		starts from a clean programmer state."""
+		if not isinstance(job, dict):
+			raise TOPException("Invalid job: Expected an object")
+		device = job.get("device")
+		action = job.get("action")
+		if action is not None and action not in ACTIONS:
+			raise TOPException("Invalid action '%s'" % action)
+		verbose = job.get("verbose", 1)
+		try:
+			top = self.__getTOP(device, verbose, userInterface)
+			top.userInterface = userInterface
+			top.verbose = verbose
+			top.forceLevel = job.get("forceLevel", 0)
+			top.usebroken = job.get("usebroken", False)
+			top.forceBitfileUpload = job.get("forceBitfileUpload", False)
+			chipOptions = [ AssignedChipOption(name, value)
+					for (name, value) in job.get("chipOptions", ()) ]
+			top.initializeChip(chipID = job.get("chipID"),
+					   assignedChipOptions = chipOptions)
+			image = None
+			if action is not None:
+				if actionTakesImage(action):
+					data = base64.b64decode(job.get("input", ""))
+					image = decodeImage(top, action, data,
+							    job.get("inFormat", "auto"))
+				image = runAction(top, action, image)
+			top.shutdownChip()
+			top.userInterface = AbstractUserInterface()
+			return image
+		except (Exception) as e:
+			self.__dropTOP(device)
+			raise
+
+	def __removeStaleSocket(self):
+		"""Remove the socket of a daemon that exited without cleanup.
+		Raises TOPException, if a daemon is listening on the socket."""
+		sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		try:
+			sock.connect(self.socketPath)
+		except (FileNotFoundError) as e:
+			return
+		except (ConnectionRefusedError) as e:
+			os.unlink(self.socketPath)
+			return
+		finally:
+			sock.close()
+		raise TOPException("toprammerd is already running on '%s'" %\
+				   self.socketPath)
+
+	def serve(self):
+		"Serve jobs on the socket until shutdown() is called."
+		self.__removeStaleSocket()
+		oldUmask = os.umask(0o077)
+		try:
+			self.server = socketserver.UnixStreamServer(self.socketPath,
+						_DaemonRequestHandler)
+		finally:
+			os.umask(oldUmask)
+		socketStat = os.stat(self.socketPath)
+		self.server.daemon = self
+		try:
+			self.server.serve_forever()
+		finally:
+			self.server.server_close()
+			try:
+				# Do not remove the socket of another daemon.
+				st = os.stat(self.socketPath)
+				if (st.st_dev, st.st_ino) == (socketStat.st_dev, socketStat.st_ino):
+					os.unlink(self.socketPath)
+			except (OSError) as e:
+				pass
+			for device in list(self.tops.keys()):
+				self.__dropTOP(device)
+
+	def shutdown(self):
+		"Stop serve(). Must be called from another thread."
+		if self.server:
+			self.server.shutdown()
+
+class DaemonClient(object):
+	"Client of a ToprammerDaemon."
+
+	def __init__(self, socketPath=None):
+		if socketPath is None:
+			socketPath = daemonDefaultSocket()
+		self.socketPath = socketPath
+
+	def runJob(self, job, userInterface):
+		"""Send a job dict to the daemon. Messages are passed to
+		'userInterface'. Returns the read image or None."""
+		sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		try:
+			try:
+				sock.connect(self.socketPath)
+			except (OSError) as e:
+				raise TOPException("Failed to connect to toprammerd "
+					"at '%s': %s" % (self.socketPath, str(e)))
+			with sock.makefile("rb") as rfile, sock.makefile("wb") as wfile:
+				_sendMessage(wfile, job)
+				while True:
+					msg = _recvMessage(rfile)
+					if "result" in msg:
+						break
+					self.__dispatch(msg, userInterface)
+		finally:
+			sock.close()
+		if not msg["result"]:
+			raise TOPException(msg.get("error", "toprammerd: Job failed"))
+		output = msg.get("output")
+		return base64.b64decode(output) if output is not None else None
+
+	def __dispatch(self, msg, userInterface):
+		progress = msg.get("progress")
+		if progress == "init":
+			userInterface.progressMeterInit(msg["meterId"], msg["text"],
+							msg["nrSteps"])
+		elif progress == "step":
+			userInterface.progressMeter(msg["meterId"], msg["step"])
+		elif progress == "finish":
+			userInterface.progressMeterFinish(msg["meterId"])
+		elif msg.get("message") == "warning":
+			userInterface.warningMessage(msg["text"])
+		elif msg.get("message") == "info":
+			userInterface.infoMessage(msg["text"])
+		elif msg.get("message") == "debug":
+			userInterface.debugMessage(msg["text"])
@@ -0,0 +1,161 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Gang programming on several programmers in parallel
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .main import *
+from .actions import *
+import threading
+import time
+
+
+class GangUserInterface(AbstractUserInterface):
+	"""Prefixes all messages with the device identifier.
+	Progress meters are not shown, because they would interleave."""
+
+	lock = threading.Lock()
+
+	def __init__(self, devIdentifier, userInterface):
+		self.devIdentifier = devIdentifier
+		self.userInterface = userInterface
+
+	def __message(self, method, message):
+		with self.lock:
+			method("%s: %s" % (self.devIdentifier, message))
+
+	def warningMessage(self, message):
+		self.__message(self.userInterface.warningMessage, message)
+
+	def infoMessage(self, message):
+		self.__message(self.userInterface.infoMessage, message)
+
+	def debugMessage(self, message):
+		self.__message(self.userInterface.debugMessage, message)
+
+class GangResult(object):
+	"The outcome of a gang run on one programmer."
+
+	def __init__(self, devIdentifier):
+		self.devIdentifier = devIdentifier
+		self.error = None	# Error message. None on success.
+		self.initSeconds = 0.0	# Programmer and chip initialization time
+		self.actionSeconds = 0.0 # Time of all actions
+
+	def ok(self):
+		return self.error is None
+
+class GangProgrammer(object):
+	"""Runs the same actions on several programmers in parallel.
+	There is one worker thread and one TOP() per programmer.
+	A failure on one programmer does not stop the others.
+
+	topArgs are passed to each TOP() constructor."""
+
+	def __init__(self, devIdentifiers, verbose=1,
+		     userInterface=ConsoleUserInterface(), **topArgs):
+		if not devIdentifiers:
+			raise TOPException("Gang: No programmers")
+		if len(set(d.lower() for d in devIdentifiers)) != len(devIdentifiers):
+			raise TOPException("Gang: Programmer selected twice")
+		self.devIdentifiers = devIdentifiers
+		self.verbose = verbose
+		self.userInterface = userInterface
+		self.topArgs = topArgs
+
+	@classmethod
+	def findAllDevices(cls):
+		"Returns the identifiers of all attached programmers."
+		return [ d.devIdentifier for d in TOP.findDevices() ]
+
+	def __runParallel(self, func, items):
+		threads = [ threading.Thread(target = func, args = item)
+			    for item in items ]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+	def __initWorker(self, result, tops, chipID, assignedChipOptions):
+		start = time.perf_counter()
+		top = None
+		try:
+			top = TOP(devIdentifier = result.devIdentifier,
+				  verbose = self.verbose,
+				  userInterface = GangUserInterface(result.devIdentifier,
+								    self.userInterface),
+				  **self.topArgs)
+			top.initializeChip(chipID = chipID,
+					   assignedChipOptions = assignedChipOptions)
+			tops[result.devIdentifier] = top
+		except (Exception) as e:
+			# Any error only fails this programmer.
+			result.error = str(e)
+			if top:
+				top.shutdownProgrammer()
+		result.initSeconds = time.perf_counter() - start
+
+	def __actionWorker(self, result, top, actions, verify):
+		start = time.perf_counter()
+		try:
+			try:
+				for (action, image) in actions:
+					runAction(top, action, image, verify)
+				top.shutdownChip()
+			finally:
+				top.shutdownProgrammer()
+		except (Exception) as e:
+			if result.error is None:
+				result.error = str(e)
+		result.actionSeconds = time.perf_counter() - start
+
+	def run(self, chipID, actions, assignedChipOptions=(), verify=False):
+		"""Run 'actions' on all programmers.
+		actions is a list of (action, file data, file format) tuples.
+		The file data is None for actions without an input image.
+		The file data is decoded once for all programmers.
+		Returns a list of GangResult()."""
+		for (action, data, fmtString) in actions:
+			if action not in ACTIONS:
+				raise TOPException("Invalid action '%s'" % action)
+			if actionReturnsImage(action):
+				raise TOPException("Gang: Action '%s' is not supported. "
+					"Only actions without output can be ganged." % action)
+		results = [ GangResult(d) for d in self.devIdentifiers ]
+		tops = {}
+		self.__runParallel(self.__initWorker,
+				   [ (r, tops, chipID, assignedChipOptions) for r in results ])
+		if not tops:
+			return results
+		try:
+			# All programmers run the same chip. Decode with the first one.
+			decodeTOP = tops[next(r.devIdentifier for r in results if r.ok())]
+			decoded = []
+			for (action, data, fmtString) in actions:
+				image = None
+				if actionTakesImage(action):
+					image = decodeImage(decodeTOP, action, data, fmtString)
+				decoded.append((action, image))
+		except (Exception) as e:
+			for top in tops.values():
+				top.shutdownChip()
+				top.shutdownProgrammer()
+			raise
+		self.__runParallel(self.__actionWorker,
+				   [ (r, tops[r.devIdentifier], decoded, verify)
+				     for r in results if r.ok() ])
+		return results
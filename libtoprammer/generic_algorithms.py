@@ -21,6 +21,7 @@
 """
 
 from .util import *
+from .command_queue import CommandBlock
 
 
 class AddrSetter(object):
@@ -31,8 +32,8 @@ class AddrSetter(object):
 		     fpgaCmdByte1 = -1,
 		     fpgaCmdByte2 = -1,
 		     fpgaCmdByte3 = -1,
-		     addrSetupFunc = lambda byteNr, data: None,
-		     addrFinishFunc = lambda byteNr, data: None):
+		     addrSetupFunc = None,
+		     addrFinishFunc = None):
 		"""
 		chip => The Chip.
 		fpgaCmdByte0 => FPGA command number for setting addr byte 0.
@@ -49,8 +50,11 @@ class AddrSetter(object):
 			fpgaCmdByte2,
 			fpgaCmdByte3,
 		]
-		self.addrSetupFunc = addrSetupFunc
-		self.addrFinishFunc = addrFinishFunc
+		# Sweeps can only be compiled without setup/finish callbacks.
+		self.compilable = (addrSetupFunc is None and addrFinishFunc is None)
+		self.addrSetupFunc = addrSetupFunc or (lambda byteNr, data: None)
+		self.addrFinishFunc = addrFinishFunc or (lambda byteNr, data: None)
+		self.sweepBlocks = {}
 		self.reset()
 
 	def reset(self):
@@ -72,6 +76,39 @@ class AddrSetter(object):
 				self.addrFinishFunc(byteNr, addrByte)
 		self.prevAddr = addr
 
+	def canCompileSweep(self, count):
+		"""Returns True, if sweeps of 'count' addresses
+		can be loaded with loadSweep()."""
+		return self.compilable and count > 0 and\
+		       256 % count == 0 and self.fpgaCmds[0] >= 0
+
+	def loadSweep(self, addr, count, readFPGAAddr):
+		"""Load the addresses addr ... addr+count-1 and do an FPGA read
+		at 'readFPGAAddr' after each address.
+		Only address byte 0 changes within an aligned sweep.
+		So all but the first address are queued as one precompiled
+		CommandBlock(). See canCompileSweep()."""
+		top = self.chip.top
+		self.load(addr)
+		top.cmdFPGARead(readFPGAAddr)
+		if count > 1:
+			key = (addr & 0xFF, count, readFPGAAddr)
+			block = self.sweepBlocks.get(key)
+			if block is None:
+				block = self.__compileSweep(addr & 0xFF, count, readFPGAAddr)
+				self.sweepBlocks[key] = block
+			top.cmdQueueCommandBlock(block)
+		self.prevAddr = addr + count - 1
+
+	def __compileSweep(self, addrByte, count, readFPGAAddr):
+		top = self.chip.top
+		readCommand = top.encodeFPGARead(readFPGAAddr)
+		commands = []
+		for byte in range(addrByte + 1, addrByte + count):
+			commands.append(top.encodeFPGAWrite(self.fpgaCmds[0], byte))
+			commands.append(readCommand)
+		return CommandBlock(commands)
+
 class GenericAlgorithms(object):
 	"""Generic programming algorithms."""
 
@@ -98,41 +135,163 @@ class GenericAlgorithms(object):
 		       readData8Func,
 		       addrSetter,
 		       initFunc = lambda: None,
-		       exitFunc = lambda: None):
+		       exitFunc = lambda: None,
+		       readFPGAAddr = None):
 		"""Simple 8-bit data read algorithm."""
+		image = bytearray(sizeBytes)
+		for (offset, data) in self.simpleReadChunks(name, sizeBytes,
+				readData8Func, addrSetter, initFunc, exitFunc,
+				readFPGAAddr):
+			image[offset : offset + len(data)] = data
+		return bytes(image)
+
+	def simpleReadChunks(self, name, sizeBytes,
+			     readData8Func,
+			     addrSetter,
+			     initFunc = lambda: None,
+			     exitFunc = lambda: None,
+			     readFPGAAddr = None):
+		"""Simple 8-bit data read algorithm.
+		Yields (offset, data) for each buffer register chunk
+		as soon as it arrived. The caller may stop the iteration early.
+		If readData8Func only does an FPGA read, pass its address as
+		readFPGAAddr. The address sweep of each chunk is then queued
+		precompiled, if the addrSetter allows it."""
 		self.chip.progressMeterInit("Reading %s" % name, sizeBytes)
-		image, count = [], 0
+		pending, offset, count = [], 0, 0
+		regSize = self.chip.top.getBufferRegSize()
+		compiled = readFPGAAddr is not None and\
+			   addrSetter.canCompileSweep(regSize)
+
+		def finish():
+			exitFunc()
+			self.chip.top.collectDeferredReads()
+			self.chip.progressMeterFinish()
+
 		initFunc()
 		addrSetter.reset()
-		for addr in range(0, sizeBytes):
-			self.chip.progressMeter(addr)
-			addrSetter.load(addr)
-			readData8Func()
-			count += 1
-			if count == self.chip.top.getBufferRegSize():
-				image.append(self.chip.top.cmdReadBufferReg())
-				count = 0
+		try:
+			for addr in range(0, sizeBytes, regSize if compiled else 1):
+				self.chip.progressMeter(addr)
+				if compiled:
+					nrBytes = min(regSize, sizeBytes - addr)
+					addrSetter.loadSweep(addr, nrBytes, readFPGAAddr)
+					count += nrBytes
+				else:
+					addrSetter.load(addr)
+					readData8Func()
+					count += 1
+				if count == regSize:
+					pending.append((offset,
+						self.chip.top.cmdReadBufferRegDeferred(nrBytes = count)))
+					offset += count
+					count = 0
+					# Queueing a read may have completed the previous ones.
+					while pending and pending[0][1].done:
+						(chunkOffset, read) = pending.pop(0)
+						yield (chunkOffset, read.result())
+		except (GeneratorExit) as e:
+			finish()
+			raise
 		if count:
-			image.append(self.chip.top.cmdReadBufferReg()[:count])
-		exitFunc()
-		self.chip.progressMeterFinish()
-		return b"".join(image)
+			pending.append((offset,
+				self.chip.top.cmdReadBufferRegDeferred(nrBytes = count)))
+		finish()
+		for (chunkOffset, read) in pending:
+			yield (chunkOffset, read.result())
 
 	def simpleReadEPROM(self, sizeBytes,
 			    readData8Func,
 			    addrSetter,
 			    initFunc = lambda: None,
-			    exitFunc = lambda: None):
+			    exitFunc = lambda: None,
+			    readFPGAAddr = None):
 		return self.simpleRead("EPROM", sizeBytes, readData8Func,
-				       addrSetter, initFunc, exitFunc)
+				       addrSetter, initFunc, exitFunc, readFPGAAddr)
+
+	def simpleReadEPROMChunks(self, sizeBytes,
+				  readData8Func,
+				  addrSetter,
+				  initFunc = lambda: None,
+				  exitFunc = lambda: None,
+				  readFPGAAddr = None):
+		return self.simpleReadChunks("EPROM", sizeBytes, readData8Func,
+					     addrSetter, initFunc, exitFunc, readFPGAAddr)
 
 	def simpleReadEEPROM(self, sizeBytes,
 			     readData8Func,
 			     addrSetter,
 			     initFunc = lambda: None,
-			     exitFunc = lambda: None):
+			     exitFunc = lambda: None,
+			     readFPGAAddr = None):
 		return self.simpleRead("EEPROM", sizeBytes, readData8Func,
-				       addrSetter, initFunc, exitFunc)
+				       addrSetter, initFunc, exitFunc, readFPGAAddr)
+
+	def pageWrite(self, name, image, pageSize,
+		      programPage,
+		      waitReady,
+		      readPage = None,
+		      pages = None,
+		      nrRetries = 1,
+		      retryDelay = 0.0):
+		"""Page write algorithm with deferred verify.
+		name => Memory name for messages, like "EEPROM".
+		pageSize => Page size, in bytes.
+		programPage => programPage(address, data) queues the commands
+			       that program one page. data is shorter than
+			       pageSize for a partial last page.
+		waitReady => waitReady(address) queues the wait until the chip
+			     finished programming the page. It should not
+			     read from the device.
+		readPage => Optional readPage(address, nrBytes) queues the reads
+			    of nrBytes at address and returns a list of
+			    DeferredRead() for the data, in address order.
+			    If it is None, the pages are not verified.
+		pages => Optional list of the page numbers to write.
+			 Default is all pages of the image.
+		nrRetries => Max number of writes of one page.
+		retryDelay => Seconds to wait before a page is written again.
+		The readback of a page is compared after the next page
+		is queued. So the data is fetched in the same round trip
+		that sends the commands of the next page.
+		A page that does not match is written again right away."""
+		top = self.chip.top
+		if pages is None:
+			pages = range(0, (len(image) + pageSize - 1) // pageSize)
+		pages = list(pages)
+
+		def verifyPage(address, data, reads):
+			attempt = 1
+			while b"".join(read.result() for read in reads) != bytes(data):
+				if attempt >= nrRetries:
+					self.chip.throwError("Verify error on page write "
+							     "at address 0x%05X" % address)
+				attempt += 1
+				top.hostDelay(retryDelay)
+				programPage(address, data)
+				waitReady(address)
+				reads = readPage(address, len(data))
+
+		nrBytes = sum(min(pageSize, len(image) - page * pageSize)
+			      for page in pages)
+		self.chip.progressMeterInit("Writing %s" % name, nrBytes)
+		done = 0
+		unverified = None
+		for page in pages:
+			self.chip.progressMeter(done)
+			address = page * pageSize
+			data = image[address : address + pageSize]
+			programPage(address, data)
+			waitReady(address)
+			if readPage:
+				reads = readPage(address, len(data))
+				if unverified:
+					verifyPage(*unverified)
+				unverified = (address, data, reads)
+			done += len(data)
+		if unverified:
+			verifyPage(*unverified)
+		self.chip.progressMeterFinish()
 
 	def simpleTest(self, readFunc, writeFunc, size):
 		"""Simple Unit-test."""
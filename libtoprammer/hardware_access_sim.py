@@ -0,0 +1,59 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Simulated hardware access transport.
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .util import *
+
+
+class FoundSimDev(object):
+	def __init__(self):
+		self.usbdev = None
+
+class SimulatorTransport(object):
+	"""Runs all raw transport I/O against a simulated device.
+	Put this in front of a HardwareAccessUSB subclass.
+	The subclass must implement createSimulator(). The simulator
+	must implement bulkOut(), bulkIn(), getStats() and resetStats()."""
+
+	def __init__(self, *args, **kwargs):
+		self.sim = self.createSimulator()
+		super().__init__(*args, **kwargs)
+
+	def initTransport(self):
+		pass
+
+	def shutdownTransport(self):
+		pass
+
+	def writeTransport(self, data):
+		self.sim.bulkOut(data)
+
+	def readTransport(self, rxArray):
+		data = self.sim.bulkIn(len(rxArray))
+		memoryview(rxArray)[0:len(data)] = data
+		return len(data)
+
+	def getTransportStats(self):
+		stats = super().getTransportStats()
+		stats.update(self.sim.getStats())
+		return stats
+
+	def resetTransportStats(self):
+		super().resetTransportStats()
+		self.sim.resetStats()
@@ -0,0 +1,216 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Hardware access trace recording and replay.
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .util import *
+import struct
+import time
+
+
+class TraceFormat(object):
+	"""Binary trace file format.
+	The file starts with MAGIC, a version byte and the
+	length-prefixed ASCII programmer type string.
+	It is followed by records of RECORD header and payload.
+	Record header fields: type, start time in usec since the trace start,
+	duration in usec and payload length."""
+
+	MAGIC		= b"TOPTRACE"
+	VERSION		= 1
+	RECORD		= struct.Struct("<BQIH")
+
+	# Record types
+	TYPE_OUT	= 0x01	# Bulk-out transfer
+	TYPE_IN		= 0x02	# Bulk-in transfer
+
+class TraceWriter(TraceFormat):
+	def __init__(self, filename, programmerType):
+		try:
+			self.fd = open(filename, "wb")
+			programmerType = programmerType.encode("ASCII")
+			self.fd.write(self.MAGIC + bytes((self.VERSION,
+							  len(programmerType))) +\
+				      programmerType)
+		except (IOError) as e:
+			raise TOPException("Failed to create trace file \"%s\": %s" %\
+				(filename, str(e)))
+		self.startTime = time.perf_counter()
+
+	def write(self, recType, startTime, data):
+		"""Write a record. startTime is the perf_counter()
+		value at the start of the transfer."""
+		now = time.perf_counter()
+		self.fd.write(self.RECORD.pack(recType,
+			int((startTime - self.startTime) * 1000000),
+			min(int((now - startTime) * 1000000), 0xFFFFFFFF),
+			len(data)) + bytes(data))
+
+	def close(self):
+		if self.fd:
+			self.fd.close()
+			self.fd = None
+
+class TraceReader(TraceFormat):
+	def __init__(self, filename):
+		try:
+			self.fd = open(filename, "rb")
+			header = self.fd.read(len(self.MAGIC) + 2)
+			if len(header) != len(self.MAGIC) + 2 or\
+			   not header.startswith(self.MAGIC):
+				raise TOPException("\"%s\" is not a trace file" % filename)
+			if header[-2] != self.VERSION:
+				raise TOPException("Trace file \"%s\": Unsupported "
+					"version %d" % (filename, header[-2]))
+			programmerType = self.fd.read(header[-1])
+			self.programmerType = programmerType.decode("ASCII")
+		except (IOError) as e:
+			raise TOPException("Failed to read trace file \"%s\": %s" %\
+				(filename, str(e)))
+		except (UnicodeError) as e:
+			raise TOPException("Trace file \"%s\": Invalid header" % filename)
+		self.filename = filename
+		self.pushedBack = None
+
+	def getProgrammerType(self):
+		return self.programmerType
+
+	def next(self):
+		"""Returns the next record as tuple
+		(type, startUsec, durationUsec, data) or None at the end."""
+		if self.pushedBack:
+			record, self.pushedBack = self.pushedBack, None
+			return record
+		header = self.fd.read(self.RECORD.size)
+		if not header:
+			return None
+		try:
+			(recType, startUsec, durationUsec, size) = self.RECORD.unpack(header)
+		except (struct.error) as e:
+			raise TOPException("Trace file \"%s\" is truncated" % self.filename)
+		data = self.fd.read(size)
+		if len(data) != size:
+			raise TOPException("Trace file \"%s\" is truncated" % self.filename)
+		return (recType, startUsec, durationUsec, data)
+
+	def pushBack(self, record):
+		"Return a record to the reader. It is returned by the next next()."
+		assert(self.pushedBack is None)
+		self.pushedBack = record
+
+	def __iter__(self):
+		while True:
+			record = self.next()
+			if record is None:
+				break
+			yield record
+
+	def close(self):
+		if self.fd:
+			self.fd.close()
+			self.fd = None
+
+def readTraceProgrammerType(filename):
+	"Returns the programmer type string of a trace file."
+	reader = TraceReader(filename)
+	reader.close()
+	return reader.getProgrammerType()
+
+class FoundTraceDev(object):
+	def __init__(self, traceFile):
+		self.traceFile = traceFile
+		self.usbdev = None
+
+class TraceRecorder(object):
+	"""Records all raw transport I/O into a trace file.
+	Put this in front of a HardwareAccessUSB subclass.
+	The subclass must define PROGRAMMER_TYPE."""
+
+	def __init__(self, *args, traceFile, **kwargs):
+		self.traceWriter = TraceWriter(traceFile, self.PROGRAMMER_TYPE)
+		super().__init__(*args, **kwargs)
+
+	def writeTransport(self, data):
+		start = time.perf_counter()
+		super().writeTransport(data)
+		self.traceWriter.write(TraceFormat.TYPE_OUT, start, data)
+
+	def readTransport(self, rxArray):
+		start = time.perf_counter()
+		nrRead = super().readTransport(rxArray)
+		self.traceWriter.write(TraceFormat.TYPE_IN, start,
+				       memoryview(rxArray)[:nrRead])
+		return nrRead
+
+	def shutdownTransport(self):
+		try:
+			super().shutdownTransport()
+		finally:
+			self.traceWriter.close()
+
+class TraceReplayer(object):
+	"""Replays the bulk-in data of a recorded trace instead of doing
+	real transport I/O. Put this in front of a HardwareAccessUSB subclass.
+	The bulk-out data is compared to the trace, but a mismatch is only
+	counted. That way modified command streams can be replayed."""
+
+	def __init__(self, *args, traceFile, **kwargs):
+		self.traceReader = TraceReader(traceFile)
+		self.replayMismatches = 0
+		super().__init__(*args, **kwargs)
+
+	def initTransport(self):
+		pass
+
+	def shutdownTransport(self):
+		self.traceReader.close()
+
+	def writeTransport(self, data):
+		record = self.traceReader.next()
+		if record is None or record[0] != TraceFormat.TYPE_OUT:
+			if record is not None:
+				self.traceReader.pushBack(record)
+			self.replayMismatches += 1
+		elif record[3] != data:
+			self.replayMismatches += 1
+
+	def readTransport(self, rxArray):
+		while True:
+			record = self.traceReader.next()
+			if record is None:
+				raise TOPException("Replay: Trace file \"%s\" has no "
+					"more bulk-in data" % self.traceReader.filename)
+			if record[0] == TraceFormat.TYPE_IN:
+				break
+			self.replayMismatches += 1 # Skipped bulk-out record
+		data = record[3]
+		if len(data) > len(rxArray):
+			raise TOPException("Replay: Recorded bulk-in size %d "
+				"does not match the requested size %d" %\
+				(len(data), len(rxArray)))
+		memoryview(rxArray)[0:len(data)] = data
+		return len(data)
+
+	def getTransportStats(self):
+		stats = super().getTransportStats()
+		stats["replayMismatches"] = self.replayMismatches
+		return stats
+
+	def resetTransportStats(self):
+		super().resetTransportStats()
+		self.replayMismatches = 0
@@ -22,6 +22,10 @@
 
 from .util import *
 from .command_queue import *
+import array
+import threading
+import queue
+import time
 try:
 	import usb.core
 	import usb.util
@@ -35,10 +39,45 @@ class FoundUSBDev(object):
 	def __init__(self, usbdev):
 		self.usbdev = usbdev
 
+class DeferredRead(object):
+	"""A pending bulk-in read.
+	The data is fetched from the hardware on the first result() call,
+	or when HardwareAccessUSB.collectDeferredReads() is called.
+	If 'buf' is given, the data is also copied to buf[offset:]."""
+
+	def __init__(self, hw, size, nrBytes, buf=None, offset=0):
+		self.hw = hw
+		self.size = size
+		self.nrBytes = nrBytes
+		self.buf = buf
+		self.offset = offset
+		self.done = False
+		self.data = None
+
+	def complete(self, view):
+		data = view[:self.nrBytes]
+		if self.buf is not None:
+			self.buf[self.offset : self.offset + self.nrBytes] = data
+		else:
+			self.data = bytes(data)
+		self.done = True
+
+	def result(self):
+		"Returns the data. Blocks until it is available."
+		if not self.done:
+			self.hw.collectDeferredReads(self)
+		if self.data is None:
+			self.data = bytes(self.buf[self.offset : self.offset + self.nrBytes])
+		return self.data
+
 class HardwareAccessUSB(CommandQueue):
 	"Lowlevel USB hardware access"
 
 	TIMEOUT_MSEC = 2000
+	ASYNC_RING_PACKETS = 64 # Size of the asynchronous writer ring
+	# Max number of bulk-in reads that may be pending on the device.
+	# The device can only hold one unread IN buffer.
+	MAX_DEFERRED_READS = 1
 
 	@classmethod
 	def scan(cls, checkCallback):
@@ -49,16 +88,27 @@ class HardwareAccessUSB(CommandQueue):
 		return devices
 
 	def __init__(self, usbdev, maxPacketBytes, noQueue,
-		     doRawDump=False):
+		     doRawDump=False, asyncWrites=False,
+		     maxTransferBytes=None, padByte=None, optimizer=None):
 		CommandQueue.__init__(self,
 				      maxPacketBytes = maxPacketBytes,
-				      synchronous = noQueue)
+				      synchronous = noQueue,
+				      maxTransferBytes = maxTransferBytes,
+				      padByte = padByte,
+				      optimizer = optimizer)
 		self.doRawDump = doRawDump
 		self.usbdev = usbdev
+		self.__rxBuffers = {} # Reusable receive buffers, by size
+		self.__writer = None
+		self.__deferredReads = []
+		self.resetTransportStats()
 
-		self.__initUSB()
+		self.initTransport()
+		if asyncWrites and not noQueue:
+			self.__startWriter()
 
-	def __initUSB(self):
+	def initTransport(self):
+		"Claim the USB device."
 		try:
 			# Find the endpoints
 			self.bulkOut = None
@@ -104,19 +154,95 @@ class HardwareAccessUSB(CommandQueue):
 		except usb.core.USBError as e:
 			raise TOPException("USB error: " + str(e))
 
+	def __startWriter(self):
+		"Start the asynchronous bulk-out writer thread."
+		self.__ring = queue.Queue(self.ASYNC_RING_PACKETS)
+		self.__writerError = None
+		self.__writer = threading.Thread(target = self.__writerThread,
+						 name = "USB writer",
+						 daemon = True)
+		self.__writer.start()
+
+	def __stopWriter(self):
+		"""Stop the writer thread after it submitted all packets.
+		Raises the error of a failed write."""
+		if not self.__writer:
+			return
+		self.__ring.put(None)
+		self.__writer.join()
+		self.__writer = None
+		self.__checkWriterError()
+
+	def __writerThread(self):
+		ring = self.__ring
+		while True:
+			data = ring.get()
+			try:
+				if data is None:
+					break
+				if self.__writerError is None:
+					start = time.perf_counter()
+					try:
+						self.writeTransport(data)
+					except (TOPException) as e:
+						self.__writerError = e
+					self.__writerBusySec += time.perf_counter() - start
+			finally:
+				ring.task_done()
+
+	def __checkWriterError(self):
+		error = self.__writerError
+		if error is not None:
+			self.__writerError = None
+			raise error
+
+	def resetTransportStats(self):
+		"Reset the transport statistics counters."
+		# The writer thread updates the busy time.
+		self.drainSend()
+		self.__writerBusySec = 0.0	# Time the writer spent in USB writes
+		self.__writerWaitSec = 0.0	# Time the main thread waited for the writer
+		self.__nrReceives = 0		# Bulk-in round trips
+		self.__nrBytesReceived = 0
+		self.resetQueueStats()
+		if self.optimizer:
+			self.optimizer.resetStats()
+
+	def getTransportStats(self):
+		"Returns a dict of transport statistics."
+		busy, wait = self.__writerBusySec, self.__writerWaitSec
+		stats = self.getQueueStats()
+		stats.update({
+			"roundTrips"		: self.__nrReceives,
+			"bytesReceived"		: self.__nrBytesReceived,
+			"asyncWrites"		: self.__writer is not None,
+			"writerBusySeconds"	: busy,
+			"writerWaitSeconds"	: wait,
+			# Fraction of the USB write time hidden behind host work.
+			"overlapRatio"		: (max(busy - wait, 0.0) / busy) if busy else 0.0,
+		})
+		if self.optimizer:
+			stats["optimizer"] = self.optimizer.getStats()
+		return stats
+
 	def shutdown(self):
 		"Shutdown the USB connection"
+		try:
+			self.waitHostDeadline()
+			self.__stopWriter()
+		finally:
+			self.shutdownTransport()
+
+	def shutdownTransport(self):
+		"Release the USB device."
 		try:
 			usb.util.dispose_resources(self.usbdev)
 		except (usb.core.USBError) as e:
 			raise TOPException("USB error: " + str(e))
 
-	def send(self, data):
+	def writeTransport(self, data):
+		"Write raw data to the bulk-out ep."
 		try:
-			assert(len(data) <= self.maxPacketBytes)
-			if self.doRawDump:
-				print("Sending command:")
-				dumpMem(data)
 			nrWritten = self.usbdev.write(
 					self.bulkOut.bEndpointAddress,
 					data,
@@ -127,21 +253,105 @@ class HardwareAccessUSB(CommandQueue):
 		except (usb.core.USBError) as e:
 			raise TOPException("USB bulk write error: " + str(e))
 
-	def receive(self, size):
-		"""Receive 'size' bytes on the bulk-in ep."""
+	def send(self, data):
+		assert(len(data) <= self.maxTransferBytes)
+		if self.doRawDump:
+			print("Sending command:")
+			dumpMem(data)
+		if self.__writer:
+			# Hand a copy of the packet over to the writer thread.
+			# This only blocks, if the ring is full.
+			self.__checkWriterError()
+			start = time.perf_counter()
+			self.__ring.put(bytes(data))
+			self.__writerWaitSec += time.perf_counter() - start
+		else:
+			self.writeTransport(data)
+
+	def drainSend(self):
+		"""Wait until the writer thread submitted all packets."""
+		if self.__writer:
+			start = time.perf_counter()
+			self.__ring.join()
+			self.__writerWaitSec += time.perf_counter() - start
+			self.__checkWriterError()
+
+	def __getRxBuffer(self, size):
+		try:
+			return self.__rxBuffers[size]
+		except KeyError:
+			# pyusb reads in-place into array objects only.
+			rxArray = array.array("B", bytes(size))
+			rxBuffer = (rxArray, memoryview(rxArray))
+			self.__rxBuffers[size] = rxBuffer
+			return rxBuffer
+
+	def __receive(self, size):
+		profiler = self.profiler
+		if profiler:
+			profileStart = profiler.beginWait()
 		# If there are blocked commands in the queue, send them now.
 		self.flushCommands()
+		self.drainSend()
+		rxArray, rxView = self.__getRxBuffer(size)
+		nrRead = self.readTransport(rxArray)
+		if profiler:
+			profiler.endWait(profiler.WAIT_ROUNDTRIP, profileStart)
+		self.__nrReceives += 1
+		self.__nrBytesReceived += nrRead
+		if nrRead != size:
+			raise TOPException("USB bulk read error: Could not read the " +\
+				"requested number of bytes (req %d, got %d)" % (size, nrRead))
+		if self.doRawDump:
+			print("Received data:")
+			dumpMem(rxView)
+		return rxView
+
+	def readTransport(self, rxArray):
+		"""Read raw data from the bulk-in ep in place into 'rxArray'.
+		Returns the number of bytes read."""
 		try:
 			ep = self.bulkIn.bEndpointAddress
-			data = b"".join([ int2byte(b) for b in
-					  self.usbdev.read(ep, size,
-						self.TIMEOUT_MSEC) ])
-			if len(data) != size:
-				raise TOPException("USB bulk read error: Could not read the " +\
-					"requested number of bytes (req %d, got %d)" % (size, len(data)))
-			if self.doRawDump:
-				print("Received data:")
-				dumpMem(data)
+			return self.usbdev.read(ep, rxArray, self.TIMEOUT_MSEC)
 		except (usb.core.USBError) as e:
 			raise TOPException("USB bulk read error: " + str(e))
-		return data
+
+	def receiveView(self, size):
+		"""Receive 'size' bytes on the bulk-in ep.
+		Returns a memoryview of a reusable receive buffer.
+		The view is only valid up to the next receive."""
+		self.collectDeferredReads()
+		return self.__receive(size)
+
+	def receive(self, size):
+		"""Receive 'size' bytes on the bulk-in ep."""
+		return bytes(self.receiveView(size))
+
+	def reserveDeferredRead(self):
+		"""Make room for one more pending deferred read.
+		Call this before queueing the command that makes the
+		device send the data."""
+		deferredReads = self.__deferredReads
+		while len(deferredReads) >= self.MAX_DEFERRED_READS:
+			self.collectDeferredReads(deferredReads[0])
+
+	def receiveDeferred(self, size, nrBytes=None, buf=None, offset=0):
+		"""Register a bulk-in read of 'size' bytes without waiting for it.
+		The command that makes the device send the data must
+		already be queued. Returns a DeferredRead()."""
+		assert(len(self.__deferredReads) < self.MAX_DEFERRED_READS)
+		read = DeferredRead(self, size,
+				    size if nrBytes is None else nrBytes,
+				    buf, offset)
+		self.__deferredReads.append(read)
+		return read
+
+	def collectDeferredReads(self, upTo=None):
+		"""Fetch the data of all pending deferred reads, in order.
+		If 'upTo' is given, stop after that DeferredRead()."""
+		deferredReads = self.__deferredReads
+		while deferredReads:
+			read = deferredReads.pop(0)
+			read.complete(self.__receive(read.size))
+			if read is upTo:
+				break
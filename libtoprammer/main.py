@@ -30,14 +30,20 @@ VERSION = "%d.%d" % (VERSION_MAJOR, VERSION_MINOR)
 
 
 from .bitfile import *
+from .bitfile_cache import *
 from .util import *
 
 import time
 import re
 
 from .hardware_access_usb import *
+from .hardware_access_trace import *
+from .hardware_access_sim import *
+from .profiler import *
+from .progress import *
 from .top_devices import *
-from .chips import *
+from .chip import *
+from .chip_query import *
 from .user_interface import *
 
 
@@ -54,19 +60,35 @@ class TOP(object):
 	def __init__(self, devIdentifier=None, verbose=0,
 		     forceLevel=0, noqueue=False, usebroken=False,
 		     forceBitfileUpload=False,
-		     userInterface=ConsoleUserInterface()):
+		     userInterface=ConsoleUserInterface(),
+		     asyncWrites=False, transferBytes=None,
+		     recordTrace=None, optimizeCommands=False,
+		     profile=False, bitfileCacheDir=None,
+		     incremental=False, stats=False,
+		     useBitfileCache=True):
 
 		self.verbose = verbose
 		self.forceLevel = forceLevel
 		self.forceBitfileUpload = forceBitfileUpload
 		self.usebroken = usebroken
 		self.userInterface = userInterface
+		self.asyncWrites = asyncWrites
+		self.transferBytes = transferBytes
+		self.recordTrace = recordTrace
+		self.optimizeCommands = optimizeCommands
+		self.profile = profile
+		self.stats = stats
+		self.incremental = incremental
+		self.bitfileCache = BitfileCache(bitfileCacheDir,
+						 persistent = useBitfileCache)
 
 		self.hw = None
 		self.chip = None
+		self.progressMeters = {}	# meterId -> ProgressMeter()
+		self.invalidatePowerState()
 
 		# Find the device
-		devices = self.findDevices()
+		devices = self.findDevices(devIdentifier)
 		if devIdentifier:
 			devices = [ d for d in devices
 				    if d.devIdentifier.lower() == devIdentifier.lower() ]
@@ -74,12 +96,12 @@ class TOP(object):
 			raise TOPException("TOP programmer device not found!")
 		foundDev = devices[0] # Select first
 
+		self.initializeProgrammer(foundDev, noqueue)
+
 		if noqueue:
 			self.printWarning("WARNING: Command queuing disabled. " +\
 				"Hardware access will be _really_ slow.")
 
-		self.initializeProgrammer(foundDev, noqueue)
-
 	def getProgrammerType(self):
 		"Returns the TYPE_TOPxxxx"
 		return self.topType
@@ -103,10 +125,13 @@ class TOP(object):
 	def shutdownChip(self):
 		if self.chip:
 			self.chip.shutdownChip()
-			self.flushCommands()
+			self.finishCommands()
+			self.setWriteOnlyFPGARegs({})
 			self.chip = None
 
 	def resetChip(self):
+		# The programmer state is unknown after a cancelled operation.
+		self.invalidatePowerState()
 		if self.chip:
 			self.chip.shutdownChip()
 			self.flushCommands()
@@ -122,17 +147,33 @@ class TOP(object):
 	def getForceLevel(self):
 		return self.forceLevel
 
-	def progressMeterInit(self, meterId, message, nrSteps):
+	def getIncrementalWrites(self):
+		"Returns True, if only the changed pages shall be written."
+		return self.incremental
+
+	def progressMeterInit(self, meterId, message, nrSteps, stepBytes=1):
+		"""Start a progress meter. stepBytes is the number of bytes per step.
+		It is used for the throughput."""
 		if self.verbose >= 1:
-			self.userInterface.progressMeterInit(meterId, message, nrSteps)
+			self.progressMeters[meterId] = ProgressMeter(self.userInterface,
+					meterId, message, nrSteps, stepBytes)
 
 	def progressMeterFinish(self, meterId):
-		if self.verbose >= 1:
-			self.userInterface.progressMeterFinish(meterId)
+		meter = self.progressMeters.pop(meterId, None)
+		if meter:
+			meter.finish()
 
 	def progressMeter(self, meterId, step):
-		if self.verbose >= 1:
-			self.userInterface.progressMeter(meterId, step)
+		"""Update a progress meter. This is cheap. The user interface
+		only gets sampled updates."""
+		meter = self.progressMeters.get(meterId)
+		if meter:
+			meter.update(step)
+
+	def getProgressStatus(self, meterId):
+		"Returns the ProgressStatus() of a running meter, or None."
+		meter = self.progressMeters.get(meterId)
+		return meter.getStatus() if meter else None
 
 	def printWarning(self, message):
 		if self.verbose >= 0:
@@ -161,9 +202,23 @@ class TOP(object):
 		return toptype
 
 	@classmethod
-	def findDevices(cls):
+	def findDevices(cls, devIdentifier=None):
 		"""Rescan all busses for TOP devices.
+		A devIdentifier "replay:FILE" selects the recorded
+		device of the trace file FILE.
+		A devIdentifier "sim:TYPE" or "sim:TYPE:N" selects a simulated device.
 		Returns a list of FoundDev()"""
+		if devIdentifier and devIdentifier.lower().startswith("replay:"):
+			traceFile = devIdentifier[len("replay:"):]
+			return [ FoundDev(readTraceProgrammerType(traceFile),
+					  devIdentifier,
+					  FoundTraceDev(traceFile)) ]
+		if devIdentifier and devIdentifier.lower().startswith("sim:"):
+			toptype = devIdentifier[len("sim:"):].split(":")[0].upper()
+			if toptype != cls.TYPE_TOP2049:
+				raise TOPException("Cannot simulate programmer "
+					"type '%s'" % toptype)
+			return [ FoundDev(toptype, devIdentifier, FoundSimDev()) ]
 		usbFound = HardwareAccessUSB.scan(cls.__usbdev2toptype)
 		devices = []
 		for i, ud in enumerate(usbFound):
@@ -181,10 +236,32 @@ class TOP(object):
 		self.shutdownProgrammer()
 
 		if foundDev.toptype == self.TYPE_TOP2049:
-			self.hw = top2049_hardware_access.HardwareAccess(
+			transferBytes = self.transferBytes
+			if transferBytes is None:
+				transferBytes = top2049_hardware_access.HardwareAccess.DEFAULT_TRANSFER_BYTES
+			hwClass, hwArgs = top2049_hardware_access.HardwareAccess, {}
+			if isinstance(foundDev.busdata, FoundTraceDev):
+				hwClass = top2049_hardware_access.HardwareAccessReplay
+				hwArgs["traceFile"] = foundDev.busdata.traceFile
+			elif isinstance(foundDev.busdata, FoundSimDev):
+				hwClass = top2049_hardware_access.HardwareAccessSim
+				if self.recordTrace:
+					hwClass = top2049_hardware_access.HardwareAccessSimRecord
+					hwArgs["traceFile"] = self.recordTrace
+			elif self.recordTrace:
+				hwClass = top2049_hardware_access.HardwareAccessRecord
+				hwArgs["traceFile"] = self.recordTrace
+			self.hw = hwClass(
 					foundUSBDev = foundDev.busdata,
 					noQueue = noQueue,
-					doRawDump = (self.verbose >= 3))
+					doRawDump = (self.verbose >= 3),
+					asyncWrites = self.asyncWrites,
+					transferBytes = transferBytes,
+					optimize = self.optimizeCommands,
+					**hwArgs)
+			if self.profile:
+				self.hw.setProfiler(TransportProfiler())
+			self.hw.collectSites = self.stats or self.profile
 			self.vcc = top2049_vcc_layouts.VCCLayout(self)
 			self.vpp = top2049_vpp_layouts.VPPLayout(self)
 			self.gnd = top2049_gnd_layouts.GNDLayout(self)
@@ -218,6 +295,7 @@ class TOP(object):
 		self.printInfo("Initializing the " + self.topType + " version " + self.topVersion)
 
 		self.hw.hardwareInit()
+		self.invalidatePowerState()
 
 	def shutdownProgrammer(self):
 		if self.hw:
@@ -239,27 +317,28 @@ class TOP(object):
 			gotRev = 0
 		return (gotID, gotRev)
 
-	def __bitfileUpload(self, requiredRuntimeID):
+	def __bitfileUpload(self, bitfilePath, requiredRuntimeID):
 		(requiredID, requiredRevision) = requiredRuntimeID
 		if requiredID and requiredRevision and not self.forceBitfileUpload:
 			# Check if the bitfile is already uploaded.
 			(gotID, gotRev) = self.__readBitfileID()
 			if gotID == requiredID and gotRev == requiredRevision:
 				self.printDebug("Bitfile %s ID 0x%04X Rev 0x%02X is already uploaded." %\
-						(self.bitfile.getFilename(), gotID, gotRev))
+						(bitfilePath, gotID, gotRev))
 				return
 			self.printDebug("Current runtime ID 0x%04X Rev 0x%02X. Uploading new bitfile..." %\
 					(gotID, gotRev))
 
-		self.printDebug("Uploading bitfile %s..." % self.bitfile.getFilename())
+		self.printDebug("Uploading bitfile %s..." % bitfilePath)
 
+		# Get the ready-to-send configuration packets.
+		packets = self.bitfileCache.getPackets(bitfilePath,
+				self.hw.PROGRAMMER_TYPE, self.hw.FPGAMakeConfigPackets,
+				self.hw.CONFIG_PACKETS_VERSION)
 		self.hw.FPGAInitiateConfig()
-		data = self.bitfile.getPayload()
-		chunksz = self.hw.getFPGAMaxConfigChunkSize()
-		chunksz = chunksz if chunksz > 0 else len(data)
-		for i in range(0, len(data), chunksz):
-			self.hw.FPGAUploadConfig(i, data[i : i + chunksz])
+		self.hw.FPGAUploadConfigPackets(packets)
 		self.flushCommands()
+		self.invalidatePowerState()
 
 		if requiredID and requiredRevision:
 			# Check the uploaded ID
@@ -278,11 +357,9 @@ class TOP(object):
 		bitfilePath = bitfileFind(bitfileName)
 		if not bitfilePath:
 			return False
-		# Open and parse the bitfile.
-		self.bitfile = Bitfile()
-		self.bitfile.parseFile(bitfilePath)
 		# Initialize the hardware.
-		self.__bitfileUpload(runtimeIDs)
+		# The bitfile is only parsed, if it is not in the bitfile cache.
+		self.__bitfileUpload(bitfilePath, runtimeIDs)
 		return True
 
 	def readSignature(self):
@@ -309,6 +386,16 @@ class TOP(object):
 		self.flushCommands()
 		self.printInfo("Chip unit-test terminated successfully.")
 
+	def blankCheck(self):
+		"""Check whether the chip is erased.
+		Returns None for a blank chip.
+		Otherwise returns the image offset of the first non-blank byte."""
+		self.printDebug("Blank checking chip...")
+		self.checkChip()
+		address = self.chip.blankCheck()
+		self.flushCommands()
+		return address
+
 	def readProgmem(self):
 		"""Reads the program memory image and returns it."""
 		self.printDebug("Reading program memory from chip...")
@@ -318,14 +405,55 @@ class TOP(object):
 		self.printDebug("Done reading %d bytes." % len(image))
 		return image
 
+	def iterReadProgmem(self, chunkSize=None):
+		"""Reads the program memory. Yields (offset, data) tuples
+		as soon as the data arrived. If chunkSize is given, the data
+		is regrouped into chunks of chunkSize bytes.
+		The caller may stop the iteration early."""
+		return self.__iterRead("program memory", self.chip.readProgmemChunks,
+				       chunkSize)
+
+	def __iterRead(self, name, readChunks, chunkSize):
+		self.printDebug("Reading %s from chip..." % name)
+		self.checkChip()
+		chunks = readChunks()
+		if chunkSize:
+			chunks = resizeChunks(chunks, chunkSize)
+		nrBytes = 0
+		try:
+			for (offset, data) in chunks:
+				nrBytes += len(data)
+				yield (offset, data)
+		except (GeneratorExit) as e:
+			# Stopped early. Run the cleanup of the driver.
+			chunks.close()
+			self.flushCommands()
+			raise
+		self.flushCommands()
+		self.printDebug("Done reading %d bytes." % nrBytes)
+
 	def writeProgmem(self, image):
 		"""Writes a program memory image to the chip."""
 		self.printDebug("Writing %d bytes of program memory to chip..." % len(image))
 		self.checkChip()
-		self.chip.writeProgmem(image)
+		self.__writeMemory("progmem", "Program memory", self.chip.readProgmem,
+				   self.chip.writeProgmem, image)
 		self.flushCommands()
 		self.printDebug("Done writing image.")
 
+	def __writeMemory(self, memory, name, readMethod, writeMethod, image):
+		if not self.incremental or memory in self.chip.INCREMENTAL_WRITES or\
+		   not self.chip.chipSupportsAttr(readMethod.__name__) or not image:
+			writeMethod(image)
+			return
+		# The driver has no page support. Skip the write, if nothing changed.
+		incremental = IncrementalWrite(self.chip, name, readMethod,
+					       image, len(image))
+		incremental.beginPages()
+		if incremental.pages:
+			writeMethod(image)
+		incremental.finish()
+
 	def readEEPROM(self):
 		"""Reads the EEPROM image and returns it."""
 		self.printDebug("Reading EEPROM from chip...")
@@ -335,11 +463,17 @@ class TOP(object):
 		self.printDebug("Done reading %d bytes." % len(image))
 		return image
 
+	def iterReadEEPROM(self, chunkSize=None):
+		"""Reads the EEPROM. See iterReadProgmem()."""
+		return self.__iterRead("EEPROM", self.chip.readEEPROMChunks,
+				       chunkSize)
+
 	def writeEEPROM(self, image):
 		"""Writes an EEPROM image to the chip."""
 		self.printDebug("Writing %d bytes of EEPROM to chip..." % len(image))
 		self.checkChip()
-		self.chip.writeEEPROM(image)
+		self.__writeMemory("eeprom", "EEPROM", self.chip.readEEPROM,
+				   self.chip.writeEEPROM, image)
 		self.flushCommands()
 		self.printDebug("Done writing image.")
 
@@ -386,6 +520,11 @@ class TOP(object):
 		self.printDebug("Done reading %d bytes." % len(image))
 		return image
 
+	def iterReadRAM(self, chunkSize=None):
+		"""Reads the RAM. See iterReadProgmem()."""
+		return self.__iterRead("RAM", self.chip.readRAMChunks,
+				       chunkSize)
+
 	def writeRAM(self, image):
 		"""Writes the RAM image to the chip."""
 		self.printDebug("Writing %d bytes of RAM to the chip..." % len(image))
@@ -412,13 +551,15 @@ class TOP(object):
 		self.printDebug("Done writing the image.")		
 
 	def cmdDelay(self, seconds):
-		"""Send a delay request to the device. Note that this causes the
-		programmer to execute the delay. For a host-delay, use hostDelay()"""
+		"""Delay the following commands by at least 'seconds'.
+		The delay planner executes it on the device or as host wait.
+		Host waits don't block until the next commands are sent."""
 		self.hw.delay(seconds)
 
 	def hostDelay(self, seconds):
-		"""Flush all commands and delay the host computer for 'seconds'"""
-		self.flushCommands(seconds)
+		"""Delay the following commands by at least 'seconds'.
+		This is the same as cmdDelay()."""
+		self.hw.delay(seconds)
 
 	def getOscillatorHz(self):
 		"""Returns the FPGA oscillator frequency, in Hz.
@@ -439,71 +580,172 @@ class TOP(object):
 			return b""
 		return self.hw.readBufferReg(nrBytes)
 
+	def cmdReadBufferRegInto(self, buf, offset=0, nrBytes=-1):
+		"""Read the buffer register into the preallocated
+		bytearray or memoryview 'buf', starting at 'offset'.
+		Reads nrBytes (default all bytes). Returns nrBytes."""
+		regSize = self.getBufferRegSize()
+		if nrBytes < 0:
+			nrBytes = regSize
+		assert(nrBytes <= regSize)
+		assert(offset + nrBytes <= len(buf))
+		if nrBytes:
+			self.hw.readBufferRegInto(buf, offset, nrBytes)
+		return nrBytes
+
+	def cmdReadBufferRegDeferred(self, buf=None, offset=0, nrBytes=-1):
+		"""Queue a buffer register read without waiting for the data.
+		Returns a DeferredRead() placeholder. Its result() method returns
+		the data. If 'buf' is given, the data is put into buf[offset:]
+		as soon as it is fetched from the hardware.
+		Call collectDeferredReads() to fetch all pending data."""
+		regSize = self.getBufferRegSize()
+		if nrBytes < 0:
+			nrBytes = regSize
+		assert(nrBytes <= regSize)
+		assert(buf is None or offset + nrBytes <= len(buf))
+		return self.hw.readBufferRegDeferred(nrBytes, buf, offset)
+
+	def collectDeferredReads(self):
+		"""Fetch the data of all pending deferred buffer register reads."""
+		self.hw.collectDeferredReads()
+
 	def cmdReadBufferReg8(self):
 		"""Read a 8bit value from the buffer register."""
-		stat = self.cmdReadBufferReg(1)
-		stat = byte2int(stat[0])
-		return stat
+		return self.hw.readBufferRegView(1)[0]
 
 	def cmdReadBufferReg16(self):
 		"""Read a 16bit value from the buffer register."""
-		stat = self.cmdReadBufferReg(2)
-		stat = byte2int(stat[0]) | (byte2int(stat[1]) << 8)
-		return stat
+		return int.from_bytes(self.hw.readBufferRegView(2), "little")
 
 	def cmdReadBufferReg24(self):
 		"""Read a 24bit value from the buffer register."""
-		stat = self.cmdReadBufferReg(3)
-		stat = byte2int(stat[0]) | (byte2int(stat[1]) << 8) | (byte2int(stat[2]) << 16)
-		return stat
+		return int.from_bytes(self.hw.readBufferRegView(3), "little")
 
 	def cmdReadBufferReg32(self):
 		"""Read a 32bit value from the buffer register."""
-		stat = self.cmdReadBufferReg(4)
-		stat = byte2int(stat[0]) | (byte2int(stat[1]) << 8) | \
-		       (byte2int(stat[2]) << 16) | (byte2int(stat[3]) << 24)
-		return stat
+		return int.from_bytes(self.hw.readBufferRegView(4), "little")
 
 	def cmdReadBufferReg48(self):
 		"""Read a 48bit value from the buffer register."""
-		stat = self.cmdReadBufferReg(6)
-		stat = byte2int(stat[0]) | (byte2int(stat[1]) << 8) | \
-		       (byte2int(stat[2]) << 16) | (byte2int(stat[3]) << 24) | \
-		       (byte2int(stat[4]) << 32) | (byte2int(stat[5]) << 40)
-		return stat
+		return int.from_bytes(self.hw.readBufferRegView(6), "little")
 
 	def cmdFPGARead(self, address):
 		"""Read a byte from the FPGA at address into the buffer register."""
-		self.hw.FPGARead(address)
+		self.hw.appendFPGARead(address)
 
 	def cmdFPGAWrite(self, address, byte):
 		"""Write a byte to an FPGA address."""
-		return self.hw.FPGAWrite(address, byte)
+		self.hw.appendFPGAWrite(address, byte)
+
+	def encodeFPGARead(self, address):
+		"""Returns the raw command of cmdFPGARead(address).
+		Use it to build a CommandBlock()."""
+		return self.hw.encodeFPGARead(address)
+
+	def encodeFPGAWrite(self, address, byte):
+		"""Returns the raw command of cmdFPGAWrite(address, byte).
+		Use it to build a CommandBlock()."""
+		return self.hw.encodeFPGAWrite(address, byte)
+
+	def encodeDeviceDelay(self, seconds):
+		"""Returns the list of raw commands of an on-device delay
+		of at least 'seconds'. Use it to build a CommandBlock()."""
+		return self.hw.encodeDeviceDelay(seconds)
+
+	def cmdQueueCommandBlock(self, block):
+		"""Queue the precompiled commands of a CommandBlock()."""
+		self.hw.queueCommandBlock(block)
+
+	def setWriteOnlyFPGARegs(self, regs):
+		"""Declare FPGA registers, that only latch the written value.
+		regs is a dict of FPGA address -> selector mask.
+		Redundant writes to these registers are dropped by the
+		command optimizer, if enabled. A non-zero selector mask
+		declares a register that holds several sub-registers.
+		The value bits in the mask select the sub-register."""
+		self.hw.setWriteOnlyFPGARegs(regs)
+
+	def invalidatePowerState(self):
+		"""Forget the shadow of the programmer power state.
+		The following layout, voltage and pullup commands are sent,
+		even if they don't change anything.
+		Call this, if the programmer state is unknown. For example after
+		a reset or an error."""
+		self.powerState = {}
+		self.powerSettlePending = False
+
+	def __powerStateChanged(self, name, value):
+		"""Update the shadow power state.
+		Returns False, if 'name' already has the value 'value'."""
+		if name in self.powerState and self.powerState[name] == value:
+			return False
+		self.powerState[name] = value
+		return True
+
+	def __loadLayout(self, name, layout, loadFunc):
+		if self.__powerStateChanged(name, layout):
+			loadFunc(layout)
+			self.powerSettlePending = False
+		elif self.powerSettlePending:
+			# The layout is already loaded, but a voltage changed
+			# since the last layout load. Keep its settle time.
+			self.hw.delay(0.01)
+			self.hw.flushCommands(0.15)
+			self.powerSettlePending = False
+
+	def __setVoltage(self, name, voltage, setFunc):
+		if self.__powerStateChanged(name, int(voltage * 10)):
+			setFunc(voltage)
+			self.powerSettlePending = True
 
 	def cmdLoadGNDLayout(self, layout):
-		"""Load the GND configuration into the programmer."""
-		self.hw.loadGNDLayout(layout)
+		"""Load the GND configuration into the programmer.
+		An unchanged layout is not reloaded."""
+		self.__loadLayout("gndLayout", layout, self.hw.loadGNDLayout)
 
 	def cmdSetVPPVoltage(self, voltage):
-		"""Set the VPP voltage. voltage is a floating point voltage number."""
-		self.hw.setVPPVoltage(voltage)
+		"""Set the VPP voltage. voltage is a floating point voltage number.
+		An unchanged voltage is not set again."""
+		self.__setVoltage("vppVoltage", voltage, self.hw.setVPPVoltage)
 
 	def cmdLoadVPPLayout(self, layout):
-		"""Load the VPP configuration into the programmer."""
-		self.hw.loadVPPLayout(layout)
+		"""Load the VPP configuration into the programmer.
+		An unchanged layout is not reloaded."""
+		self.__loadLayout("vppLayout", layout, self.hw.loadVPPLayout)
 
 	def cmdSetVCCVoltage(self, voltage):
-		"""Set the VCC voltage. voltage is a floating point voltage number."""
-		self.hw.setVCCVoltage(voltage)
+		"""Set the VCC voltage. voltage is a floating point voltage number.
+		An unchanged voltage is not set again."""
+		self.__setVoltage("vccVoltage", voltage, self.hw.setVCCVoltage)
 
 	def cmdLoadVCCLayout(self, layout):
-		"""Load the VCC configuration into the shift registers."""
-		self.hw.loadVCCLayout(layout)
+		"""Load the VCC configuration into the shift registers.
+		An unchanged layout is not reloaded."""
+		self.__loadLayout("vccLayout", layout, self.hw.loadVCCLayout)
 
 	def cmdEnableZifPullups(self, enable):
 		"""Enable the ZIF socket signal pullups."""
-		self.hw.enableZifPullups(enable)
+		if self.__powerStateChanged("zifPullups", bool(enable)):
+			self.hw.enableZifPullups(enable)
 
 	def flushCommands(self, sleepSeconds=0):
-		"""Flush command queue and optionally sleep for 'sleepSeconds'."""
+		"""Flush command queue and optionally sleep for 'sleepSeconds'.
+		This also fetches all pending deferred reads."""
+		self.hw.collectDeferredReads()
 		self.hw.flushCommands(sleepSeconds)
+
+	def finishCommands(self):
+		"""Flush the command queue and wait until all commands were
+		handed to the programmer. This raises the error of a failed
+		asynchronous USB write."""
+		self.flushCommands()
+		self.hw.drainSend()
+
+	def getTransportStats(self):
+		"""Returns a dict of hardware transport statistics."""
+		return self.hw.getTransportStats()
+
+	def resetTransportStats(self):
+		"""Reset the hardware transport statistics."""
+		self.hw.resetTransportStats()
@@ -0,0 +1,179 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    RAM test patterns and march tests
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .util import *
+
+
+# The patterns are built with bytes repetition and slicing.
+# No Python code runs per byte.
+
+def patternSolid(size, value):
+	"All bytes are 'value'."
+	return bytes((value,)) * size
+
+def patternCheckerboard(size, inverted=False):
+	"Alternating 0x55 and 0xAA bytes."
+	pattern = b"\xAA\x55" if inverted else b"\x55\xAA"
+	return (pattern * (size // 2 + 1))[:size]
+
+def patternWalking(size, shift, ones=True):
+	"""One bit set (or cleared, if ones=False) per byte.
+	The bit moves by one position per address. 'shift' rotates it."""
+	pattern = bytes(1 << ((i + shift) % 8) for i in range(8))
+	if not ones:
+		pattern = bytes(~b & 0xFF for b in pattern)
+	return (pattern * (size // 8 + 1))[:size]
+
+def patternAddress(size, byteNr):
+	"Each byte holds the address byte 'byteNr' of its own address."
+	if byteNr == 0:
+		return (bytes(range(256)) * (size // 256 + 1))[:size]
+	run = 256 ** byteNr
+	return b"".join(bytes((i & 0xFF,)) * run
+			for i in range((size + run - 1) // run))[:size]
+
+class MemoryTestReport(object):
+	"The failing cells of a MemoryTest() run."
+
+	def __init__(self):
+		self.failBits = {}	# address -> mask of failing bits
+		self.failTests = {}	# address -> set of test names
+		self.testFailures = {}	# test name -> number of failed reads
+
+	def check(self, testName, offset, data, expected):
+		"""Compare the read 'data' at 'offset' to 'expected'.
+		Records the failing bits."""
+		if data == expected:
+			return
+		nrFailed = 0
+		for (i, (got, exp)) in enumerate(zip(data, expected)):
+			if got != exp:
+				address = offset + i
+				self.failBits[address] = self.failBits.get(address, 0) |\
+							 (got ^ exp)
+				self.failTests.setdefault(address, set()).add(testName)
+				nrFailed += 1
+		self.testFailures[testName] = self.testFailures.get(testName, 0) +\
+					      nrFailed
+
+	def ok(self):
+		return not self.failBits
+
+	def getFailBitmap(self):
+		"Returns a sorted list of (address, failing bits mask)."
+		return sorted(self.failBits.items())
+
+	def format(self, maxCells=16):
+		"Returns the report as list of lines."
+		if self.ok():
+			return [ "All cells passed." ]
+		lines = [ "%d failing cells. Failed reads per test: %s" %\
+			  (len(self.failBits),
+			   ", ".join("%s %d" % item
+				     for item in sorted(self.testFailures.items()))) ]
+		bitmap = self.getFailBitmap()
+		for (address, bits) in bitmap[:maxCells]:
+			lines.append("  0x%06X: bits %s (%s)" %\
+				     (address,
+				      " ".join(str(b) for b in range(8) if bits & (1 << b)),
+				      ", ".join(sorted(self.failTests[address]))))
+		if len(bitmap) > maxCells:
+			lines.append("  ... and %d more cells" % (len(bitmap) - maxCells))
+		return lines
+
+class MemoryTest(object):
+	"""RAM test suite of checkerboard, walking ones/zeros,
+	address-in-address and March C- tests.
+
+	The tests are chained into sweeps over all cells. A sweep reads
+	each cell and compares it to the previous pattern, then writes the
+	next pattern to the same cell. So the readback of one pattern is
+	done together with the write of the next one. Only the first sweep
+	only writes and only the last sweep only reads.
+
+	The driver supplies one primitive:
+	sweep(read, image, descending) accesses all cells in ascending or
+	descending order. If 'read' is true, it reads each cell and yields
+	the (offset, data) chunks as soon as they arrived, with the data in
+	ascending address order. If 'image' is not None, it then writes
+	image[address] to the cell."""
+
+	TESTS = ("checkerboard", "walking-ones", "walking-zeros",
+		 "address", "march-c-")
+
+	def __init__(self, chip, size, sweep):
+		self.chip = chip
+		self.size = size
+		self.sweep = sweep
+
+	def getSteps(self, tests=None):
+		"""Returns the list of (test name, pattern, descending) steps.
+		Each pattern is written in the given address order and read
+		back by the next step."""
+		tests = tests or self.TESTS
+		size = self.size
+		steps = []
+		if "checkerboard" in tests:
+			steps.append(("checkerboard", patternCheckerboard(size), False))
+			steps.append(("checkerboard", patternCheckerboard(size, True), False))
+		if "walking-ones" in tests:
+			steps.extend(("walking-ones", patternWalking(size, shift), False)
+				     for shift in range(8))
+		if "walking-zeros" in tests:
+			steps.extend(("walking-zeros", patternWalking(size, shift, False), False)
+				     for shift in range(8))
+		if "address" in tests:
+			nrAddressBytes = max((size - 1).bit_length() + 7, 8) // 8
+			steps.extend(("address", patternAddress(size, byteNr), False)
+				     for byteNr in range(nrAddressBytes))
+		if "march-c-" in tests:
+			# (w0) up(r0,w1) up(r1,w0) down(r0,w1) down(r1,w0) (r0)
+			zeros, ones = patternSolid(size, 0x00), patternSolid(size, 0xFF)
+			steps.extend((
+				("march-c-", zeros, False),
+				("march-c-", ones, False),
+				("march-c-", zeros, False),
+				("march-c-", ones, True),
+				("march-c-", zeros, True),
+			))
+		return steps
+
+	def run(self, tests=None):
+		"""Run the 'tests' (default all of TESTS).
+		Returns a MemoryTestReport()."""
+		report = MemoryTestReport()
+		steps = self.getSteps(tests)
+		if not steps:
+			return report
+		size = self.size
+		self.chip.progressMeterInit("Testing RAM", (len(steps) + 1) * size)
+		prevName, prevPattern = None, None
+		for (i, (name, pattern, descending)) in enumerate(steps + [ (None, None, False) ]):
+			self.chip.progressMeter(i * size)
+			chunks = self.sweep(read = prevPattern is not None,
+					    image = pattern,
+					    descending = descending)
+			for (offset, data) in chunks:
+				report.check(prevName, offset, data,
+					     prevPattern[offset : offset + len(data)])
+				self.chip.progressMeter(i * size + offset)
+			prevName, prevPattern = name, pattern
+		self.chip.progressMeterFinish()
+		return report
@@ -0,0 +1,130 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Transport profiler. Attributes the USB traffic to chip driver functions.
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from .util import *
+from .command_queue import findCallerFrame
+import bisect
+import time
+
+
+class TransportProfiler(object):
+	"""Collects per-function transport costs.
+	Every queued command, delay, flush and round trip is tagged
+	with the chip driver function that caused it."""
+
+	# Estimated device time of one queued command, in seconds.
+	COMMAND_SECONDS		= 0.000002
+
+	# Upper edges of the latency histogram buckets, in seconds.
+	HISTOGRAM_EDGES		= (0.0001, 0.0003, 0.001, 0.003, 0.01,
+				   0.03, 0.1, 0.3, 1.0)
+
+	# The kinds of timed waits.
+	WAIT_ROUNDTRIP		= "roundTrip"
+	WAIT_FLUSH		= "flush"
+
+	def __init__(self):
+		self.siteNames = {}	# code object -> function name
+		self.reset()
+
+	def reset(self):
+		# function name -> [commands, bytes, delaySec, roundTrips, waitSec]
+		self.functions = {}
+		self.histograms = {
+			self.WAIT_ROUNDTRIP	: [ 0 ] * (len(self.HISTOGRAM_EDGES) + 1),
+			self.WAIT_FLUSH		: [ 0 ] * (len(self.HISTOGRAM_EDGES) + 1),
+		}
+		self.waitDepth = 0
+		self.paused = 0
+
+	def __function(self):
+		site = findCallerFrame()
+		if site is None:
+			name = "unknown"
+		else:
+			code = site.f_code
+			name = self.siteNames.get(code)
+			if name is None:
+				name = getattr(code, "co_qualname", code.co_name)
+				self.siteNames[code] = name
+		func = self.functions.get(name)
+		if func is None:
+			func = self.functions[name] = [ 0, 0, 0.0, 0, 0.0 ]
+		return func
+
+	def pause(self):
+		"""Stop attributing queued commands.
+		Used for commands that were already attributed in another form."""
+		self.paused += 1
+
+	def resume(self):
+		self.paused -= 1
+
+	def commandsQueued(self, nrCommands, nrBytes):
+		if self.paused:
+			return
+		func = self.__function()
+		func[0] += nrCommands
+		func[1] += nrBytes
+
+	def delayQueued(self, seconds):
+		self.__function()[2] += seconds
+
+	def beginWait(self):
+		"Start timing a wait. Returns the start time for endWait()."
+		self.waitDepth += 1
+		return time.perf_counter()
+
+	def endWait(self, kind, start):
+		"""Finish timing a wait of 'kind'.
+		Waits nested in another wait only go to the histogram,
+		so the per-function wait time is not counted twice."""
+		seconds = time.perf_counter() - start
+		self.waitDepth -= 1
+		self.histograms[kind][bisect.bisect_left(self.HISTOGRAM_EDGES, seconds)] += 1
+		func = self.__function()
+		if kind == self.WAIT_ROUNDTRIP:
+			func[3] += 1
+		if self.waitDepth == 0:
+			func[4] += seconds
+
+	def getStats(self):
+		"""Returns a dict with
+		'functions': list of per-function dicts, most expensive first.
+		'histogramEdges': the upper bucket edges, in seconds.
+		'histograms': dict of wait kind -> list of bucket counts.
+		The last bucket holds all waits above the last edge."""
+		functions = []
+		for (name, (cmds, nrBytes, delaySec, roundTrips, waitSec)) in self.functions.items():
+			functions.append({
+				"function"	: name,
+				"commands"	: cmds,
+				"bytes"		: nrBytes,
+				"deviceSeconds"	: cmds * self.COMMAND_SECONDS + delaySec,
+				"roundTrips"	: roundTrips,
+				"waitSeconds"	: waitSec,
+			})
+		functions.sort(key=lambda f: -(f["waitSeconds"] + f["deviceSeconds"]))
+		return {
+			"functions"		: functions,
+			"histogramEdges"	: self.HISTOGRAM_EDGES,
+			"histograms"		: { kind : list(counts) for (kind, counts)
+						    in self.histograms.items() },
+		}
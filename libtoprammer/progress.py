@@ -0,0 +1,98 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    Rate limited progress meters
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import time
+
+
+class ProgressStatus(object):
+	"A sample of a progress meter, as passed to the user interface."
+
+	def __init__(self, step, nrSteps, elapsed, stepsPerSecond, stepBytes):
+		self.step = step			# Current step
+		self.nrSteps = nrSteps			# Total number of steps. May be 0.
+		self.elapsed = elapsed			# Seconds since the start
+		self.stepsPerSecond = stepsPerSecond	# Average rate. None, if unknown.
+		self.stepBytes = stepBytes		# Bytes per step
+
+	def getBytesPerSecond(self):
+		"Returns the throughput in bytes/s, or None if unknown."
+		if self.stepsPerSecond is None:
+			return None
+		return self.stepsPerSecond * self.stepBytes
+
+	def getETA(self):
+		"Returns the estimated remaining seconds, or None if unknown."
+		if not self.stepsPerSecond or not self.nrSteps:
+			return None
+		return max(self.nrSteps - self.step, 0) / self.stepsPerSecond
+
+class ProgressMeter(object):
+	"""A progress meter that passes sampled updates to the user interface.
+	The drivers call update() once per byte or word. That only stores
+	the step and compares it to the next dispatch step. The dispatch step
+	is calculated from the measured rate, so that the user interface
+	gets about RATE_HZ updates per second."""
+
+	RATE_HZ = 20
+
+	def __init__(self, userInterface, meterId, message, nrSteps, stepBytes=1):
+		self.userInterface = userInterface
+		self.meterId = meterId
+		self.nrSteps = nrSteps
+		self.stepBytes = stepBytes
+		self.step = 0
+		self.nextStep = 0		# Dispatch, if the step reaches this.
+		self.dispatchedStep = None
+		self.startTime = time.monotonic()
+		self.nextTime = self.startTime	# No dispatch before this.
+		userInterface.progressMeterInit(meterId, message, nrSteps)
+
+	def update(self, step):
+		self.step = step
+		if step >= self.nextStep:
+			self.__dispatch()
+
+	def getStatus(self):
+		"Returns a ProgressStatus() of the current step."
+		elapsed = time.monotonic() - self.startTime
+		stepsPerSecond = None
+		if elapsed > 0 and self.step > 0:
+			stepsPerSecond = self.step / elapsed
+		return ProgressStatus(self.step, self.nrSteps, elapsed,
+				      stepsPerSecond, self.stepBytes)
+
+	def __dispatch(self):
+		now = time.monotonic()
+		elapsed = now - self.startTime
+		stepsPerInterval = 1
+		if elapsed > 0:
+			stepsPerInterval = max(int(self.step / elapsed / self.RATE_HZ), 1)
+		self.nextStep = self.step + stepsPerInterval
+		if now < self.nextTime:
+			return
+		self.nextTime = now + 1.0 / self.RATE_HZ
+		self.dispatchedStep = self.step
+		self.userInterface.progressMeterStatus(self.meterId, self.getStatus())
+
+	def finish(self):
+		# Show the last step, if it was not dispatched.
+		if self.dispatchedStep is not None and self.dispatchedStep != self.step:
+			self.userInterface.progressMeterStatus(self.meterId, self.getStatus())
+		self.userInterface.progressMeterFinish(self.meterId)
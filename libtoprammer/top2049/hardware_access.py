@@ -22,20 +22,56 @@
 
 from libtoprammer.util import *
 from libtoprammer.hardware_access_usb import *
+from libtoprammer.hardware_access_trace import *
+from libtoprammer.hardware_access_sim import *
+from libtoprammer.top2049.simulator import *
 
 
 class HardwareAccess(HardwareAccessUSB):
 	"TOP2049 hardware access"
 
+	PROGRAMMER_TYPE	= "TOP2049"
+	# Version of the FPGAMakeConfigPackets() output format.
+	# Increment it on any change, so that cached packets are rebuilt.
+	CONFIG_PACKETS_VERSION = 1
+
 	ADDR_OK_BIT	= 4
+	ADDR_FASTTRACK	= 1 << ADDR_OK_BIT # FPGA address with fast-tracked commands
+
+	# Default max size of one bulk-out transfer: One packet.
+	# Larger transfers pad the packets with 4 usec delay commands (0x00)
+	# in order to send several of them in one transfer. That adds up to
+	# 63 * 4 = 252 usec of device delay per packet. Large transfers are
+	# not tested on a real TOP2049 yet, so they are opt-in.
+	DEFAULT_TRANSFER_BYTES = 64
+
+	# Delay planner cost model, in microseconds.
+	DELAY_BYTE_COST		= 2	# Dispatch of one delay command
+	DELAY_PACKET_COST	= 1000	# One more packet of delay commands
+	# Wasted device delay counts less than bus time,
+	# because the host keeps queueing commands while the device waits.
+	DELAY_WASTE_DIVISOR	= 4
+	# Delays of at least this many seconds are always done on the host,
+	# so that the device does not stall USB transfers. Shorter delays are
+	# always done on the device. A host wait costs a forced flush and a
+	# few msec of timer slack, which is small against this delay.
+	HOST_WAIT_MIN		= 0.05
 
 	def __init__(self, foundUSBDev,
-		     noQueue=False, doRawDump=False):
+		     noQueue=False, doRawDump=False, asyncWrites=False,
+		     transferBytes=DEFAULT_TRANSFER_BYTES, optimize=False):
+		if transferBytes <= 0 or transferBytes % 64:
+			raise TOPException("Invalid USB transfer size %d. "
+				"Must be a multiple of 64 bytes." % transferBytes)
 		HardwareAccessUSB.__init__(self,
 			usbdev = foundUSBDev.usbdev,
 			maxPacketBytes = 64,
 			noQueue = noQueue,
-			doRawDump = doRawDump)
+			doRawDump = doRawDump,
+			asyncWrites = asyncWrites,
+			maxTransferBytes = transferBytes,
+			padByte = 0x00,
+			optimizer = CommandOptimizer(self.encodeDelay) if optimize else None)
 
 	def getOscillatorHz(self):
 		"Get the 'OSC' frequency."
@@ -45,10 +81,27 @@ class HardwareAccess(HardwareAccessUSB):
 		"Get the buffer register size, in bytes."
 		return 64
 
+	def readBufferRegView(self, nrBytes):
+		"""Reads the buffer register from hardware.
+		Returns a memoryview that is only valid up to the next receive."""
+		self.collectDeferredReads()
+		self.appendCommand1(0x07)
+		return self.receiveView(self.getBufferRegSize())[:nrBytes]
+
 	def readBufferReg(self, nrBytes):
 		"Reads and returns the buffer register from hardware."
-		self.queueCommand(int2byte(0x07))
-		return self.receive(self.getBufferRegSize())[:nrBytes]
+		return bytes(self.readBufferRegView(nrBytes))
+
+	def readBufferRegInto(self, buf, offset, nrBytes):
+		"Reads the buffer register from hardware into buf[offset:]."
+		buf[offset : offset + nrBytes] = self.readBufferRegView(nrBytes)
+
+	def readBufferRegDeferred(self, nrBytes, buf=None, offset=0):
+		"""Queues a buffer register read. Returns a DeferredRead()."""
+		self.reserveDeferredRead()
+		self.appendCommand1(0x07)
+		return self.receiveDeferred(self.getBufferRegSize(),
+					    nrBytes, buf, offset)
 
 	def hardwareInit(self):
 		"Initialize the hardware."
@@ -105,26 +158,116 @@ class HardwareAccess(HardwareAccessUSB):
 		cmd += b"\x00" * (64 - len(cmd)) # padding
 		self.queueCommand(cmd)
 
+	def FPGAMakeConfigPackets(self, payload):
+		"""Returns the packet stream that uploads the
+		configuration 'payload' into the FPGA."""
+		chunkSize = self.getFPGAMaxConfigChunkSize()
+		packets = bytearray()
+		for i in range(0, len(payload), chunkSize):
+			chunk = payload[i : i + chunkSize]
+			packets += b"\x0E\x22\x00\x00"
+			packets += chunk
+			packets += b"\x00" * (chunkSize - len(chunk)) # padding
+		return packets
+
+	def FPGAUploadConfigPackets(self, packets):
+		"""Upload a configuration packet stream
+		from FPGAMakeConfigPackets() into the FPGA."""
+		self.queuePackets(packets)
+
 	def makeFPGAAddr(self, address):
 		# Set the "address OK" bit
 		return address | (1 << self.ADDR_OK_BIT)
 
-	def FPGARead(self, address):
+	def appendFPGARead(self, address):
 		"Do an FPGA read at 'address'. Data is put into buffer reg."
-		address = self.makeFPGAAddr(address)
-		if address == self.makeFPGAAddr(0): # Fast tracked
-			self.queueCommand(int2byte(0x01))
+		address |= 1 << self.ADDR_OK_BIT
+		if address == self.ADDR_FASTTRACK: # Fast tracked
+			self.appendCommand1(0x01)
 			return
-		self.queueCommand(int2byte(0x0B) + int2byte(address))
+		self.appendCommand2(0x0B, address)
 
-	def FPGAWrite(self, address, byte):
+	def appendFPGAWrite(self, address, byte):
 		"Write 'byte' to FPGA at 'address'."
-		address = self.makeFPGAAddr(address)
-		if address == self.makeFPGAAddr(0): # Fast tracked
-			self.queueCommand(int2byte(0x10) + int2byte(byte))
+		address |= 1 << self.ADDR_OK_BIT
+		if address == self.ADDR_FASTTRACK: # Fast tracked
+			self.appendCommand2(0x10, byte)
 			return
-		self.queueCommand(int2byte(0x0A) + int2byte(address) +\
-				  int2byte(byte))
+		self.appendCommand3(0x0A, address, byte)
+
+	def encodeFPGARead(self, address):
+		address |= 1 << self.ADDR_OK_BIT
+		if address == self.ADDR_FASTTRACK:
+			return b"\x01"
+		return bytes((0x0B, address))
+
+	def encodeFPGAWrite(self, address, byte):
+		address |= 1 << self.ADDR_OK_BIT
+		if address == self.ADDR_FASTTRACK:
+			return bytes((0x10, byte))
+		return bytes((0x0A, address, byte))
+
+	# Compat names
+	FPGARead = appendFPGARead
+	FPGAWrite = appendFPGAWrite
+
+	def setWriteOnlyFPGARegs(self, regs):
+		"""Declare the write-only FPGA registers for the optimizer.
+		regs is a dict of FPGA address -> selector mask.
+		See CommandOptimizer.setWriteOnlyRegs()."""
+		if self.optimizer:
+			self.optimizer.setWriteOnlyRegs(
+				{ self.makeFPGAAddr(address) : mask
+				  for (address, mask) in regs.items() })
+
+	def decodeCommands(self, data):
+		"""Decode the raw commands in 'data'.
+		Returns a list of DecodedCommand()."""
+		ret = []
+		i, size = 0, len(data)
+		while i < size:
+			opcode = data[i]
+			if opcode == 0x0A: # FPGA write
+				c = DecodedCommand(DecodedCommand.KIND_WRITE, bytes(data[i:i+3]),
+						   address = data[i+1], value = data[i+2])
+			elif opcode == 0x10: # Fast tracked FPGA write
+				c = DecodedCommand(DecodedCommand.KIND_WRITE, bytes(data[i:i+2]),
+						   address = self.ADDR_FASTTRACK, value = data[i+1])
+			elif opcode == 0x0B: # FPGA read
+				c = DecodedCommand(DecodedCommand.KIND_READ, bytes(data[i:i+2]),
+						   address = data[i+1])
+			elif opcode == 0x01: # Fast tracked FPGA read
+				c = DecodedCommand(DecodedCommand.KIND_READ, bytes(data[i:i+1]),
+						   address = self.ADDR_FASTTRACK)
+			elif opcode == 0x00: # 4 usec delay
+				c = DecodedCommand(DecodedCommand.KIND_DELAY, bytes(data[i:i+1]),
+						   value = 4)
+			elif opcode == 0x1B: # 10 msec delay
+				c = DecodedCommand(DecodedCommand.KIND_DELAY, bytes(data[i:i+1]),
+						   value = 10000)
+			elif opcode == 0x0E:
+				subcode = data[i+1]
+				if subcode == 0x22: # FPGA config upload with data
+					c = DecodedCommand(DecodedCommand.KIND_RESET, bytes(data[i:i+64]))
+				elif subcode == 0x21: # FPGA config initiate
+					c = DecodedCommand(DecodedCommand.KIND_RESET, bytes(data[i:i+4]))
+				else:
+					c = DecodedCommand(DecodedCommand.KIND_OTHER, bytes(data[i:i+4]))
+			elif opcode in (0x07, 0x0D): # Buffer register readout and status
+				c = DecodedCommand(DecodedCommand.KIND_OTHER, bytes(data[i:i+1]))
+			else:
+				raise TOPException("Cannot decode command 0x%02X" % opcode)
+			ret.append(c)
+			i += len(c.data)
+		return ret
+
+	def encodeDelay(self, usec):
+		"""Encode an on-device delay of exactly 'usec' microseconds.
+		Returns a list of DecodedCommand()."""
+		assert(usec % 4 == 0)
+		(msec10, usec) = divmod(usec, 10000)
+		return [ DecodedCommand(DecodedCommand.KIND_DELAY, b"\x1B", value = 10000) ] * msec10 +\
+		       [ DecodedCommand(DecodedCommand.KIND_DELAY, b"\x00", value = 4) ] * (usec // 4)
 
 	def loadGNDLayout(self, layout):
 		"Load the GND configuration into the H/L shiftregisters."
@@ -173,27 +316,59 @@ class HardwareAccess(HardwareAccessUSB):
 		      int2byte(param) + int2byte(0)
 		self.queueCommand(cmd)
 
-	def __delay_4usec(self):
-		self.queueCommand(int2byte(0x00))
+	def __delayBytesCost(self, nrBytes):
+		return nrBytes * (self.DELAY_BYTE_COST +
+				  self.DELAY_PACKET_COST / self.maxPacketBytes)
+
+	def __planDeviceDelay(self, seconds):
+		"""Returns the cheapest on-device encoding of a delay of at
+		least 'seconds' as tuple (nr10msec, nr4usec)."""
+		microsecs = int(math.ceil(seconds * 1000000))
+		(nr10msec, rest) = divmod(microsecs, 10000)
+		if not rest:
+			return (nr10msec, 0)
+		nr4usec = (rest + 3) // 4
+		# Either fill the rest with 4 usec delays,
+		# or wait for one more 10 msec delay.
+		costRest = self.__delayBytesCost(nr4usec) +\
+			   (nr4usec * 4 - rest) / self.DELAY_WASTE_DIVISOR
+		costRoundup = self.__delayBytesCost(1) +\
+			      (10000 - rest) / self.DELAY_WASTE_DIVISOR
+		if costRoundup < costRest:
+			return (nr10msec + 1, 0)
+		return (nr10msec, nr4usec)
 
-	def __delay_10msec(self):
-		self.queueCommand(int2byte(0x1B))
+	def appendDelay(self, seconds):
+		"Queue an on-device delay of at least 'seconds'."
+		(nr10msec, nr4usec) = self.__planDeviceDelay(seconds)
+		self.appendRepeated(0x1B, nr10msec)
+		self.appendRepeated(0x00, nr4usec)
+
+	def encodeDeviceDelay(self, seconds):
+		(nr10msec, nr4usec) = self.__planDeviceDelay(seconds)
+		return [ b"\x1B" ] * nr10msec + [ b"\x00" ] * nr4usec
+
+	def delayOnHost(self, seconds):
+		"Delay planner: Returns True, if the host shall wait 'seconds'."
+		return seconds >= self.HOST_WAIT_MIN
 
 	def delay(self, seconds):
-		"Perform an on-device or host delay."
-		if seconds >= 0.5:
-			# Perform long delays on the host
-			self.flushCommands(seconds)
-			return
-		if seconds > 0.000255:
-			# Need to round up to ten milliseconds
-			millisecs = int(math.ceil(seconds * 1000))
-			millisecs = roundup(millisecs, 10)
-			for i in range(0, millisecs // 10):
-				self.__delay_10msec()
-		else:
-			# Round up to 4 usec boundary
-			microsecs = int(math.ceil(seconds * 1000000))
-			microsecs = roundup(microsecs, 4)
-			for i in range(0, microsecs // 4):
-				self.__delay_4usec()
+		"""Delay the following commands by at least 'seconds'.
+		Adjacent delays are coalesced. The delay planner picks
+		on-device delays or a host wait."""
+		self.queueDelay(seconds)
+
+class HardwareAccessRecord(TraceRecorder, HardwareAccess):
+	"TOP2049 hardware access that records a trace file"
+
+class HardwareAccessReplay(TraceReplayer, HardwareAccess):
+	"TOP2049 hardware access that replays a trace file"
+
+class HardwareAccessSim(SimulatorTransport, HardwareAccess):
+	"Simulated TOP2049 hardware access"
+
+	def createSimulator(self):
+		return Simulator()
+
+class HardwareAccessSimRecord(TraceRecorder, HardwareAccessSim):
+	"Simulated TOP2049 hardware access that records a trace file"
@@ -0,0 +1,535 @@
+"""
+#    TOP2049 Open Source programming suite
+#
+#    TOP2049 device simulator
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+from libtoprammer.util import *
+from libtoprammer.bitfile import *
+import collections
+import os
+
+
+class SimRegisterModel(object):
+	"""Simulated FPGA bottom-half of one bitfile.
+	The addresses passed to write() and read() don't include
+	the address-OK bit. Commands finish instantly. A model may
+	add their duration to the device clock with sim.advance()."""
+
+	BITFILE		= None		# Name of the simulated bitfile
+	RUNTIME_ID	= (0, 0)	# Runtime ID (major, minor)
+
+	def __init__(self, sim):
+		self.sim = sim
+
+	def write(self, address, data):
+		"FPGA register write."
+		pass
+
+	def read(self, address):
+		"FPGA register read. Returns the byte for the buffer register."
+		return 0
+
+	def readMemory(self, memory, address):
+		"Read a byte of the chip memory with the stuck bits applied."
+		data = memory[address]
+		for (stuckAddress, mask, value) in self.sim.stuckBits:
+			if stuckAddress == address:
+				data = (data & ~mask) | (value & mask)
+		return data
+
+registeredSimModels = []
+
+def registerSimModel(modelClass):
+	"Register a SimRegisterModel subclass."
+	registeredSimModels.append(modelClass)
+
+class Simulator(object):
+	"""Simulated TOP2049 device.
+	Decodes the bulk-out command stream and answers buffer register
+	readouts (0x07) with bulk-in data.
+	The device clock is a rough estimate of the time the real
+	device would need for the command stream.
+	The environment variable TOPRAMMER_SIM_STUCK_BITS injects faulty
+	chip memory cells. It is a comma separated list of ADDRESS:BIT:VALUE.
+	Bit number BIT of the cell at ADDRESS always reads as VALUE."""
+
+	PACKET_BYTES		= 64
+	BUFFER_REG_BYTES	= 64
+	ADDR_OK_BIT		= 4
+
+	VERSION_STRING		= b"top2049 ver 1.0 "
+	STATUS_INIT		= b"\x69\x0C\x02\x00"	# 0x0D status
+	STATUS_POWER		= b"\x6C\x68\x00\x00"	# 0x0E25 status
+	STATUS_CONFIG		= b"\x01"		# 0x0E21 status
+
+	# Timing estimates, in microseconds
+	TRANSFER_USEC		= 1000	# USB latency per bulk transfer
+	PACKET_USEC		= 50	# Bus time per 64 byte packet
+	COMMAND_USEC		= 1	# Command dispatch
+	CONFIG_CHUNK_USEC	= 100	# FPGA configuration chunk
+
+	# Bitfile name -> payload. Shared by all instances.
+	__payloadCache = {}
+
+	def __init__(self):
+		self.__commands = {
+			0x00 : (1, self.__cmdDelay4Usec),
+			0x01 : (1, self.__cmdFastTrackRead),
+			0x07 : (1, self.__cmdReadBufferReg),
+			0x0A : (3, self.__cmdFPGAWrite),
+			0x0B : (2, self.__cmdFPGARead),
+			0x0D : (1, self.__cmdInitStatus),
+			0x0E : (4, self.__cmdSystem),
+			0x10 : (2, self.__cmdFastTrackWrite),
+			0x1B : (1, self.__cmdDelay10Msec),
+		}
+		self.__systemCommands = {
+			0x11 : self.__sysVersion,
+			0x12 : self.__sysVPPVoltage,
+			0x13 : self.__sysVCCVoltage,
+			0x14 : self.__sysVPPLayout,
+			0x15 : self.__sysVCCLayout,
+			0x16 : self.__sysGNDLayout,
+			0x20 : self.__sysNop,
+			0x21 : self.__sysInitiateConfig,
+			0x22 : self.__sysUploadConfig,
+			0x25 : self.__sysPowerStatus,
+			0x28 : self.__sysZifPullups,
+		}
+
+		self.bufferReg = bytearray(self.BUFFER_REG_BYTES)
+		self.bufferRegPos = 0
+		self.pendingIn = collections.deque()
+
+		self.vppVoltage = 0.0
+		self.vccVoltage = 0.0
+		self.vppLayout = 0
+		self.vccLayout = 0
+		self.gndLayout = 0
+		self.zifPullups = False
+
+		self.configData = None
+		self.model = SimRegisterModel(self)
+		self.stuckBits = self.__parseStuckBits(
+			os.environ.get("TOPRAMMER_SIM_STUCK_BITS", ""))
+
+		self.resetStats()
+
+	@staticmethod
+	def __parseStuckBits(spec):
+		"Returns a list of (address, mask, value)."
+		stuckBits = []
+		for item in spec.split(","):
+			if not item.strip():
+				continue
+			try:
+				(address, bit, value) = (int(v, 0) for v in item.split(":"))
+				if address < 0 or not 0 <= bit <= 7 or value not in (0, 1):
+					raise ValueError
+			except (ValueError) as e:
+				raise TOPException("Simulator: Invalid stuck bit '%s'. "
+					"Expected ADDRESS:BIT:VALUE." % item)
+			stuckBits.append((address, 1 << bit, value << bit))
+		return stuckBits
+
+	def resetStats(self):
+		self.clockUsec = 0
+		self.nrCommands = 0
+		self.nrPackets = 0
+		self.nrTransfersOut = 0
+		self.nrTransfersIn = 0
+
+	def getStats(self):
+		return {
+			"simCommands"		: self.nrCommands,
+			"simPackets"		: self.nrPackets,
+			"simTransfersOut"	: self.nrTransfersOut,
+			"simTransfersIn"	: self.nrTransfersIn,
+			"simDeviceSeconds"	: self.clockUsec / 1000000.0,
+		}
+
+	def advance(self, usec):
+		"Advance the device clock."
+		self.clockUsec += usec
+
+	def bulkOut(self, data):
+		"Process one bulk-out transfer."
+		data = bytes(data)
+		self.nrTransfersOut += 1
+		self.advance(self.TRANSFER_USEC)
+		for offset in range(0, len(data), self.PACKET_BYTES):
+			self.__processPacket(data[offset : offset + self.PACKET_BYTES])
+
+	def bulkIn(self, size):
+		"Process one bulk-in transfer. Returns the data."
+		if not self.pendingIn:
+			raise TOPException("Simulator: Bulk-in read timeout. "
+				"No buffer register readout is pending.")
+		self.nrTransfersIn += 1
+		self.advance(self.TRANSFER_USEC)
+		return self.pendingIn.popleft()[:size]
+
+	def __processPacket(self, packet):
+		self.nrPackets += 1
+		self.advance(self.PACKET_USEC)
+		i = 0
+		while i < len(packet):
+			opcode = packet[i]
+			try:
+				(size, handler) = self.__commands[opcode]
+			except (KeyError) as e:
+				raise TOPException("Simulator: Unknown command 0x%02X" % opcode)
+			if opcode == 0x0E and i + 1 < len(packet) and packet[i + 1] == 0x22:
+				size = self.PACKET_BYTES # Config upload fills the packet
+			if i + size > len(packet):
+				raise TOPException("Simulator: Command 0x%02X crosses "
+					"a packet boundary" % opcode)
+			self.nrCommands += 1
+			self.advance(self.COMMAND_USEC)
+			handler(packet[i : i + size])
+			i += size
+
+	def __putBufferReg(self, byte):
+		# Excess bytes are dropped
+		if self.bufferRegPos < len(self.bufferReg):
+			self.bufferReg[self.bufferRegPos] = byte & 0xFF
+			self.bufferRegPos += 1
+
+	def __setBufferReg(self, data):
+		self.bufferReg[0 : len(data)] = data
+		self.bufferRegPos = len(data)
+
+	def __cmdDelay4Usec(self, cmd):
+		self.advance(4)
+
+	def __cmdDelay10Msec(self, cmd):
+		self.advance(10000)
+
+	def __cmdReadBufferReg(self, cmd):
+		self.pendingIn.append(bytes(self.bufferReg))
+		self.bufferRegPos = 0
+
+	def __cmdInitStatus(self, cmd):
+		self.__setBufferReg(self.STATUS_INIT)
+
+	def __cmdFPGAWrite(self, cmd):
+		self.__fpgaWrite(cmd[1], cmd[2])
+
+	def __cmdFPGARead(self, cmd):
+		self.__fpgaRead(cmd[1])
+
+	def __cmdFastTrackWrite(self, cmd):
+		self.__fpgaWrite(1 << self.ADDR_OK_BIT, cmd[1])
+
+	def __cmdFastTrackRead(self, cmd):
+		self.__fpgaRead(1 << self.ADDR_OK_BIT)
+
+	def __fpgaWrite(self, address, data):
+		self.__checkConfig()
+		if address & (1 << self.ADDR_OK_BIT):
+			self.model.write(address & ~(1 << self.ADDR_OK_BIT), data)
+
+	def __fpgaRead(self, address):
+		self.__checkConfig()
+		(idMajor, idMinor) = self.model.RUNTIME_ID
+		if address == 0xFD:
+			data = idMajor & 0xFF
+		elif address == 0xFE:
+			data = (idMajor >> 8) & 0xFF
+		elif address == 0xFF:
+			data = idMinor
+		elif address & (1 << self.ADDR_OK_BIT):
+			data = self.model.read(address & ~(1 << self.ADDR_OK_BIT))
+		else:
+			data = 0
+		self.__putBufferReg(data)
+
+	def __cmdSystem(self, cmd):
+		try:
+			handler = self.__systemCommands[cmd[1]]
+		except (KeyError) as e:
+			raise TOPException("Simulator: Unknown command 0x0E%02X" % cmd[1])
+		handler(cmd)
+
+	def __sysNop(self, cmd):
+		pass
+
+	def __sysVersion(self, cmd):
+		self.__setBufferReg(self.VERSION_STRING)
+
+	def __sysPowerStatus(self, cmd):
+		self.__setBufferReg(self.STATUS_POWER)
+
+	def __sysVPPVoltage(self, cmd):
+		self.vppVoltage = cmd[2] / 10.0
+
+	def __sysVCCVoltage(self, cmd):
+		self.vccVoltage = cmd[2] / 10.0
+
+	def __sysVPPLayout(self, cmd):
+		self.vppLayout = cmd[2]
+
+	def __sysVCCLayout(self, cmd):
+		self.vccLayout = cmd[2]
+
+	def __sysGNDLayout(self, cmd):
+		self.gndLayout = cmd[2]
+
+	def __sysZifPullups(self, cmd):
+		self.zifPullups = bool(cmd[2])
+
+	def __sysInitiateConfig(self, cmd):
+		self.configData = bytearray()
+		self.model = SimRegisterModel(self)
+		self.__setBufferReg(self.STATUS_CONFIG)
+
+	def __sysUploadConfig(self, cmd):
+		if self.configData is None:
+			raise TOPException("Simulator: FPGA config upload "
+				"without config initiation")
+		self.configData += cmd[4:]
+		self.advance(self.CONFIG_CHUNK_USEC)
+
+	def __checkConfig(self):
+		# The first FPGA access after an upload finishes the configuration.
+		if self.configData is None:
+			return
+		data, self.configData = self.configData, None
+		for modelClass in registeredSimModels:
+			payload = self.__getPayload(modelClass.BITFILE)
+			if payload is None or len(data) < len(payload):
+				continue
+			if data[:len(payload)] == payload and\
+			   not any(data[len(payload):]):
+				self.model = modelClass(self)
+				return
+
+	@classmethod
+	def __getPayload(cls, bitfileName):
+		try:
+			return cls.__payloadCache[bitfileName]
+		except (KeyError) as e:
+			pass
+		payload = None
+		path = bitfileFind(bitfileName)
+		if path:
+			bitfile = Bitfile()
+			bitfile.parseFile(path)
+			payload = bitfile.getPayload()
+		cls.__payloadCache[bitfileName] = payload
+		return payload
+
+class Sim_hm62256dip28(SimRegisterModel):
+	"Simulated 32k x 8 SRAM"
+
+	BITFILE		= "hm62256dip28"
+	RUNTIME_ID	= (0x000A, 0x01)
+
+	SIZE		= 1024 * 32
+
+	def __init__(self, sim):
+		SimRegisterModel.__init__(self, sim)
+		self.memory = bytearray(self.SIZE)
+		self.address = 0
+		self.data = 0
+		self.ce = self.oe = self.we = 1
+
+	def write(self, address, data):
+		if address == 0:
+			self.data = data
+		elif address == 1:
+			self.ce = data & 1
+			self.oe = (data >> 1) & 1
+			self.we = (data >> 2) & 1
+		elif address == 2:
+			self.address = (self.address & 0x7F00) | data
+		elif address == 3:
+			self.address = (self.address & 0x00FF) | ((data & 0x7F) << 8)
+		if not self.ce and not self.we:
+			self.memory[self.address] = self.data
+
+	def read(self, address):
+		if address == 0:
+			if self.oe:
+				return self.data # The FPGA drives the data bus
+			if not self.ce:
+				return self.readMemory(self.memory, self.address)
+		return 0
+
+registerSimModel(Sim_hm62256dip28)
+
+class Sim_m24c16dip8(SimRegisterModel):
+	"Simulated M24C16 I2C EEPROM"
+
+	BITFILE		= "m24c16dip8"
+	RUNTIME_ID	= (0x000B, 0x01)
+
+	SIZE		= 1024 * 16 // 8
+	PAGE_SIZE	= 16
+	I2C_ADDR	= 0x50 << 1
+	I2C_BYTE_USEC	= 9 * 2 * 250
+
+	# Transaction states
+	STATE_IDLE	= 0
+	STATE_DEVADDR	= 1
+	STATE_WORDADDR	= 2
+	STATE_DATA	= 3
+
+	def __init__(self, sim):
+		SimRegisterModel.__init__(self, sim)
+		self.memory = bytearray(b"\xFF" * self.SIZE)
+		self.address = 0
+		self.dataBuffer = 0
+		self.readByte = 0
+		self.nack = False
+		self.writeControl = False
+		self.state = self.STATE_IDLE
+
+	def write(self, address, data):
+		if address == 0:
+			self.__runCommand(data)
+		elif address == 1:
+			self.dataBuffer = data
+		elif address == 2:
+			self.writeControl = bool(data & (1 << 6))
+
+	def read(self, address):
+		if address == 0:
+			return self.readByte
+		if address == 1:
+			return 0x02 if self.nack else 0x00
+		return 0
+
+	def __runCommand(self, command):
+		read = bool(command & 0x01)
+		doStart = bool(command & 0x02)
+		doStop = bool(command & 0x04)
+		driveAck = bool(command & 0x08)
+
+		self.sim.advance(self.I2C_BYTE_USEC)
+		if doStart:
+			self.state = self.STATE_DEVADDR
+		if read:
+			self.readByte = self.readMemory(self.memory, self.address)
+			self.address = (self.address + 1) % self.SIZE
+			self.nack = not driveAck
+		else:
+			self.nack = not self.__writeByte(self.dataBuffer)
+		if doStop:
+			self.state = self.STATE_IDLE
+
+	def __writeByte(self, byte):
+		if self.state == self.STATE_DEVADDR:
+			if (byte & 0xF0) != (self.I2C_ADDR & 0xF0):
+				self.state = self.STATE_IDLE
+				return False
+			self.address = (((byte >> 1) & 0x07) << 8) |\
+				       (self.address & 0xFF)
+			if not (byte & 0x01):
+				self.state = self.STATE_WORDADDR
+			return True
+		if self.state == self.STATE_WORDADDR:
+			self.address = (self.address & 0x700) | byte
+			self.state = self.STATE_DATA
+			return True
+		if self.state == self.STATE_DATA:
+			if self.writeControl:
+				return False # Write protected
+			self.memory[self.address] = byte
+			pageMask = self.PAGE_SIZE - 1
+			self.address = (self.address & ~pageMask) |\
+				       ((self.address + 1) & pageMask)
+			return True
+		return False
+
+registerSimModel(Sim_m24c16dip8)
+
+class Sim_w29ee011dip32(SimRegisterModel):
+	"Simulated W29EE011 128k x 8 EEPROM"
+
+	BITFILE		= "w29ee011dip32"
+	RUNTIME_ID	= (0x0009, 0x01)
+
+	SIZE		= 1024 * 128
+	PAGE_SIZE	= 128
+	WRITE_USEC	= 10000		# Page write cycle
+	ERASE_USEC	= 50000		# Chip erase
+
+	JEDEC_PAGE_WRITE = ((0x5555, 0xAA), (0x2AAA, 0x55), (0x5555, 0xA0))
+	JEDEC_CHIP_ERASE = ((0x5555, 0xAA), (0x2AAA, 0x55), (0x5555, 0x80),
+			    (0x5555, 0xAA), (0x2AAA, 0x55), (0x5555, 0x10))
+
+	def __init__(self, sim):
+		SimRegisterModel.__init__(self, sim)
+		self.memory = bytearray(b"\xFF" * self.SIZE)
+		self.writeBuf = bytearray()
+		self.jedec = []
+		self.jedecAddress = 0
+		self.writeAddress = 0
+		self.readAddress = 0
+		self.ce = self.oe = 1
+
+	@staticmethod
+	def __setAddressByte(address, byteNr, data):
+		shift = byteNr * 8
+		address = (address & ~(0xFF << shift)) | (data << shift)
+		return address & 0x1FFFF
+
+	def write(self, address, data):
+		if address == 0x0:
+			self.writeBuf.append(data)
+		elif address == 0x2:
+			self.__runCommand()
+		elif address == 0x3:
+			del self.writeBuf[:]
+			del self.jedec[:]
+		elif 0x4 <= address <= 0x6:
+			self.writeAddress = self.__setAddressByte(
+				self.writeAddress, address - 0x4, data)
+		elif 0x7 <= address <= 0x9:
+			self.readAddress = self.__setAddressByte(
+				self.readAddress, address - 0x7, data)
+		elif address == 0xA:
+			self.ce = data & 1
+			self.oe = (data >> 1) & 1
+		elif 0xB <= address <= 0xD:
+			self.jedecAddress = self.__setAddressByte(
+				self.jedecAddress, address - 0xB, data)
+		elif address == 0xE:
+			self.jedec.append((self.jedecAddress, data))
+
+	def read(self, address):
+		if address == 0x0:
+			if not self.ce and not self.oe:
+				return self.readMemory(self.memory, self.readAddress)
+		return 0 # Status: The FPGA command finished
+
+	def __runCommand(self):
+		jedec = tuple(self.jedec)
+		if jedec == self.JEDEC_PAGE_WRITE and self.writeBuf:
+			# The page write erases the whole page first.
+			page = self.writeAddress & ~(self.PAGE_SIZE - 1)
+			self.memory[page : page + self.PAGE_SIZE] = b"\xFF" * self.PAGE_SIZE
+			for (i, byte) in enumerate(self.writeBuf):
+				self.memory[(self.writeAddress + i) % self.SIZE] = byte
+			self.sim.advance(self.WRITE_USEC)
+		elif jedec == self.JEDEC_CHIP_ERASE:
+			self.memory[:] = b"\xFF" * self.SIZE
+			self.sim.advance(self.ERASE_USEC)
+
+registerSimModel(Sim_w29ee011dip32)
@@ -39,6 +39,12 @@ class AbstractUserInterface:
 	def progressMeter(self, meterId, step):
 		pass # Do nothing by default
 
+	def progressMeterStatus(self, meterId, status):
+		"""Sampled progress update. status is a ProgressStatus()
+		with the step, throughput and ETA.
+		This calls progressMeter() by default."""
+		self.progressMeter(meterId, status.step)
+
 	def warningMessage(self, message):
 		pass # Do nothing by default
 
@@ -55,7 +61,7 @@ class ConsoleUserInterface(AbstractUserInterface):
 		if meterId != self.PROGRESSMETER_CHIPACCESS:
 			return
 		self.progressNrSteps = nrSteps
-		self.progress = list(range(0, 100))
+		self.progressPercent = 0	# The next percent to print
 		self.__genericConsoleMessage(message + " [0%", newline=False)
 
 	def progressMeterFinish(self, meterId):
@@ -72,9 +78,7 @@ class ConsoleUserInterface(AbstractUserInterface):
 			percent = (step * 100 // self.progressNrSteps)
 		else:
 			percent = 100
-		for progress in list(self.progress):
-			if progress > percent:
-				break
+		for progress in range(self.progressPercent, min(percent + 1, 100)):
 			if progress == 25:
 				self.__genericConsoleMessage("25%", newline=False)
 			elif progress == 50:
@@ -83,7 +87,7 @@ class ConsoleUserInterface(AbstractUserInterface):
 				self.__genericConsoleMessage("75%", newline=False)
 			elif progress % 2 == 0:
 				self.__genericConsoleMessage(".", newline=False)
-			self.progress.remove(progress)
+		self.progressPercent = max(self.progressPercent, min(percent + 1, 100))
 
 	def __genericConsoleMessage(self, message, newline=True):
 		if newline:
@@ -84,8 +84,7 @@ def str2bool(string):
 	return None
 
 def genRandomBlob(size):
-	return b"".join(int2byte(random.randint(0, 0xFF))
-			for x in range(size))
+	return random.getrandbits(size * 8).to_bytes(size, "little") if size else b""
 
 def bit(bitNr):
 	return 1 << bitNr
@@ -17,7 +17,7 @@ setup(	name		= "toprammer",
 			    "libtoprammer/chips/microchip16", ],
 	package_data	= { "libtoprammer" : [ "fpga/bin/*.bit",
 					       "icons/*.png", ], },
-	scripts		= [ "toprammer", "toprammer-gui", "toprammer-layout", ],
+	scripts		= [ "toprammer", "toprammerd", "toprammer-gui", "toprammer-layout", ],
 	keywords	= "TOP2049 universal programmer EPROM EEPROM microcontroller burner",
 	install_requires = [ "PyQt6", "pyusb", ],
 	classifiers	= [
@@ -53,6 +53,7 @@ toprammer()
 	local args=
 
 	[ -n "$current_chipid" ] && args="--chip-id $current_chipid $args"
+	[ "$current_device" = "sim" ] && args="--device sim:TOP2049 $args"
 	args="-B -I bin -O bin $args"
 
 	echo "        toprammer $args $*"
@@ -69,6 +70,40 @@ toprammer()
 	fi
 }
 
+toprammer_grep() # $1=pattern $2...=toprammer arguments
+{
+	local pattern="$1"
+	shift
+	local saved_verbose=$verbose
+	verbose=0 # Log the output
+	toprammer "$@"
+	verbose=$saved_verbose
+	grep -q -e "$pattern" "$tmpdir/toprammer.log" ||\
+		die "toprammer $*  <<<OUTPUT DOES NOT MATCH '$pattern'>>>"
+}
+
+toprammer_fail() # $1=pattern $2...=toprammer arguments
+{
+	local pattern="$1"
+	shift
+	local logfile="$tmpdir/toprammer.log"
+	local args=
+
+	[ -n "$current_chipid" ] && args="--chip-id $current_chipid $args"
+	[ "$current_device" = "sim" ] && args="--device sim:TOP2049 $args"
+	args="-B -I bin -O bin $args"
+
+	echo "        toprammer $args $*  (expected to fail)"
+	cd "$basedir/.." || die "Failed to chdir"
+	./toprammer $args "$@" >$logfile 2>&1
+	if [ $? -eq 0 ]; then
+		[ -r "$logfile" ] && cat "$logfile"
+		die "toprammer $args $*  <<<DID NOT FAIL>>>"
+	fi
+	grep -q -e "$pattern" "$logfile" ||\
+		die "toprammer $*  <<<OUTPUT DOES NOT MATCH '$pattern'>>>"
+}
+
 toprammer_layout_silent()
 {
 	local logfile="$tmpdir/toprammer-layout.log"
@@ -153,17 +188,21 @@ usage()
 	echo "Options:"
 	echo " -h|--help               Show this help text"
 	echo " -V|--verbose            Be verbose"
+	echo " -b|--batch              Do not ask. Only run the tests that need no"
+	echo "                         real programmer and stop at the first failure."
 	echo
 	echo "If the optional scriptpath is specified, only that testscript"
 	echo "is executed. The scriptpath is DEVICE/TESTSCRIPT. Example:"
 	echo "   top2049/001-atmega32dip40.test"
 	echo "This will execute the atmega32 test for the TOP2049 and exit."
 	echo "If no path is specified, all tests will be executed."
+	echo "The tests in sim/ run on the simulated TOP2049."
 }
 
 # Parse commandline
 scriptpaths=
 verbose=0
+batch=0
 while [ $# -gt 0 ]; do
 	if [ "$1" = "-h" -o "$1" = "--help" ]; then
 		usage
@@ -174,6 +213,11 @@ while [ $# -gt 0 ]; do
 		shift
 		continue
 	fi
+	if [ "$1" = "-b" -o "$1" = "--batch" ]; then
+		batch=1
+		shift
+		continue
+	fi
 	scriptpaths="$scriptpaths $1"
 	shift
 done
@@ -244,6 +288,7 @@ do_run_test() # $1=device, $2=testscript
 		cleanup_enabled=1
 		if [ $res -ne 0 ]; then
 			test_exit
+			[ $batch -eq 0 ] || die "$current_test failed"
 			ask "$current_test failed. RETRY?"
 			[ $? -eq 0 ] && continue
 			ask "Terminate testsuite?"
@@ -263,7 +308,11 @@ if [ -z "$scriptpaths" ]; then
 	# Run all scripts
 	for device in $(ls "$basedir"); do
 		[ -d "$basedir/$device" ] || continue
-		[ "$device" = "generic" ] || request_TOP "$device" || continue
+		if [ "$device" != "generic" -a "$device" != "sim" ]; then
+			# This device needs a real programmer.
+			[ $batch -eq 0 ] || continue
+			request_TOP "$device" || continue
+		fi
 
 		for testscript in $(ls "$basedir/$device"); do
 			do_run_test "$device" "$testscript"